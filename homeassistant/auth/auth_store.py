@@ -7,7 +7,9 @@ from logging import getLogger
 from typing import Any, Dict, List, Optional
 
 from homeassistant.auth.const import ACCESS_TOKEN_EXPIRATION
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
+from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.util import dt as dt_util
 
 from . import models
@@ -303,6 +305,14 @@ class AuthStore:
 
         self._perm_lookup = perm_lookup = PermissionLookup(ent_reg, dev_reg)
 
+        # Permissions by device or area depend on the registries
+        self.hass.bus.async_listen(
+            EVENT_ENTITY_REGISTRY_UPDATED, self._async_registry_updated
+        )
+        self.hass.bus.async_listen(
+            EVENT_DEVICE_REGISTRY_UPDATED, self._async_registry_updated
+        )
+
         if data is None:
             self._set_defaults()
             return
@@ -475,6 +485,15 @@ class AuthStore:
         self._groups = groups
         self._users = users
 
+    @callback
+    def _async_registry_updated(self, event: Event) -> None:
+        """Invalidate the entity permissions when a registry changes."""
+        if self._users is None:
+            return
+
+        for user in self._users.values():
+            user.invalidate_entity_permission_cache()
+
     @callback
     def _async_schedule_save(self) -> None:
         """Save users."""
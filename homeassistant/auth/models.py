@@ -82,6 +82,11 @@ class User:
         """Invalidate permission cache."""
         self._permissions = None
 
+    def invalidate_entity_permission_cache(self) -> None:
+        """Invalidate the entity permissions that were looked up in the registries."""
+        if self._permissions is not None:
+            self._permissions.invalidate_entity_index()
+
 
 @attr.s(slots=True)
 class RefreshToken:
@@ -1,6 +1,6 @@
 """Permissions for Home Assistant."""
 import logging
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, Optional
 
 import voluptuous as vol
 
@@ -46,6 +46,8 @@ class PolicyPermissions(AbstractPermissions):
         """Initialize the permission class."""
         self._policy = policy
         self._perm_lookup = perm_lookup
+        # Results of check_entity by key and entity ID
+        self._entity_index: Dict[str, Dict[str, bool]] = {}
 
     def access_all_entities(self, key: str) -> bool:
         """Check if we have a certain access to all entities."""
@@ -55,6 +57,25 @@ class PolicyPermissions(AbstractPermissions):
         """Return a function that can test entity access."""
         return compile_entities(self._policy.get(CAT_ENTITIES), self._perm_lookup)
 
+    def check_entity(self, entity_id: str, key: str) -> bool:
+        """Check if we can access entity.
+
+        The policy is only applied the first time an entity is checked.
+        """
+        index = self._entity_index.get(key)
+        if index is None:
+            index = self._entity_index[key] = {}
+
+        allowed = index.get(entity_id)
+        if allowed is None:
+            allowed = index[entity_id] = super().check_entity(entity_id, key)
+
+        return allowed
+
+    def invalidate_entity_index(self) -> None:
+        """Forget the checked entities after a registry changed."""
+        self._entity_index.clear()
+
     def __eq__(self, other: Any) -> bool:
         """Equals check."""
         return isinstance(other, PolicyPermissions) and other._policy == self._policy
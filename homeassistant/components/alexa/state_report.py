@@ -6,7 +6,8 @@ import logging
 import aiohttp
 import async_timeout
 
-from homeassistant.const import HTTP_ACCEPTED, MATCH_ALL, STATE_ON
+from homeassistant.const import HTTP_ACCEPTED, STATE_ON
+from homeassistant.core import callback
 import homeassistant.util.dt as dt_util
 
 from .const import API_CHANGE, Cause
@@ -25,15 +26,14 @@ async def async_enable_proactive_mode(hass, smart_home_config):
     # Validate we can get access token.
     await smart_home_config.async_get_access_token()
 
-    async def async_entity_state_listener(changed_entity, old_state, new_state):
-        if not hass.is_running:
-            return
-
-        if not new_state:
-            return
+    @callback
+    def should_report(event):
+        """Return if the state change might have to be reported."""
+        return hass.is_running and event.data["new_state"] is not None
 
-        if new_state.domain not in ENTITY_ADAPTERS:
-            return
+    async def async_entity_state_listener(event):
+        changed_entity = event.data["entity_id"]
+        new_state = event.data["new_state"]
 
         if not smart_home_config.should_expose(changed_entity):
             _LOGGER.debug("Not exposing %s because filtered by config", changed_entity)
@@ -58,8 +58,10 @@ async def async_enable_proactive_mode(hass, smart_home_config):
                 )
                 return
 
-    return hass.helpers.event.async_track_state_change(
-        MATCH_ALL, async_entity_state_listener
+    return hass.states.async_listen(
+        async_entity_state_listener,
+        domains=ENTITY_ADAPTERS,
+        event_filter=should_report,
     )
 
 
@@ -1,7 +1,6 @@
 """Google Report State implementation."""
 import logging
 
-from homeassistant.const import MATCH_ALL
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.event import async_call_later
 
@@ -20,16 +19,20 @@ _LOGGER = logging.getLogger(__name__)
 def async_enable_report_state(hass: HomeAssistant, google_config: AbstractConfig):
     """Enable state reporting."""
 
-    async def async_entity_state_listener(changed_entity, old_state, new_state):
-        if not hass.is_running:
-            return
-
-        if not new_state:
-            return
-
-        if not google_config.should_expose(new_state):
-            return
+    @callback
+    def should_report(event):
+        """Return if the state change might have to be reported."""
+        new_state = event.data["new_state"]
+        return (
+            hass.is_running
+            and new_state is not None
+            and google_config.should_expose(new_state)
+        )
 
+    async def async_entity_state_listener(event):
+        changed_entity = event.data["entity_id"]
+        old_state = event.data["old_state"]
+        new_state = event.data["new_state"]
         entity = GoogleEntity(hass, google_config, new_state)
 
         if not entity.is_supported():
@@ -80,6 +83,6 @@ def async_enable_report_state(hass: HomeAssistant, google_config: AbstractConfig
 
     async_call_later(hass, INITIAL_REPORT_DELAY, inital_report)
 
-    return hass.helpers.event.async_track_state_change(
-        MATCH_ALL, async_entity_state_listener
+    return hass.states.async_listen(
+        async_entity_state_listener, event_filter=should_report
     )
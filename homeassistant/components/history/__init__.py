@@ -1,13 +1,15 @@
 """Provide pre-made queries on top of the recorder component."""
+import asyncio
 from collections import defaultdict
 from datetime import datetime as dt, timedelta
-from itertools import groupby
+from itertools import chain, groupby
 import json
 import logging
+import threading
 import time
-from typing import Iterable, Optional, cast
+from typing import Any, Iterable, Optional, cast
 
-from aiohttp import web
+from aiohttp import hdrs, web
 from sqlalchemy import and_, bindparam, func, not_, or_
 from sqlalchemy.ext import baked
 import voluptuous as vol
@@ -15,9 +17,13 @@ import voluptuous as vol
 from homeassistant.components import recorder
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
+    StateAttributes,
     States,
+    Statistics,
+    StatisticsShortTerm,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
+    timestamp_to_utc_isoformat,
 )
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.const import (
@@ -25,6 +31,7 @@ from homeassistant.const import (
     CONF_ENTITIES,
     CONF_EXCLUDE,
     CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
     HTTP_BAD_REQUEST,
 )
 from homeassistant.core import Context, State, split_entity_id
@@ -32,7 +39,9 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
     CONF_ENTITY_GLOBS,
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
+    generate_filter,
 )
+from homeassistant.helpers.json import JSONEncoder
 from homeassistant.helpers.typing import HomeAssistantType
 import homeassistant.util.dt as dt_util
 
@@ -46,6 +55,8 @@ CONF_ORDER = "use_include_order"
 STATE_KEY = "state"
 LAST_CHANGED_KEY = "last_changed"
 
+STATISTICS_PERIODS = {"hour": Statistics, "5minute": StatisticsShortTerm}
+
 GLOB_TO_SQL_CHARS = {
     42: "%",  # *
     46: "_",  # .
@@ -79,17 +90,30 @@ QUERY_STATES = [
     States.domain,
     States.entity_id,
     States.state,
-    States.attributes,
-    States.last_changed,
-    States.last_updated,
+    # Attributes are inline for rows written before the state_attributes table
+    func.coalesce(StateAttributes.shared_attrs, States.attributes).label("attributes"),
+    States.last_changed_ts,
+    States.last_updated_ts,
 ]
 
 HISTORY_BAKERY = "history_bakery"
 
+# Rows fetched from the database cursor at a time when streaming
+STREAM_BATCH_SIZE = 1000
+# Encoded entities waiting to be written to a streamed response
+STREAM_QUEUE_SIZE = 4
+
+
+def _query_states(session):
+    """Return a query for QUERY_STATES with the shared attributes joined."""
+    return session.query(*QUERY_STATES).outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
+
 
 def get_significant_states(hass, *args, **kwargs):
     """Wrap _get_significant_states with a sql session."""
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         return _get_significant_states(hass, session, *args, **kwargs)
 
 
@@ -103,6 +127,7 @@ def _get_significant_states(
     include_start_time_state=True,
     significant_changes_only=True,
     minimal_response=False,
+    excluded_entity_ids=None,
 ):
     """
     Return states changes during UTC period start_time - end_time.
@@ -110,23 +135,66 @@ def _get_significant_states(
     Significant states are all states where there is a state change,
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
+
+    The changes of excluded_entity_ids are not returned, only their
+    state at the start time.
     """
     timer_start = time.perf_counter()
 
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
+    states = execute(
+        _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+            excluded_entity_ids,
+        )
+    )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_json(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
     )
 
+
+def _significant_states_query(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+    excluded_entity_ids,
+):
+    """Return the query of the significant states sorted by entity."""
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
+
     if significant_changes_only:
         baked_query += lambda q: q.filter(
             (
                 States.domain.in_(SIGNIFICANT_DOMAINS)
-                | (States.last_changed == States.last_updated)
+                | (States.last_changed_ts == States.last_updated_ts)
             )
-            & (States.last_updated > bindparam("start_time"))
+            & (States.last_updated_ts > bindparam("start_time_ts"))
         )
     else:
-        baked_query += lambda q: q.filter(States.last_updated > bindparam("start_time"))
+        baked_query += lambda q: q.filter(
+            States.last_updated_ts > bindparam("start_time_ts")
+        )
 
     if entity_ids is not None:
         baked_query += lambda q: q.filter(
@@ -137,59 +205,284 @@ def _get_significant_states(
         if filters:
             filters.bake(baked_query)
 
+    if excluded_entity_ids:
+        baked_query += lambda q: q.filter(
+            ~States.entity_id.in_(bindparam("excluded_entity_ids", expanding=True))
+        )
+
     if end_time is not None:
-        baked_query += lambda q: q.filter(States.last_updated < bindparam("end_time"))
+        baked_query += lambda q: q.filter(
+            States.last_updated_ts < bindparam("end_time_ts")
+        )
 
-    baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
+    baked_query += lambda q: q.order_by(States.entity_id, States.last_updated_ts)
 
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
-        )
+    return baked_query(session).params(
+        start_time_ts=start_time.timestamp(),
+        end_time_ts=end_time and end_time.timestamp(),
+        entity_ids=entity_ids,
+        excluded_entity_ids=excluded_entity_ids,
     )
 
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
 
-    return _sorted_states_to_json(
+def _stream_significant_states_json(hass, filters, *args, compact_response=False):
+    """Yield the significant states as a JSON array one entity at a time.
+
+    Rows are read from the database cursor in batches, so only the
+    states of one entity are held in memory.
+    """
+    separator = b"["
+    with session_scope(hass=hass, read_only=True) as session:
+        for _, ent_results in _iter_entity_history(
+            hass,
+            session,
+            filters,
+            *args,
+            compact_response=compact_response,
+            batch_size=STREAM_BATCH_SIZE,
+        ):
+            yield separator + json.dumps(ent_results, cls=JSONEncoder).encode("UTF-8")
+            separator = b","
+
+    yield b"[]" if separator == b"[" else b"]"
+
+
+def _iter_entity_history(
+    hass,
+    session,
+    filters,
+    start_time,
+    end_time,
+    entity_ids,
+    include_start_time_state,
+    significant_changes_only,
+    minimal_response,
+    statistics_table,
+    compact_response=False,
+    batch_size=None,
+):
+    """Yield the entity_id and history of each entity.
+
+    Entities are ordered by entity_id, entities that only have a state at
+    the start time and entities served from statistics come last.
+    """
+    statistics = {}
+    if statistics_table is not None:
+        statistics = _statistics_during_period(
+            hass, session, statistics_table, start_time, end_time, entity_ids, filters
+        )
+
+    states = _significant_states_query(
         hass,
         session,
-        states,
         start_time,
+        end_time,
         entity_ids,
         filters,
-        include_start_time_state,
-        minimal_response,
+        significant_changes_only,
+        list(statistics),
     )
+    if batch_size:
+        states = states.with_post_criteria(lambda q: q.yield_per(batch_size))
+
+    initial_states = {}
+    if include_start_time_state:
+        initial_states = _get_start_time_states(
+            hass, session, start_time, entity_ids, filters
+        )
+        for ent_id in statistics:
+            initial_states.pop(ent_id, None)
+
+    if compact_response:
+        yield from _compact_entity_states(states, initial_states, start_time)
+        for ent_id, points in statistics.items():
+            yield ent_id, _compact_history(
+                ent_id,
+                (
+                    (
+                        point[STATE_KEY],
+                        dt_util.parse_datetime(point[LAST_CHANGED_KEY]).timestamp(),
+                        point["attributes"],
+                    )
+                    for point in points
+                ),
+                keep_point_attributes=True,
+            )
+        return
+
+    yield from _entity_states(states, initial_states, minimal_response)
+    yield from initial_states.items()
+    yield from statistics.items()
+
+
+def _compact_entity_states(states, initial_states, start_time):
+    """Yield the entity_id and compact history of each entity."""
+    start_time_ts = start_time.timestamp()
+
+    def _initial_point(ent_id):
+        """Return the state at the start time as a point."""
+        initial = initial_states.pop(ent_id, None)
+        if initial is None:
+            return ()
+        return ((initial[0].state, start_time_ts, initial[0].attributes),)
+
+    for ent_id, group in groupby(states, lambda state: state.entity_id):
+        points = chain(
+            _initial_point(ent_id),
+            ((row.state, row.last_changed_ts, row.attributes) for row in group),
+        )
+        domain = split_entity_id(ent_id)[0]
+        yield ent_id, _compact_history(
+            ent_id, points, keep_point_attributes=domain in NEED_ATTRIBUTE_DOMAINS
+        )
+
+    for ent_id in list(initial_states):
+        yield ent_id, _compact_history(ent_id, _initial_point(ent_id))
+
+
+def _compact_history(entity_id, points, keep_point_attributes=False):
+    """Return the history of an entity as columns.
+
+    Points are (state, last changed in seconds since the epoch, attributes)
+    where the attributes are a dict or JSON. Only the attributes of the
+    first and last point are kept unless keep_point_attributes is set,
+    and points that do not change the state are dropped as they are
+    with minimal_response.
+    """
+    states = []
+    last_changed = []
+    point_attributes = []
+    first_attributes = last_attributes = None
+
+    for state, changed_ts, attributes in points:
+        last_attributes = attributes
+        if first_attributes is None:
+            first_attributes = attributes
+        elif not keep_point_attributes and state == states[-1]:
+            continue
+        states.append(state)
+        last_changed.append(changed_ts)
+        if keep_point_attributes:
+            point_attributes.append(_decode_attributes(attributes))
+
+    compact = {
+        "entity_id": entity_id,
+        STATE_KEY: states,
+        LAST_CHANGED_KEY: last_changed,
+        "attributes": _decode_attributes(first_attributes),
+    }
+    if last_attributes is not first_attributes:
+        last_attributes = _decode_attributes(last_attributes)
+        if last_attributes != compact["attributes"]:
+            compact["last_attributes"] = last_attributes
+    if keep_point_attributes:
+        compact["point_attributes"] = point_attributes
+    return compact
+
+
+def _decode_attributes(attributes):
+    """Return attributes that might still be JSON as a dict."""
+    if not isinstance(attributes, str):
+        return attributes
+    try:
+        return json.loads(attributes)
+    except ValueError:
+        _LOGGER.exception("Error converting attributes: %s", attributes)
+        return {}
+
+
+def _statistics_during_period(
+    hass, session, table, start_time, end_time=None, entity_ids=None, filters=None
+):
+    """Return the statistics of numeric sensors during a period as states.
+
+    The mean of each period is the state and the min, max and last value
+    are added to the attributes. The first state of each entity also gets
+    the current attributes of the entity so units and names are known.
+    """
+    timer_start = time.perf_counter()
+
+    query = session.query(
+        table.entity_id, table.start, table.mean, table.min, table.max, table.last
+    ).filter(table.start > start_time - table.period)
+
+    if entity_ids is not None:
+        query = query.filter(table.entity_id.in_(entity_ids))
+
+    if end_time is not None:
+        query = query.filter(table.start < end_time)
+
+    query = query.order_by(table.entity_id, table.start)
+
+    entity_filter = None
+    if entity_ids is None and filters and filters.has_config:
+        entity_filter = generate_filter(
+            filters.included_domains,
+            filters.included_entities,
+            filters.excluded_domains,
+            filters.excluded_entities,
+            filters.included_entity_globs,
+            filters.excluded_entity_globs,
+        )
+
+    result = {}
+    for ent_id, group in groupby(execute(query), lambda row: row.entity_id):
+        if entity_filter is not None and not entity_filter(ent_id):
+            continue
+
+        ent_results = result[ent_id] = []
+        for row in group:
+            last_changed = process_timestamp_to_utc_isoformat(row.start)
+            attributes = {"min": row.min, "max": row.max, "last": row.last}
+            if not ent_results:
+                state = hass.states.get(ent_id)
+                if state is not None:
+                    attributes = {**state.attributes, **attributes}
+            ent_results.append(
+                {
+                    "entity_id": ent_id,
+                    STATE_KEY: str(row.mean),
+                    "attributes": attributes,
+                    LAST_CHANGED_KEY: last_changed,
+                    "last_updated": last_changed,
+                }
+            )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("statistics_during_period took %fs", elapsed)
+
+    return result
 
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
-    with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+    with session_scope(hass=hass, read_only=True) as session:
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
 
         baked_query += lambda q: q.filter(
-            (States.last_changed == States.last_updated)
-            & (States.last_updated > bindparam("start_time"))
+            (States.last_changed_ts == States.last_updated_ts)
+            & (States.last_updated_ts > bindparam("start_time_ts"))
         )
 
         if end_time is not None:
             baked_query += lambda q: q.filter(
-                States.last_updated < bindparam("end_time")
+                States.last_updated_ts < bindparam("end_time_ts")
             )
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
-        baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
+        baked_query += lambda q: q.order_by(States.entity_id, States.last_updated_ts)
 
         states = execute(
             baked_query(session).params(
-                start_time=start_time, end_time=end_time, entity_id=entity_id
+                start_time_ts=start_time.timestamp(),
+                end_time_ts=end_time and end_time.timestamp(),
+                entity_id=entity_id,
             )
         )
 
@@ -202,18 +495,20 @@ def get_last_state_changes(hass, number_of_states, entity_id):
     """Return the last number_of_states."""
     start_time = dt_util.utcnow()
 
-    with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
+    with session_scope(hass=hass, read_only=True) as session:
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
+        baked_query += lambda q: q.filter(
+            States.last_changed_ts == States.last_updated_ts
         )
-        baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
-            States.entity_id, States.last_updated.desc()
+            States.entity_id, States.last_updated_ts.desc()
         )
 
         baked_query += lambda q: q.limit(bindparam("number_of_states"))
@@ -245,7 +540,7 @@ def get_states(hass, utc_point_in_time, entity_ids=None, run=None, filters=None)
         if run is None:
             return []
 
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         return _get_states_with_session(
             hass, session, utc_point_in_time, entity_ids, run, filters
         )
@@ -267,69 +562,121 @@ def _get_states_with_session(
         if run is None:
             return []
 
-    # We have more than one entity to look at (most commonly we want
-    # all entities,) so we need to do a search on all states since the
-    # last recorder run started.
-    query = session.query(*QUERY_STATES)
+    if entity_ids is not None:
+        return _get_entities_states_with_session(
+            session, utc_point_in_time, entity_ids, run
+        )
 
-    most_recent_states_by_date = session.query(
-        States.entity_id.label("max_entity_id"),
-        func.max(States.last_updated).label("max_last_updated"),
-    ).filter(
-        (States.last_updated >= run.start) & (States.last_updated < utc_point_in_time)
-    )
+    # We want all entities, so we need to do a search on all
+    # states since the last recorder run started.
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
+    baked_query += _join_most_recent_states
+    baked_query += lambda q: q.filter(~States.domain.in_(IGNORE_DOMAINS))
+    if filters:
+        filters.bake(baked_query)
 
-    if entity_ids:
-        most_recent_states_by_date.filter(States.entity_id.in_(entity_ids))
+    query = baked_query(session).params(
+        run_start_ts=process_timestamp(run.start).timestamp(),
+        utc_point_in_time_ts=utc_point_in_time.timestamp(),
+    )
 
-    most_recent_states_by_date = most_recent_states_by_date.group_by(States.entity_id)
+    return [LazyState(row) for row in execute(query)]
 
-    most_recent_states_by_date = most_recent_states_by_date.subquery()
 
-    most_recent_state_ids = session.query(
-        func.max(States.state_id).label("max_state_id")
-    ).join(
-        most_recent_states_by_date,
-        and_(
-            States.entity_id == most_recent_states_by_date.c.max_entity_id,
-            States.last_updated == most_recent_states_by_date.c.max_last_updated,
-        ),
+def _join_most_recent_states(query):
+    """Restrict a states query to the last state of each entity."""
+    session = query.session
+    most_recent_states_by_date = (
+        session.query(
+            States.entity_id.label("max_entity_id"),
+            func.max(States.last_updated_ts).label("max_last_updated"),
+        )
+        .filter(
+            (States.last_updated_ts >= bindparam("run_start_ts"))
+            & (States.last_updated_ts < bindparam("utc_point_in_time_ts"))
+        )
+        .group_by(States.entity_id)
+        .subquery()
     )
 
-    most_recent_state_ids = most_recent_state_ids.group_by(States.entity_id)
-
-    most_recent_state_ids = most_recent_state_ids.subquery()
+    most_recent_state_ids = (
+        session.query(func.max(States.state_id).label("max_state_id"))
+        .join(
+            most_recent_states_by_date,
+            and_(
+                States.entity_id == most_recent_states_by_date.c.max_entity_id,
+                States.last_updated_ts == most_recent_states_by_date.c.max_last_updated,
+            ),
+        )
+        .group_by(States.entity_id)
+        .subquery()
+    )
 
-    query = query.join(
+    return query.join(
         most_recent_state_ids,
         States.state_id == most_recent_state_ids.c.max_state_id,
     )
 
-    if entity_ids is not None:
-        query = query.filter(States.entity_id.in_(entity_ids))
-    else:
-        query = query.filter(~States.domain.in_(IGNORE_DOMAINS))
-        if filters:
-            query = filters.apply(query)
 
-    return [LazyState(row) for row in execute(query)]
+def _get_entities_states_with_session(session, utc_point_in_time, entity_ids, run):
+    """Return the last state of each entity before a point in time.
+
+    Like the all entities lookup, only states recorded since the recorder
+    run started are considered. The statement is compiled once and executed
+    for every entity, so each lookup is a single range seek on the
+    (entity_id, last_updated_ts) index no matter how many states were
+    recorded since the recorder run started.
+    """
+    query = (
+        _query_states(session)
+        .filter(
+            States.last_updated_ts >= bindparam("run_start_ts"),
+            States.last_updated_ts < bindparam("utc_point_in_time_ts"),
+            States.entity_id == bindparam("entity_id"),
+        )
+        .order_by(States.last_updated_ts.desc())
+        .limit(1)
+    )
+    connection = session.connection()
+    compiled = query.statement.compile(dialect=connection.dialect)
+    run_start_ts = process_timestamp(run.start).timestamp()
+    utc_point_in_time_ts = utc_point_in_time.timestamp()
+
+    timer_start = time.perf_counter()
+    states = []
+    for entity_id in entity_ids:
+        row = connection.execute(
+            compiled,
+            run_start_ts=run_start_ts,
+            utc_point_in_time_ts=utc_point_in_time_ts,
+            entity_id=entity_id,
+        ).first()
+        if row is not None:
+            states.append(LazyState(row))
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug(
+            "Looked up %d entities in %fs",
+            len(entity_ids),
+            time.perf_counter() - timer_start,
+        )
+
+    return states
 
 
 def _get_single_entity_states_with_session(hass, session, utc_point_in_time, entity_id):
     # Use an entirely different (and extremely fast) query if we only
     # have a single entity id
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
-    )
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
     baked_query += lambda q: q.filter(
-        States.last_updated < bindparam("utc_point_in_time"),
+        States.last_updated_ts < bindparam("utc_point_in_time_ts"),
         States.entity_id == bindparam("entity_id"),
     )
-    baked_query += lambda q: q.order_by(States.last_updated.desc())
+    baked_query += lambda q: q.order_by(States.last_updated_ts.desc())
     baked_query += lambda q: q.limit(1)
 
     query = baked_query(session).params(
-        utc_point_in_time=utc_point_in_time, entity_id=entity_id
+        utc_point_in_time_ts=utc_point_in_time.timestamp(), entity_id=entity_id
     )
 
     return [LazyState(row) for row in execute(query)]
@@ -362,29 +709,55 @@ def _sorted_states_to_json(
         for ent_id in entity_ids:
             result[ent_id] = []
 
-    # Get the states at the start time
-    timer_start = time.perf_counter()
+    initial_states = {}
     if include_start_time_state:
-        run = recorder.run_information_from_instance(hass, start_time)
-        for state in _get_states_with_session(
-            hass, session, start_time, entity_ids, run=run, filters=filters
-        ):
-            state.last_changed = start_time
-            state.last_updated = start_time
-            result[state.entity_id].append(state)
+        initial_states = _get_start_time_states(
+            hass, session, start_time, entity_ids, filters
+        )
+        result.update(initial_states)
+
+    for ent_id, ent_results in _entity_states(states, initial_states, minimal_response):
+        result[ent_id] = ent_results
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
+
+
+def _get_start_time_states(hass, session, start_time, entity_ids, filters):
+    """Return the states at the start time as the first state of each entity."""
+    timer_start = time.perf_counter()
+
+    initial_states = {}
+    run = recorder.run_information_from_instance(hass, start_time)
+    for state in _get_states_with_session(
+        hass, session, start_time, entity_ids, run=run, filters=filters
+    ):
+        state.last_changed = start_time
+        state.last_updated = start_time
+        initial_states[state.entity_id] = [state]
 
     if _LOGGER.isEnabledFor(logging.DEBUG):
         elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
+        _LOGGER.debug(
+            "getting %d first datapoints took %fs", len(initial_states), elapsed
+        )
+
+    return initial_states
+
 
+def _entity_states(states, initial_states, minimal_response):
+    """Yield the entity_id and the states of each entity with changes.
+
+    The first state of an entity is taken from initial_states, the
+    entities that are yielded are removed from it.
+    """
     # Called in a tight loop so cache the function
     # here
-    _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
+    _timestamp_to_utc_isoformat = timestamp_to_utc_isoformat
 
-    # Append all changes to it
     for ent_id, group in groupby(states, lambda state: state.entity_id):
         domain = split_entity_id(ent_id)[0]
-        ent_results = result[ent_id]
+        ent_results = initial_states.pop(ent_id, [])
         if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
             ent_results.extend(LazyState(db_state) for db_state in group)
 
@@ -407,8 +780,8 @@ def _sorted_states_to_json(
             ent_results.append(
                 {
                     STATE_KEY: db_state.state,
-                    LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
-                        db_state.last_changed
+                    LAST_CHANGED_KEY: _timestamp_to_utc_isoformat(
+                        db_state.last_changed_ts
                     ),
                 }
             )
@@ -420,8 +793,7 @@ def _sorted_states_to_json(
             # a full state
             ent_results[-1] = LazyState(prev_state)
 
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+        yield ent_id, ent_results
 
 
 def get_state(hass, utc_point_in_time, entity_id, run=None):
@@ -462,7 +834,7 @@ class HistoryPeriodView(HomeAssistantView):
 
     async def get(
         self, request: web.Request, datetime: Optional[str] = None
-    ) -> web.Response:
+    ) -> web.StreamResponse:
         """Return history over a period of time."""
         datetime_ = None
         if datetime:
@@ -501,6 +873,14 @@ class HistoryPeriodView(HomeAssistantView):
         )
 
         minimal_response = "minimal_response" in request.query
+        compact_response = request.query.get("minimal_response") == "compact"
+
+        statistics_table = None
+        statistics_period = request.query.get("statistics_period")
+        if statistics_period:
+            statistics_table = STATISTICS_PERIODS.get(statistics_period)
+            if statistics_table is None:
+                return self.json_message("Invalid statistics_period", HTTP_BAD_REQUEST)
 
         hass = request.app["hass"]
 
@@ -511,6 +891,20 @@ class HistoryPeriodView(HomeAssistantView):
         ):
             return self.json([])
 
+        if "stream" in request.query:
+            return await self._async_stream_significant_states(
+                request,
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                statistics_table,
+                compact_response=compact_response,
+            )
+
         return cast(
             web.Response,
             await hass.async_add_executor_job(
@@ -522,9 +916,62 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                statistics_table,
+                compact_response,
             ),
         )
 
+    async def _async_stream_significant_states(
+        self,
+        request: web.Request,
+        hass: HomeAssistantType,
+        *args: Any,
+        compact_response: bool = False,
+    ) -> web.StreamResponse:
+        """Stream the significant states while they are read from the database."""
+        response = web.StreamResponse(headers={hdrs.CONTENT_TYPE: CONTENT_TYPE_JSON})
+        response.enable_chunked_encoding()
+        response.enable_compression()
+        await response.prepare(request)
+
+        chunks: asyncio.Queue = asyncio.Queue(STREAM_QUEUE_SIZE)
+        cancel = threading.Event()
+
+        def _put(chunk):
+            """Wait until there is room for a chunk in the queue."""
+            asyncio.run_coroutine_threadsafe(chunks.put(chunk), hass.loop).result()
+
+        def _produce():
+            """Read and encode the states in the executor."""
+            try:
+                for chunk in _stream_significant_states_json(
+                    hass, self.filters, *args, compact_response=compact_response
+                ):
+                    if cancel.is_set():
+                        return
+                    _put(chunk)
+            finally:
+                _put(None)
+
+        producer = hass.async_add_executor_job(_produce)
+
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is None:
+                    break
+                await response.write(chunk)
+        except BaseException:
+            # Let the producer finish so it releases its session
+            cancel.set()
+            while await chunks.get() is not None:
+                pass
+            raise
+
+        await producer
+        await response.write_eof()
+        return response
+
     def _sorted_significant_states_json(
         self,
         hass,
@@ -534,42 +981,100 @@ class HistoryPeriodView(HomeAssistantView):
         include_start_time_state,
         significant_changes_only,
         minimal_response,
+        statistics_table=None,
+        compact_response=False,
     ):
         """Fetch significant stats from the database as json."""
         timer_start = time.perf_counter()
 
-        with session_scope(hass=hass) as session:
-            result = _get_significant_states(
+        with session_scope(hass=hass, read_only=True) as session:
+            if compact_response:
+                result = dict(
+                    _iter_entity_history(
+                        hass,
+                        session,
+                        self.filters,
+                        start_time,
+                        end_time,
+                        entity_ids,
+                        include_start_time_state,
+                        significant_changes_only,
+                        minimal_response,
+                        statistics_table,
+                        compact_response=True,
+                    )
+                )
+            else:
+                result = self._significant_states_by_entity(
+                    hass,
+                    session,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    include_start_time_state,
+                    significant_changes_only,
+                    minimal_response,
+                    statistics_table,
+                )
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug("Extracted %d entities in %fs", len(result), elapsed)
+
+        # Optionally reorder the result to respect the ordering given
+        # by any entities explicitly included in the configuration.
+        if self.filters and self.use_include_order:
+            sorted_result = [
+                result.pop(order_entity)
+                for order_entity in self.filters.included_entities
+                if order_entity in result
+            ]
+            sorted_result.extend(result.values())
+            return self.json(sorted_result)
+
+        return self.json(list(result.values()))
+
+    def _significant_states_by_entity(
+        self,
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        statistics_table,
+    ):
+        """Return the significant states of each entity."""
+        statistics = {}
+        if statistics_table is not None:
+            statistics = _statistics_during_period(
                 hass,
                 session,
+                statistics_table,
                 start_time,
                 end_time,
                 entity_ids,
                 self.filters,
-                include_start_time_state,
-                significant_changes_only,
-                minimal_response,
             )
 
-        result = list(result.values())
-        if _LOGGER.isEnabledFor(logging.DEBUG):
-            elapsed = time.perf_counter() - timer_start
-            _LOGGER.debug("Extracted %d states in %fs", sum(map(len, result)), elapsed)
-
-        # Optionally reorder the result to respect the ordering given
-        # by any entities explicitly included in the configuration.
-        if self.filters and self.use_include_order:
-            sorted_result = []
-            for order_entity in self.filters.included_entities:
-                for state_list in result:
-                    if state_list[0].entity_id == order_entity:
-                        sorted_result.append(state_list)
-                        result.remove(state_list)
-                        break
-            sorted_result.extend(result)
-            result = sorted_result
+        result = _get_significant_states(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            self.filters,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            list(statistics),
+        )
 
-        return self.json(result)
+        # Entities with statistics are served from them instead of their states
+        result.update(statistics)
+        return result
 
 
 def sqlalchemy_filter_from_include_exclude_conf(conf):
@@ -704,6 +1209,7 @@ class LazyState(State):
         self._last_changed = None
         self._last_updated = None
         self._context = None
+        self._as_json = None
 
     @property  # type: ignore
     def attributes(self):
@@ -738,7 +1244,7 @@ class LazyState(State):
     def last_changed(self):
         """Last changed datetime."""
         if not self._last_changed:
-            self._last_changed = process_timestamp(self._row.last_changed)
+            self._last_changed = dt_util.utc_from_timestamp(self._row.last_changed_ts)
         return self._last_changed
 
     @last_changed.setter
@@ -750,7 +1256,7 @@ class LazyState(State):
     def last_updated(self):
         """Last updated datetime."""
         if not self._last_updated:
-            self._last_updated = process_timestamp(self._row.last_updated)
+            self._last_updated = dt_util.utc_from_timestamp(self._row.last_updated_ts)
         return self._last_updated
 
     @last_updated.setter
@@ -768,14 +1274,14 @@ class LazyState(State):
         if self._last_changed:
             last_changed_isoformat = self._last_changed.isoformat()
         else:
-            last_changed_isoformat = process_timestamp_to_utc_isoformat(
-                self._row.last_changed
+            last_changed_isoformat = timestamp_to_utc_isoformat(
+                self._row.last_changed_ts
             )
         if self._last_updated:
             last_updated_isoformat = self._last_updated.isoformat()
         else:
-            last_updated_isoformat = process_timestamp_to_utc_isoformat(
-                self._row.last_updated
+            last_updated_isoformat = timestamp_to_utc_isoformat(
+                self._row.last_updated_ts
             )
         return {
             "entity_id": self.entity_id,
@@ -26,7 +26,7 @@ from homeassistant.const import (
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
 )
-from homeassistant.core import callback
+from homeassistant.core import Event, callback
 from homeassistant.helpers import event as event_helper, state as state_helper
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity_values import EntityValues
@@ -192,9 +192,27 @@ CONFIG_SCHEMA = vol.Schema(
 )
 
 
-def _generate_event_to_json(conf: Dict) -> Callable[[Dict], str]:
-    """Build event to json converter and add to config."""
+def _generate_event_filter(conf: Dict) -> Callable[[Event], bool]:
+    """Build the filter of state changed events that are written."""
     entity_filter = convert_include_exclude_filter(conf)
+
+    @callback
+    def event_filter(event: Event) -> bool:
+        """Return if the state of a state changed event is written."""
+        state = event.data.get(EVENT_NEW_STATE)
+        return (
+            state is not None
+            and state.state not in (STATE_UNKNOWN, "", STATE_UNAVAILABLE)
+            and entity_filter(state.entity_id)
+        )
+
+    return event_filter
+
+
+def _generate_event_to_json(
+    conf: Dict, event_filter: Callable[[Event], bool]
+) -> Callable[[Dict], str]:
+    """Build event to json converter and add to config."""
     tags = conf.get(CONF_TAGS)
     tags_attributes = conf.get(CONF_TAGS_ATTRIBUTES)
     default_measurement = conf.get(CONF_DEFAULT_MEASUREMENT)
@@ -209,13 +227,9 @@ def _generate_event_to_json(conf: Dict) -> Callable[[Dict], str]:
 
     def event_to_json(event: Dict) -> str:
         """Convert event into json in format Influx expects."""
-        state = event.data.get(EVENT_NEW_STATE)
-        if (
-            state is None
-            or state.state in (STATE_UNKNOWN, "", STATE_UNAVAILABLE)
-            or not entity_filter(state.entity_id)
-        ):
+        if not event_filter(event):
             return
+        state = event.data[EVENT_NEW_STATE]
 
         try:
             _include_state = _include_value = False
@@ -471,9 +485,12 @@ def setup(hass, config):
         event_helper.call_later(hass, RETRY_INTERVAL, lambda _: setup(hass, config))
         return True
 
-    event_to_json = _generate_event_to_json(conf)
+    event_filter = _generate_event_filter(conf)
+    event_to_json = _generate_event_to_json(conf, event_filter)
     max_tries = conf.get(CONF_RETRY_COUNT)
-    instance = hass.data[DOMAIN] = InfluxThread(hass, influx, event_to_json, max_tries)
+    instance = hass.data[DOMAIN] = InfluxThread(
+        hass, influx, event_to_json, max_tries, event_filter
+    )
     instance.start()
 
     def shutdown(event):
@@ -490,7 +507,7 @@ def setup(hass, config):
 class InfluxThread(threading.Thread):
     """A threaded event handler class."""
 
-    def __init__(self, hass, influx, event_to_json, max_tries):
+    def __init__(self, hass, influx, event_to_json, max_tries, event_filter):
         """Initialize the listener."""
         threading.Thread.__init__(self, name=DOMAIN)
         self.queue = queue.Queue()
@@ -499,7 +516,7 @@ class InfluxThread(threading.Thread):
         self.max_tries = max_tries
         self.write_errors = 0
         self.shutdown = False
-        hass.bus.listen(EVENT_STATE_CHANGED, self._event_listener)
+        hass.bus.listen(EVENT_STATE_CHANGED, self._event_listener, event_filter)
 
     @callback
     def _event_listener(self, event):
@@ -14,8 +14,9 @@ from homeassistant.components.history import sqlalchemy_filter_from_include_excl
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
     Events,
+    StateAttributes,
     States,
-    process_timestamp_to_utc_isoformat,
+    timestamp_to_utc_isoformat,
 )
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
@@ -90,11 +91,16 @@ ALL_EVENT_TYPES = [
 EVENT_COLUMNS = [
     Events.event_type,
     Events.event_data,
-    Events.time_fired,
+    Events.time_fired_ts,
     Events.context_id,
     Events.context_user_id,
 ]
 
+# Attributes are inline for rows written before the state_attributes table
+STATE_ATTRIBUTES = sqlalchemy.func.coalesce(
+    StateAttributes.shared_attrs, States.attributes
+)
+
 SCRIPT_AUTOMATION_EVENTS = [EVENT_AUTOMATION_TRIGGERED, EVENT_SCRIPT_STARTED]
 
 LOG_MESSAGE_SCHEMA = vol.Schema(
@@ -440,7 +446,7 @@ def _get_events(
     if entity_ids is not None:
         entities_filter = generate_filter([], entity_ids, [], [])
 
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         old_state = aliased(States, name="old_state")
 
         if entity_ids is not None:
@@ -465,7 +471,7 @@ def _get_events(
             query = _apply_events_types_and_states_filter(
                 hass, query, old_state
             ).filter(
-                (States.last_updated == States.last_changed)
+                (States.last_updated_ts == States.last_changed_ts)
                 | (Events.event_type != EVENT_STATE_CHANGED)
             )
             if filters:
@@ -473,7 +479,7 @@ def _get_events(
                     filters.entity_filter() | (Events.event_type != EVENT_STATE_CHANGED)
                 )
 
-        query = query.order_by(Events.time_fired)
+        query = query.order_by(Events.time_fired_ts)
 
         return list(
             humanify(hass, yield_events(query), entity_attr_cache, context_lookup)
@@ -486,7 +492,7 @@ def _generate_events_query(session):
         States.state,
         States.entity_id,
         States.domain,
-        States.attributes,
+        STATE_ATTRIBUTES.label("attributes"),
     )
 
 
@@ -504,12 +510,18 @@ def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
     return (
         _generate_events_query(session)
         .outerjoin(Events, (States.event_id == Events.event_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
         .filter(_missing_state_matcher(old_state))
         .filter(_continuous_entity_matcher())
-        .filter((States.last_updated > start_day) & (States.last_updated < end_day))
         .filter(
-            (States.last_updated == States.last_changed)
+            (States.last_updated_ts > _timestamp(start_day))
+            & (States.last_updated_ts < _timestamp(end_day))
+        )
+        .filter(
+            (States.last_updated_ts == States.last_changed_ts)
             & States.entity_id.in_(entity_ids)
         )
     )
@@ -518,6 +530,9 @@ def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
 def _apply_events_types_and_states_filter(hass, query, old_state):
     events_query = (
         query.outerjoin(States, (Events.event_id == States.event_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
         .filter(
             (Events.event_type != EVENT_STATE_CHANGED)
@@ -548,16 +563,22 @@ def _continuous_entity_matcher():
     #
     return sqlalchemy.or_(
         sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS)),
-        sqlalchemy.not_(States.attributes.contains(UNIT_OF_MEASUREMENT_JSON)),
+        sqlalchemy.not_(STATE_ATTRIBUTES.contains(UNIT_OF_MEASUREMENT_JSON)),
     )
 
 
 def _apply_event_time_filter(events_query, start_day, end_day):
     return events_query.filter(
-        (Events.time_fired > start_day) & (Events.time_fired < end_day)
+        (Events.time_fired_ts > _timestamp(start_day))
+        & (Events.time_fired_ts < _timestamp(end_day))
     )
 
 
+def _timestamp(value):
+    """Return the seconds since the epoch used by the timestamp columns."""
+    return dt_util.as_utc(value).timestamp()
+
+
 def _apply_event_types_filter(hass, query, event_types):
     return query.filter(
         Events.event_type.in_(event_types + list(hass.data.get(DOMAIN, {})))
@@ -687,7 +708,7 @@ class LazyEventPartialState:
         self.domain = self._row.domain
         self.context_id = self._row.context_id
         self.context_user_id = self._row.context_user_id
-        self.time_fired_minute = self._row.time_fired.minute
+        self.time_fired_minute = int(self._row.time_fired_ts // 60 % 60)
 
     @property
     def attributes_icon(self):
@@ -743,8 +764,8 @@ class LazyEventPartialState:
     def time_fired_isoformat(self):
         """Time event was fired in utc isoformat."""
         if not self._time_fired_isoformat:
-            self._time_fired_isoformat = process_timestamp_to_utc_isoformat(
-                self._row.time_fired or dt_util.utcnow()
+            self._time_fired_isoformat = timestamp_to_utc_isoformat(
+                self._row.time_fired_ts or dt_util.utcnow().timestamp()
             )
 
         return self._time_fired_isoformat
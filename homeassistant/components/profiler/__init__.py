@@ -10,10 +10,12 @@ import objgraph
 from pyprof2calltree import convert
 import voluptuous as vol
 
+from homeassistant.components import websocket_api
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, ServiceCall
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.job_profiler import JobProfiler
 from homeassistant.helpers.service import async_register_admin_service
 from homeassistant.helpers.typing import ConfigType
 
@@ -24,6 +26,7 @@ SERVICE_MEMORY = "memory"
 SERVICE_START_LOG_OBJECTS = "start_log_objects"
 SERVICE_STOP_LOG_OBJECTS = "stop_log_objects"
 SERVICE_DUMP_LOG_OBJECTS = "dump_log_objects"
+SERVICE_JOBS = "jobs"
 
 SERVICES = (
     SERVICE_START,
@@ -31,6 +34,7 @@ SERVICES = (
     SERVICE_START_LOG_OBJECTS,
     SERVICE_STOP_LOG_OBJECTS,
     SERVICE_DUMP_LOG_OBJECTS,
+    SERVICE_JOBS,
 )
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
@@ -38,14 +42,19 @@ DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
 CONF_SECONDS = "seconds"
 CONF_SCAN_INTERVAL = "scan_interval"
 CONF_TYPE = "type"
+CONF_TOP = "top"
+
+DEFAULT_TOP = 20
 
 LOG_INTERVAL_SUB = "log_interval_subscription"
+JOBS_LOCK = "jobs_lock"
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the profiler component."""
+    websocket_api.async_register_command(hass, websocket_profile_jobs)
     return True
 
 
@@ -53,7 +62,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up Profiler from a config entry."""
 
     lock = asyncio.Lock()
-    domain_data = hass.data[DOMAIN] = {}
+    domain_data = hass.data[DOMAIN] = {JOBS_LOCK: asyncio.Lock()}
 
     async def _async_run_profile(call: ServiceCall):
         async with lock:
@@ -109,6 +118,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         ),
     )
 
+    async def _async_dump_jobs(call: ServiceCall):
+        start_time = int(time.time() * 1000000)
+        hass.components.persistent_notification.async_create(
+            "The job profile has started. This notification will be updated when it is complete.",
+            title="Profile Started",
+            notification_id=f"job_profiler_{start_time}",
+        )
+        report = await _async_profile_jobs(
+            hass, call.data[CONF_SECONDS], call.data[CONF_TOP]
+        )
+        _LOGGER.critical("Jobs that took the most time: %s", report)
+        hass.components.persistent_notification.async_create(
+            "The jobs that took the most time have been dumped to the log. See [the logs](/config/logs) to review them.",
+            title="Profile Complete",
+            notification_id=f"job_profiler_{start_time}",
+        )
+
     async_register_admin_service(
         hass,
         DOMAIN,
@@ -119,6 +145,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         ),
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_JOBS,
+        _async_dump_jobs,
+        schema=vol.Schema(
+            {
+                vol.Optional(CONF_SECONDS, default=60.0): vol.Coerce(float),
+                vol.Optional(CONF_TOP, default=DEFAULT_TOP): cv.positive_int,
+            }
+        ),
+    )
+
     async_register_admin_service(
         hass,
         DOMAIN,
@@ -162,6 +201,37 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     return True
 
 
+@websocket_api.require_admin
+@websocket_api.async_response
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "profiler/jobs",
+        vol.Optional(CONF_SECONDS, default=10.0): vol.Coerce(float),
+        vol.Optional(CONF_TOP, default=DEFAULT_TOP): cv.positive_int,
+    }
+)
+async def websocket_profile_jobs(hass, connection, msg):
+    """Profile the jobs for a number of seconds and return the top ones."""
+    if DOMAIN not in hass.data:
+        connection.send_error(msg["id"], "not_loaded", "Profiler is not set up")
+        return
+
+    connection.send_result(
+        msg["id"], await _async_profile_jobs(hass, msg[CONF_SECONDS], msg[CONF_TOP])
+    )
+
+
+async def _async_profile_jobs(hass: HomeAssistant, seconds: float, top: int):
+    """Account the jobs that are run for a number of seconds."""
+    async with hass.data[DOMAIN][JOBS_LOCK]:
+        profiler = hass.job_profiler = JobProfiler()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            hass.job_profiler = None
+        return profiler.report(top)
+
+
 async def _async_generate_profile(hass: HomeAssistant, call: ServiceCall):
     start_time = int(time.time() * 1000000)
     hass.components.persistent_notification.async_create(
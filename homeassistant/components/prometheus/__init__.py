@@ -103,7 +103,7 @@ def setup(hass, config):
         default_metric,
     )
 
-    hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_event)
+    hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_event, metrics.event_filter)
     return True
 
 
@@ -141,19 +141,20 @@ class PrometheusMetrics:
         self._metrics = {}
         self._climate_units = climate_units
 
+    @hacore.callback
+    def event_filter(self, event):
+        """Return if a state changed event should be added to Prometheus."""
+        state = event.data.get("new_state")
+        return state is not None and self._filter(state.entity_id)
+
+    @hacore.callback
     def handle_event(self, event):
         """Listen for new messages on the bus, and add them to Prometheus."""
         state = event.data.get("new_state")
-        if state is None:
-            return
-
         entity_id = state.entity_id
         _LOGGER.debug("Handling state update for %s", entity_id)
         domain, _ = hacore.split_entity_id(entity_id)
 
-        if not self._filter(state.entity_id):
-            return
-
         handler = f"_handle_{domain}"
 
         if hasattr(self, handler) and state.state != STATE_UNAVAILABLE:
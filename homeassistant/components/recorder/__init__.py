@@ -2,16 +2,15 @@
 import asyncio
 from collections import namedtuple
 import concurrent.futures
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
-import queue
 import threading
 import time
 from typing import Any, Callable, List, Optional
 
 from sqlalchemy import create_engine, event as sqlalchemy_event, exc, select
 from sqlalchemy.orm import scoped_session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
 import voluptuous as vol
 
 from homeassistant.components import persistent_notification
@@ -34,9 +33,21 @@ from homeassistant.helpers.entityfilter import (
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
-from . import migration, purge
+from . import migration, purge, websocket_api
+from .bulk import BulkWriter
 from .const import CONF_DB_INTEGRITY_CHECK, DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
-from .models import Base, Events, RecorderRuns, States
+from .event_queue import OVERFLOW_DROP, OVERFLOW_POLICIES, RecorderQueue
+from .models import (
+    Base,
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+    Statistics,
+    StatisticsShortTerm,
+)
+from .state_attributes import StateAttributesManager
+from .statistics import StatisticsCompiler
 from .util import session_scope, validate_or_move_away_sqlite_database
 
 _LOGGER = logging.getLogger(__name__)
@@ -59,8 +70,18 @@ DEFAULT_DB_INTEGRITY_CHECK = True
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 1
+DEFAULT_BULK_INSERT = False
+DEFAULT_MAX_QUEUE_SIZE = 0
+DEFAULT_OVERFLOW_POLICY = OVERFLOW_DROP
+DEFAULT_STATISTICS = True
+DEFAULT_SHORT_TERM_STATISTICS = False
+DEFAULT_READ_POOL_SIZE = 4
 KEEPALIVE_TIME = 30
 
+# Negative cache sizes are in KiB
+SQLITE_READ_CACHE_SIZE = -32768
+SQLITE_READ_MMAP_SIZE = 256 * 1024 * 1024
+
 # Controls how often we clean up
 # States and Events objects
 EXPIRE_AFTER_COMMITS = 120
@@ -73,6 +94,12 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_BULK_INSERT = "bulk_insert"
+CONF_MAX_QUEUE_SIZE = "max_queue_size"
+CONF_OVERFLOW_POLICY = "overflow_policy"
+CONF_STATISTICS = "statistics"
+CONF_SHORT_TERM_STATISTICS = "short_term_statistics"
+CONF_READ_POOL_SIZE = "read_pool_size"
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
     {vol.Optional(CONF_EVENT_TYPES): vol.All(cv.ensure_list, [cv.string])}
@@ -97,6 +124,25 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
                     ): cv.positive_int,
+                    vol.Optional(
+                        CONF_BULK_INSERT, default=DEFAULT_BULK_INSERT
+                    ): cv.boolean,
+                    vol.Optional(
+                        CONF_MAX_QUEUE_SIZE, default=DEFAULT_MAX_QUEUE_SIZE
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_OVERFLOW_POLICY, default=DEFAULT_OVERFLOW_POLICY
+                    ): vol.In(OVERFLOW_POLICIES),
+                    vol.Optional(
+                        CONF_READ_POOL_SIZE, default=DEFAULT_READ_POOL_SIZE
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_STATISTICS, default=DEFAULT_STATISTICS
+                    ): cv.boolean,
+                    vol.Optional(
+                        CONF_SHORT_TERM_STATISTICS,
+                        default=DEFAULT_SHORT_TERM_STATISTICS,
+                    ): cv.boolean,
                     vol.Optional(
                         CONF_DB_MAX_RETRIES, default=DEFAULT_DB_MAX_RETRIES
                     ): cv.positive_int,
@@ -161,6 +207,15 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     auto_purge = conf[CONF_AUTO_PURGE]
     keep_days = conf[CONF_PURGE_KEEP_DAYS]
     commit_interval = conf[CONF_COMMIT_INTERVAL]
+    bulk_insert = conf[CONF_BULK_INSERT]
+    max_queue_size = conf[CONF_MAX_QUEUE_SIZE]
+    overflow_policy = conf[CONF_OVERFLOW_POLICY]
+    read_pool_size = conf[CONF_READ_POOL_SIZE]
+    statistics_tables = []
+    if conf[CONF_STATISTICS]:
+        statistics_tables.append(Statistics)
+    if conf[CONF_SHORT_TERM_STATISTICS]:
+        statistics_tables.append(StatisticsShortTerm)
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
     db_integrity_check = conf[CONF_DB_INTEGRITY_CHECK]
@@ -175,6 +230,11 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         auto_purge=auto_purge,
         keep_days=keep_days,
         commit_interval=commit_interval,
+        bulk_insert=bulk_insert,
+        max_queue_size=max_queue_size,
+        overflow_policy=overflow_policy,
+        statistics_tables=statistics_tables,
+        read_pool_size=read_pool_size,
         uri=db_url,
         db_max_retries=db_max_retries,
         db_retry_wait=db_retry_wait,
@@ -193,11 +253,16 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         DOMAIN, SERVICE_PURGE, async_handle_purge_service, schema=SERVICE_PURGE_SCHEMA
     )
 
+    websocket_api.async_setup(hass)
+
     return await instance.async_db_ready
 
 
 PurgeTask = namedtuple("PurgeTask", ["keep_days", "repack"])
 
+# Commits, compiles statistics and keeps the connection alive
+TickTask = namedtuple("TickTask", ["now"])
+
 
 class WaitTask:
     """An object to insert into the recorder queue to tell it set the _queue_watch event."""
@@ -212,6 +277,11 @@ class Recorder(threading.Thread):
         auto_purge: bool,
         keep_days: int,
         commit_interval: int,
+        bulk_insert: bool,
+        max_queue_size: int,
+        overflow_policy: str,
+        statistics_tables: List[Any],
+        read_pool_size: int,
         uri: str,
         db_max_retries: int,
         db_retry_wait: int,
@@ -226,27 +296,38 @@ class Recorder(threading.Thread):
         self.auto_purge = auto_purge
         self.keep_days = keep_days
         self.commit_interval = commit_interval
-        self.queue: Any = queue.SimpleQueue()
+        self.bulk_insert = bulk_insert
+        self.queue = RecorderQueue(max_queue_size, overflow_policy)
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
+        self.read_pool_size = read_pool_size
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
         self.db_integrity_check = db_integrity_check
         self.async_db_ready = asyncio.Future()
         self._queue_watch = threading.Event()
         self.engine: Any = None
+        self.read_engine: Any = None
         self.run_info: Any = None
 
         self.entity_filter = entity_filter
         self.exclude_t = exclude_t
 
-        self._timechanges_seen = 0
         self._commits_without_expire = 0
         self._keepalive_count = 0
         self._old_states = {}
         self._pending_expunge = []
+        self.state_attributes = StateAttributesManager()
+        self._bulk_writer = BulkWriter(self.state_attributes) if bulk_insert else None
+        self._statistics_compilers = [
+            StatisticsCompiler(table) for table in statistics_tables
+        ]
+        self.purge_progress: Optional[purge.PurgeProgress] = None
+        self.commit_latency: Optional[float] = None
+        self.max_commit_latency: Optional[float] = None
         self.event_session = None
         self.get_session = None
+        self.get_read_session = None
         self._completed_database_setup = False
 
     @callback
@@ -348,8 +429,21 @@ class Recorder(threading.Thread):
                 async_purge, hour=4, minute=12, second=0
             )
 
+        tick_seconds = self.commit_interval or 1
+
+        @callback
+        def async_tick(_now):
+            """Trigger the tick."""
+            self.queue.put(TickTask(dt_util.utcnow()))
+
+        self.hass.helpers.event.track_timer_interval(
+            async_tick, timedelta(seconds=tick_seconds)
+        )
+
         self.event_session = self.get_session()
         self.event_session.expire_on_commit = False
+        if self._bulk_writer:
+            self._bulk_writer.load_ids(self.event_session)
         # Use a session for the event read loop
         # with a commit every time the event time
         # has changed. This reduces the disk io.
@@ -360,6 +454,9 @@ class Recorder(threading.Thread):
                 self._close_connection()
                 return
             if isinstance(event, PurgeTask):
+                # Pending states can use shared attributes the purge
+                # deletes if no committed state uses them anymore
+                self._commit_event_session_or_retry()
                 # Schedule a new purge task if this one didn't finish
                 if not purge.purge_old_data(self, event.keep_days, event.repack):
                     self.queue.put(PurgeTask(event.keep_days, event.repack))
@@ -367,16 +464,17 @@ class Recorder(threading.Thread):
             if isinstance(event, WaitTask):
                 self._queue_watch.set()
                 continue
-            if event.event_type == EVENT_TIME_CHANGED:
-                self._keepalive_count += 1
+            if isinstance(event, TickTask):
+                compiled = self._compile_statistics(event.now)
+                self._keepalive_count += tick_seconds
                 if self._keepalive_count >= KEEPALIVE_TIME:
                     self._keepalive_count = 0
                     self._send_keep_alive()
-                if self.commit_interval:
-                    self._timechanges_seen += 1
-                    if self._timechanges_seen >= self.commit_interval:
-                        self._timechanges_seen = 0
-                        self._commit_event_session_or_retry()
+                if self.commit_interval or compiled:
+                    self._commit_event_session_or_retry()
+                continue
+            if event.event_type == EVENT_TIME_CHANGED:
+                # Only fired to listeners that opted in, never recorded
                 continue
             if event.event_type in self.exclude_t:
                 continue
@@ -386,6 +484,16 @@ class Recorder(threading.Thread):
                 if not self.entity_filter(entity_id):
                     continue
 
+            if event.event_type == EVENT_STATE_CHANGED:
+                for compiler in self._statistics_compilers:
+                    compiler.state_changed(
+                        entity_id, event.data.get("new_state"), event.time_fired
+                    )
+
+            if self._bulk_writer:
+                self._bulk_add_event(event)
+                continue
+
             try:
                 if event.event_type == EVENT_STATE_CHANGED:
                     dbevent = Events.from_event(event, event_data="{}")
@@ -401,8 +509,12 @@ class Recorder(threading.Thread):
 
             if dbevent and event.event_type == EVENT_STATE_CHANGED:
                 try:
-                    dbstate = States.from_event(event)
+                    dbstate = States.from_event(event, store_attributes=False)
                     has_new_state = event.data.get("new_state")
+                    if has_new_state:
+                        self._set_state_attributes(dbstate, has_new_state)
+                    else:
+                        self.state_attributes.forget_entity(dbstate.entity_id)
                     if dbstate.entity_id in self._old_states:
                         old_state = self._old_states.pop(dbstate.entity_id)
                         if old_state.state_id:
@@ -431,6 +543,55 @@ class Recorder(threading.Thread):
             if not self.commit_interval:
                 self._commit_event_session_or_retry()
 
+    def _set_state_attributes(self, dbstate, state):
+        """Set the shared attributes row of a state."""
+        shared_attrs = self.state_attributes.shared_attrs(dbstate.entity_id, state)
+        attributes = self.state_attributes.lookup(self.event_session, shared_attrs)
+        if attributes is None:
+            attributes = StateAttributes(
+                hash=StateAttributes.hash_shared_attrs(shared_attrs),
+                shared_attrs=shared_attrs,
+            )
+            self.state_attributes.add_pending(shared_attrs, attributes)
+
+        if isinstance(attributes, StateAttributes):
+            dbstate.state_attributes = attributes
+        else:
+            dbstate.attributes_id = attributes
+
+    def _bulk_add_event(self, event):
+        """Queue an event for the bulk write path."""
+        try:
+            self._bulk_writer.add(event, self.event_session)
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event is not JSON serializable: %s", event)
+        except Exception as err:  # pylint: disable=broad-except
+            # Must catch the exception to prevent the loop from collapsing
+            _LOGGER.exception("Error adding event: %s", err)
+
+        # If they do not have a commit interval
+        # than we commit right away
+        if not self.commit_interval:
+            self._commit_event_session_or_retry()
+
+    def _compile_statistics(self, now):
+        """Write the statistics of the periods that have ended.
+
+        Returns whether any rows were added to the session.
+        """
+        compiled = False
+        for compiler in self._statistics_compilers:
+            rows = compiler.compile(now)
+            if not rows:
+                continue
+            try:
+                self.event_session.execute(compiler.table.__table__.insert(), rows)
+                compiled = True
+            except Exception as err:  # pylint: disable=broad-except
+                # Must catch the exception to prevent the loop from collapsing
+                _LOGGER.exception("Error adding statistics: %s", err)
+        return compiled
+
     def _send_keep_alive(self):
         try:
             _LOGGER.debug("Sending keepalive")
@@ -451,7 +612,9 @@ class Recorder(threading.Thread):
                 time.sleep(self.db_retry_wait)
 
             try:
+                start = time.perf_counter()
                 self._commit_event_session()
+                self._update_commit_latency(time.perf_counter() - start)
                 return
             except (exc.InternalError, exc.OperationalError) as err:
                 if err.connection_invalidated:
@@ -481,6 +644,12 @@ class Recorder(threading.Thread):
         )
         self._reopen_event_session()
 
+    def _update_commit_latency(self, latency):
+        """Record how long the last commit took."""
+        self.commit_latency = latency
+        if self.max_commit_latency is None or latency > self.max_commit_latency:
+            self.max_commit_latency = latency
+
     def _reopen_event_session(self):
         try:
             self.event_session.rollback()
@@ -497,6 +666,9 @@ class Recorder(threading.Thread):
         try:
             self.event_session = self.get_session()
             self.event_session.expire_on_commit = False
+            self.state_attributes.reset()
+            if self._bulk_writer:
+                self._bulk_writer.reset(self.event_session)
         except Exception as err:  # pylint: disable=broad-except
             # Must catch the exception to prevent the loop from collapsing
             _LOGGER.exception("Error while creating new event session: %s", err)
@@ -505,6 +677,8 @@ class Recorder(threading.Thread):
         self._commits_without_expire += 1
 
         try:
+            if self._bulk_writer:
+                self._bulk_writer.write(self.event_session)
             if self._pending_expunge:
                 self.event_session.flush()
                 for dbstate in self._pending_expunge:
@@ -521,12 +695,20 @@ class Recorder(threading.Thread):
             )
             self.event_session.rollback()
             self._old_states = {}
+            self.state_attributes.reset()
+            self._reset_bulk_writer()
             raise
         except Exception as err:
             _LOGGER.error("Error executing query: %s", err)
             self.event_session.rollback()
+            self.state_attributes.reset()
+            self._reset_bulk_writer()
             raise
 
+        self.state_attributes.commit()
+        if self._bulk_writer:
+            self._bulk_writer.clear()
+
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
         # do it after EXPIRE_AFTER_COMMITS commits
@@ -534,11 +716,27 @@ class Recorder(threading.Thread):
             self._commits_without_expire = 0
             self.event_session.expire_all()
 
+    def _reset_bulk_writer(self):
+        """Drop the rows of the bulk writer after a rollback."""
+        if not self._bulk_writer:
+            return
+        try:
+            self._bulk_writer.reset(self.event_session)
+        except Exception as err:  # pylint: disable=broad-except
+            # The ids are loaded again when the session is reopened
+            _LOGGER.exception("Error while resetting the bulk writer: %s", err)
+            self._bulk_writer.clear()
+
     @callback
     def event_listener(self, event):
         """Listen for new events and put them in the process queue."""
         self.queue.put(event)
 
+    @property
+    def backlog(self):
+        """Return the number of events waiting to be processed."""
+        return self.queue.qsize()
+
     def block_till_done(self):
         """Block till all events processed.
 
@@ -561,6 +759,12 @@ class Recorder(threading.Thread):
 
         def setup_recorder_connection(dbapi_connection, connection_record):
             """Dbapi specific connection settings."""
+            if self.db_url.startswith(SQLITE_URL_PREFIX):
+                cursor = dbapi_connection.cursor()
+                # With WAL only checkpoints have to wait for the disk
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.close()
+
             if self._completed_database_setup:
                 return
 
@@ -571,6 +775,9 @@ class Recorder(threading.Thread):
                 old_isolation = dbapi_connection.isolation_level
                 dbapi_connection.isolation_level = None
                 cursor = dbapi_connection.cursor()
+                # Takes effect for new databases, existing databases
+                # are switched by the next repack
+                cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
                 cursor.execute("PRAGMA journal_mode=WAL")
                 cursor.close()
                 dbapi_connection.isolation_level = old_isolation
@@ -615,11 +822,52 @@ class Recorder(threading.Thread):
         Base.metadata.create_all(self.engine)
         self.get_session = scoped_session(sessionmaker(bind=self.engine))
 
+        if self.read_engine is not None:
+            self.read_engine.dispose()
+            self.read_engine = None
+
+        if (
+            self.read_pool_size
+            and self.db_url.startswith(SQLITE_URL_PREFIX)
+            and kwargs.get("poolclass") is not StaticPool
+        ):
+            self._setup_read_connection()
+        else:
+            self.get_read_session = self.get_session
+
+    def _setup_read_connection(self):
+        """Create the pool of read only connections used by history queries.
+
+        WAL readers do not block the writer, and the writer does not block
+        them, as long as they do not share its connection.
+        """
+
+        def setup_read_connection(dbapi_connection, connection_record):
+            """Tune a connection for read queries."""
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA query_only=ON")
+            cursor.execute(f"PRAGMA cache_size={SQLITE_READ_CACHE_SIZE}")
+            cursor.execute(f"PRAGMA mmap_size={SQLITE_READ_MMAP_SIZE}")
+            cursor.close()
+
+        self.read_engine = create_engine(
+            self.db_url,
+            poolclass=QueuePool,
+            pool_size=self.read_pool_size,
+            connect_args={"check_same_thread": False},
+        )
+        sqlalchemy_event.listen(self.read_engine, "connect", setup_read_connection)
+        self.get_read_session = scoped_session(sessionmaker(bind=self.read_engine))
+
     def _close_connection(self):
         """Close the connection."""
         self.engine.dispose()
         self.engine = None
         self.get_session = None
+        if self.read_engine is not None:
+            self.read_engine.dispose()
+            self.read_engine = None
+        self.get_read_session = None
 
     def _setup_run(self):
         """Log the start of the current run."""
@@ -0,0 +1,210 @@
+"""Bulk write path for the recorder."""
+import json
+import logging
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from sqlalchemy import func, text
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, split_entity_id
+from homeassistant.helpers.json import JSONEncoder
+
+from .models import (
+    TABLE_EVENTS,
+    TABLE_STATE_ATTRIBUTES,
+    TABLE_STATES,
+    Events,
+    StateAttributes,
+    States,
+)
+
+if TYPE_CHECKING:
+    from .state_attributes import StateAttributesManager
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BulkWriter:
+    """Accumulate event and state rows and write them with executemany.
+
+    The recorder thread is the only writer to the events and states
+    tables so primary keys are allocated here instead of being read back
+    from the database after every insert. This lets the old_state_id of
+    a state row be resolved from memory and lets a whole commit interval
+    be written with a single executemany per table.
+    """
+
+    def __init__(self, state_attributes: "StateAttributesManager") -> None:
+        """Initialize the bulk writer."""
+        self._state_attributes = state_attributes
+        self._event_rows: List[Dict[str, Any]] = []
+        self._state_rows: List[Dict[str, Any]] = []
+        self._attributes_rows: List[Dict[str, Any]] = []
+        self._old_state_ids: Dict[str, int] = {}
+        self._next_event_id: Optional[int] = None
+        self._next_state_id: Optional[int] = None
+        self._next_attributes_id: Optional[int] = None
+
+    @property
+    def pending(self) -> int:
+        """Return the number of rows waiting to be written."""
+        return (
+            len(self._event_rows) + len(self._state_rows) + len(self._attributes_rows)
+        )
+
+    def load_ids(self, session) -> None:
+        """Load the next free primary keys from the database."""
+        self._next_event_id = (
+            session.query(func.max(Events.event_id)).scalar() or 0
+        ) + 1
+        self._next_state_id = (
+            session.query(func.max(States.state_id)).scalar() or 0
+        ) + 1
+        self._next_attributes_id = (
+            session.query(func.max(StateAttributes.attributes_id)).scalar() or 0
+        ) + 1
+
+    def reset(self, session) -> None:
+        """Drop pending rows and resynchronize with the database.
+
+        Called after a failed commit where the pending rows were rolled back.
+        """
+        self.clear()
+        self._old_state_ids = {}
+        self.load_ids(session)
+
+    def add(self, event: Event, session) -> None:
+        """Convert an event into rows and queue them for writing.
+
+        Raises TypeError or ValueError if the event or state
+        is not JSON serializable.
+        """
+        if event.event_type == EVENT_STATE_CHANGED:
+            event_data = "{}"
+        else:
+            event_data = json.dumps(event.data, cls=JSONEncoder)
+
+        event_id = self._next_event_id
+        self._event_rows.append(
+            {
+                "event_id": event_id,
+                "event_type": event.event_type,
+                "event_data": event_data,
+                "origin": str(event.origin.value),
+                "time_fired": event.time_fired,
+                "time_fired_ts": event.time_fired.timestamp(),
+                "created": event.time_fired,
+                "context_id": event.context.id,
+                "context_user_id": event.context.user_id,
+                "context_parent_id": event.context.parent_id,
+            }
+        )
+        self._next_event_id += 1
+
+        if event.event_type != EVENT_STATE_CHANGED:
+            return
+
+        try:
+            self._add_state(event, event_id, session)
+        except (TypeError, ValueError):
+            # Keep the event row, the state row is skipped
+            # the same way the ORM path skips it.
+            _LOGGER.warning(
+                "State is not JSON serializable: %s", event.data.get("new_state")
+            )
+
+    def _add_state(self, event: Event, event_id: int, session) -> None:
+        """Queue a state row for a state_changed event."""
+        entity_id = event.data["entity_id"]
+        state = event.data.get("new_state")
+
+        if state is None:
+            self._state_attributes.forget_entity(entity_id)
+            row = {
+                "domain": split_entity_id(entity_id)[0],
+                "state": None,
+                "attributes": "{}",
+                "attributes_id": None,
+                "last_changed": event.time_fired,
+                "last_updated": event.time_fired,
+                "last_changed_ts": event.time_fired.timestamp(),
+                "last_updated_ts": event.time_fired.timestamp(),
+            }
+        else:
+            row = {
+                "domain": state.domain,
+                "state": state.state,
+                "attributes": None,
+                "attributes_id": self._attributes_id(entity_id, state, session),
+                "last_changed": state.last_changed,
+                "last_updated": state.last_updated,
+                "last_changed_ts": state.last_changed.timestamp(),
+                "last_updated_ts": state.last_updated.timestamp(),
+            }
+
+        state_id = self._next_state_id
+        row["state_id"] = state_id
+        row["entity_id"] = entity_id
+        row["event_id"] = event_id
+        row["created"] = event.time_fired
+        row["old_state_id"] = self._old_state_ids.pop(entity_id, None)
+        self._state_rows.append(row)
+        self._next_state_id += 1
+
+        if state is not None:
+            self._old_state_ids[entity_id] = state_id
+
+    def _attributes_id(self, entity_id: str, state, session) -> int:
+        """Return the id of the shared attributes row of a state."""
+        shared_attrs = self._state_attributes.shared_attrs(entity_id, state)
+        attributes_id = self._state_attributes.lookup(session, shared_attrs)
+        if attributes_id is not None:
+            return attributes_id
+
+        attributes_id = self._next_attributes_id
+        self._attributes_rows.append(
+            {
+                "attributes_id": attributes_id,
+                "hash": StateAttributes.hash_shared_attrs(shared_attrs),
+                "shared_attrs": shared_attrs,
+            }
+        )
+        self._next_attributes_id += 1
+        self._state_attributes.add_pending(shared_attrs, attributes_id)
+        return attributes_id
+
+    def write(self, session) -> None:
+        """Write all pending rows inside the session transaction."""
+        if self._attributes_rows:
+            session.execute(StateAttributes.__table__.insert(), self._attributes_rows)
+        if self._event_rows:
+            session.execute(Events.__table__.insert(), self._event_rows)
+        if self._state_rows:
+            session.execute(States.__table__.insert(), self._state_rows)
+
+        if self._event_rows and session.bind.dialect.name == "postgresql":
+            # Explicit primary keys do not advance postgresql sequences
+            _sync_sequence(session, TABLE_EVENTS, "event_id", self._next_event_id)
+            if self._state_rows:
+                _sync_sequence(session, TABLE_STATES, "state_id", self._next_state_id)
+            if self._attributes_rows:
+                _sync_sequence(
+                    session,
+                    TABLE_STATE_ATTRIBUTES,
+                    "attributes_id",
+                    self._next_attributes_id,
+                )
+
+    def clear(self) -> None:
+        """Forget the rows that have been committed."""
+        self._event_rows = []
+        self._state_rows = []
+        self._attributes_rows = []
+
+
+def _sync_sequence(session, table: str, column: str, next_id: int) -> None:
+    """Move a postgresql sequence past the allocated primary keys."""
+    session.execute(
+        text(f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'), :value)"),
+        {"value": next_id - 1},
+    )
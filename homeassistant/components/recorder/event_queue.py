@@ -0,0 +1,154 @@
+"""Bounded queue that feeds the recorder thread."""
+from collections import deque
+import logging
+import threading
+from typing import Any, Deque, Dict, List, Optional
+
+from homeassistant.const import ATTR_ENTITY_ID, EVENT_STATE_CHANGED
+from homeassistant.core import Event
+
+_LOGGER = logging.getLogger(__name__)
+
+OVERFLOW_DROP = "drop"
+OVERFLOW_COALESCE = "coalesce"
+OVERFLOW_POLICIES = [OVERFLOW_DROP, OVERFLOW_COALESCE]
+
+# Marks a slot whose event was dropped
+_REMOVED = object()
+
+# Rebuild the queue once this many dropped slots are waiting in it
+MAX_REMOVED_SLOTS = 1000
+
+
+class RecorderQueue:
+    """A FIFO queue with an optional bound on the number of queued events.
+
+    Control items (anything that is not an Event) are never counted
+    against the bound and are never dropped.
+
+    When the bound is reached the overflow policy decides what happens:
+
+    - drop: the oldest queued event that is not a state change is dropped
+    - coalesce: a state change for an entity that already has a state change
+      queued replaces the queued one, otherwise the drop policy applies
+
+    If nothing can be dropped the incoming event is dropped.
+    """
+
+    def __init__(self, maxsize: int = 0, overflow_policy: str = OVERFLOW_DROP):
+        """Initialize the queue."""
+        self.maxsize = maxsize
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self._size = 0
+        self._removed = 0
+        self._overflowing = False
+        # Each slot is a list of [item, entity_id]
+        self._slots: Deque[List[Any]] = deque()
+        self._droppable: Deque[List[Any]] = deque()
+        self._pending_states: Dict[str, List[Any]] = {}
+        self._not_empty = threading.Condition(threading.Lock())
+
+    def qsize(self) -> int:
+        """Return the number of queued events."""
+        return self._size
+
+    def put(self, item: Any) -> None:
+        """Put an item into the queue without blocking."""
+        with self._not_empty:
+            if not isinstance(item, Event):
+                self._slots.append([item, None])
+                self._not_empty.notify()
+                return
+
+            entity_id: Optional[str] = None
+            if item.event_type == EVENT_STATE_CHANGED:
+                entity_id = item.data.get(ATTR_ENTITY_ID)
+
+            if self.maxsize and self._size >= self.maxsize:
+                if not self._overflow(item, entity_id):
+                    return
+
+            slot = [item, entity_id]
+            self._slots.append(slot)
+            if entity_id is None:
+                self._droppable.append(slot)
+            else:
+                self._pending_states[entity_id] = slot
+            self._size += 1
+            if self._size > self.max_depth:
+                self.max_depth = self._size
+            self._not_empty.notify()
+
+    def get(self) -> Any:
+        """Remove and return the oldest item, blocking until one is available."""
+        with self._not_empty:
+            while True:
+                while not self._slots:
+                    self._not_empty.wait()
+
+                slot = self._slots.popleft()
+                item, entity_id = slot
+
+                if item is _REMOVED:
+                    self._removed -= 1
+                    continue
+
+                if not isinstance(item, Event):
+                    return item
+
+                self._size -= 1
+                if entity_id is None:
+                    # Droppable slots are consumed in the same order
+                    self._droppable.popleft()
+                elif self._pending_states.get(entity_id) is slot:
+                    del self._pending_states[entity_id]
+
+                if self._overflowing and not self._size:
+                    self._overflowing = False
+                    _LOGGER.info(
+                        "The recorder queue has drained after dropping %s events",
+                        self.dropped,
+                    )
+
+                return item
+
+    def _overflow(self, event: Event, entity_id: Optional[str]) -> bool:
+        """Make room for an event when the queue is full.
+
+        Returns True if the event should still be added to the queue.
+        Must be called with the lock held.
+        """
+        if not self._overflowing:
+            self._overflowing = True
+            _LOGGER.warning(
+                "The recorder queue reached the maximum size of %s, "
+                "applying the %s overflow policy",
+                self.maxsize,
+                self.overflow_policy,
+            )
+
+        if self.overflow_policy == OVERFLOW_COALESCE and entity_id is not None:
+            pending = self._pending_states.get(entity_id)
+            if pending is not None:
+                pending[0] = event
+                self.coalesced += 1
+                return False
+
+        self.dropped += 1
+
+        if not self._droppable:
+            return False
+
+        oldest = self._droppable.popleft()
+        oldest[0] = _REMOVED
+        self._size -= 1
+        self._removed += 1
+
+        if self._removed >= MAX_REMOVED_SLOTS:
+            self._slots = deque(slot for slot in self._slots if slot[0] is not _REMOVED)
+            self._removed = 0
+
+        return True
@@ -206,6 +206,38 @@ def _add_columns(engine, table_name, columns_def):
             )
 
 
+def _backfill_timestamps(engine, table_name, columns):
+    """Fill the seconds since the epoch columns of the existing rows."""
+    _LOGGER.warning(
+        "Converting the timestamps of table %s. Note: this can take several "
+        "minutes on large databases and slow computers. Please "
+        "be patient!",
+        table_name,
+    )
+
+    if engine.dialect.name == "sqlite":
+        # Datetimes are stored as text without a timezone,
+        # strftime drops the fraction of the seconds
+        to_epoch = (
+            "CAST(strftime('%s', {0}) AS INTEGER) + CAST(substr({0}, 20) AS REAL)"
+        )
+    elif engine.dialect.name == "postgresql":
+        to_epoch = "EXTRACT(EPOCH FROM {0})"
+    else:
+        # UNIX_TIMESTAMP would use the timezone of the session
+        to_epoch = "TIMESTAMPDIFF(MICROSECOND, '1970-01-01 00:00:00', {0}) / 1000000.0"
+
+    assignments = ", ".join(
+        f"{column}_ts = {to_epoch.format(column)}" for column in columns
+    )
+    engine.execute(
+        text(
+            f"UPDATE {table_name} SET {assignments} "
+            f"WHERE {columns[0]}_ts IS NULL AND {columns[0]} IS NOT NULL"
+        )
+    )
+
+
 def _update_states_table_with_foreign_key_options(engine):
     """Add the options to foreign key constraints."""
     inspector = reflection.Inspector.from_engine(engine)
@@ -313,6 +345,27 @@ def _apply_update(engine, new_version, old_version):
         _drop_index(engine, "events", "ix_events_event_type")
     elif new_version == 10:
         _update_states_table_with_foreign_key_options(engine)
+    elif new_version == 11:
+        # The state_attributes table is created by create_all,
+        # existing rows keep their attributes inline
+        _add_columns(engine, "states", ["attributes_id INTEGER"])
+        _create_index(engine, "states", "ix_states_attributes_id")
+    elif new_version == 12:
+        # The statistics tables are created by create_all
+        pass
+    elif new_version == 13:
+        _add_columns(engine, "events", ["time_fired_ts DOUBLE PRECISION"])
+        _add_columns(
+            engine,
+            "states",
+            ["last_changed_ts DOUBLE PRECISION", "last_updated_ts DOUBLE PRECISION"],
+        )
+        _backfill_timestamps(engine, "events", ["time_fired"])
+        _backfill_timestamps(engine, "states", ["last_changed", "last_updated"])
+        _create_index(engine, "events", "ix_events_time_fired_ts")
+        _create_index(engine, "events", "ix_events_event_type_time_fired_ts")
+        _create_index(engine, "states", "ix_states_last_updated_ts")
+        _create_index(engine, "states", "ix_states_entity_id_last_updated_ts")
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
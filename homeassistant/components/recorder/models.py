@@ -1,11 +1,15 @@
 """Models for SQLAlchemy."""
+from datetime import timedelta
 import json
 import logging
+import zlib
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
@@ -13,7 +17,8 @@ from sqlalchemy import (
     Text,
     distinct,
 )
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.declarative import declarative_base, declared_attr
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm.session import Session
 
@@ -25,7 +30,7 @@ import homeassistant.util.dt as dt_util
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 10
+SCHEMA_VERSION = 13
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,8 +38,14 @@ DB_TIMEZONE = "+00:00"
 
 TABLE_EVENTS = "events"
 TABLE_STATES = "states"
+TABLE_STATE_ATTRIBUTES = "state_attributes"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
+TABLE_STATISTICS = "statistics"
+TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
+
+# Seconds since the epoch, FLOAT is single precision on MySQL
+TIMESTAMP_TYPE = Float().with_variant(mysql.DOUBLE(asdecimal=False), "mysql")
 
 ALL_TABLES = [TABLE_STATES, TABLE_EVENTS, TABLE_RECORDER_RUNS, TABLE_SCHEMA_CHANGES]
 
@@ -52,6 +63,7 @@ class Events(Base):  # type: ignore
     event_data = Column(Text)
     origin = Column(String(32))
     time_fired = Column(DateTime(timezone=True), index=True)
+    time_fired_ts = Column(TIMESTAMP_TYPE, index=True)
     created = Column(DateTime(timezone=True), default=dt_util.utcnow)
     context_id = Column(String(36), index=True)
     context_user_id = Column(String(36), index=True)
@@ -61,6 +73,7 @@ class Events(Base):  # type: ignore
         # Used for fetching events at a specific time
         # see logbook
         Index("ix_events_event_type_time_fired", "event_type", "time_fired"),
+        Index("ix_events_event_type_time_fired_ts", "event_type", "time_fired_ts"),
     )
 
     @staticmethod
@@ -71,6 +84,7 @@ class Events(Base):  # type: ignore
             event_data=event_data or json.dumps(event.data, cls=JSONEncoder),
             origin=str(event.origin.value),
             time_fired=event.time_fired,
+            time_fired_ts=event.time_fired.timestamp(),
             context_id=event.context.id,
             context_user_id=event.context.user_id,
             context_parent_id=event.context.parent_id,
@@ -113,24 +127,36 @@ class States(Base):  # type: ignore
     event_id = Column(
         Integer, ForeignKey("events.event_id", ondelete="CASCADE"), index=True
     )
+    attributes_id = Column(
+        Integer, ForeignKey("state_attributes.attributes_id"), index=True
+    )
     last_changed = Column(DateTime(timezone=True), default=dt_util.utcnow)
     last_updated = Column(DateTime(timezone=True), default=dt_util.utcnow, index=True)
+    # Seconds since the epoch, history and logbook query these
+    last_changed_ts = Column(TIMESTAMP_TYPE)
+    last_updated_ts = Column(TIMESTAMP_TYPE, index=True)
     created = Column(DateTime(timezone=True), default=dt_util.utcnow)
     old_state_id = Column(
         Integer, ForeignKey("states.state_id", ondelete="SET NULL"), index=True
     )
     event = relationship("Events", uselist=False)
     old_state = relationship("States", remote_side=[state_id])
+    state_attributes = relationship("StateAttributes", lazy="joined")
 
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
         # (get_states in history.py)
         Index("ix_states_entity_id_last_updated", "entity_id", "last_updated"),
+        Index("ix_states_entity_id_last_updated_ts", "entity_id", "last_updated_ts"),
     )
 
     @staticmethod
-    def from_event(event):
-        """Create object from a state_changed event."""
+    def from_event(event, store_attributes=True):
+        """Create object from a state_changed event.
+
+        Set store_attributes to False when the attributes of the new state
+        are stored in the state_attributes table by the caller.
+        """
         entity_id = event.data["entity_id"]
         state = event.data.get("new_state")
 
@@ -143,22 +169,31 @@ class States(Base):  # type: ignore
             dbstate.attributes = "{}"
             dbstate.last_changed = event.time_fired
             dbstate.last_updated = event.time_fired
+            dbstate.last_changed_ts = (
+                dbstate.last_updated_ts
+            ) = event.time_fired.timestamp()
         else:
             dbstate.domain = state.domain
             dbstate.state = state.state
-            dbstate.attributes = json.dumps(dict(state.attributes), cls=JSONEncoder)
+            if store_attributes:
+                dbstate.attributes = json.dumps(dict(state.attributes), cls=JSONEncoder)
             dbstate.last_changed = state.last_changed
             dbstate.last_updated = state.last_updated
+            dbstate.last_changed_ts = state.last_changed.timestamp()
+            dbstate.last_updated_ts = state.last_updated.timestamp()
 
         return dbstate
 
     def to_native(self, validate_entity_id=True):
         """Convert to an HA state object."""
+        attributes = self.attributes
+        if self.state_attributes is not None:
+            attributes = self.state_attributes.shared_attrs
         try:
             return State(
                 self.entity_id,
                 self.state,
-                json.loads(self.attributes),
+                json.loads(attributes),
                 process_timestamp(self.last_changed),
                 process_timestamp(self.last_updated),
                 # Join the events table on event_id to get the context instead
@@ -172,6 +207,56 @@ class States(Base):  # type: ignore
             return None
 
 
+class StateAttributes(Base):  # type: ignore
+    """State attributes shared between state rows."""
+
+    __table_args__ = {
+        "mysql_default_charset": "utf8mb4",
+        "mysql_collate": "utf8mb4_unicode_ci",
+    }
+    __tablename__ = TABLE_STATE_ATTRIBUTES
+    attributes_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_attrs = Column(Text)
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs):
+        """Return the hash used to look up serialized attributes."""
+        return zlib.crc32(shared_attrs.encode("utf-8"))
+
+
+class StatisticsBase:
+    """Downsampled values of a numeric sensor for one period."""
+
+    id = Column(Integer, primary_key=True)
+    created = Column(DateTime(timezone=True), default=dt_util.utcnow)
+    entity_id = Column(String(255))
+    start = Column(DateTime(timezone=True))
+    mean = Column(Float)
+    min = Column(Float)
+    max = Column(Float)
+    last = Column(Float)
+
+    @declared_attr
+    def __table_args__(cls):  # pylint: disable=no-self-argument
+        """Index the rows of an entity by start time."""
+        return (Index(f"ix_{cls.__tablename__}_entity_id_start", "entity_id", "start"),)
+
+
+class Statistics(StatisticsBase, Base):  # type: ignore
+    """Hourly statistics."""
+
+    __tablename__ = TABLE_STATISTICS
+    period = timedelta(hours=1)
+
+
+class StatisticsShortTerm(StatisticsBase, Base):  # type: ignore
+    """Five minute statistics."""
+
+    __tablename__ = TABLE_STATISTICS_SHORT_TERM
+    period = timedelta(minutes=5)
+
+
 class RecorderRuns(Base):  # type: ignore
     """Representation of recorder run."""
 
@@ -229,6 +314,13 @@ def process_timestamp(ts):
     return dt_util.as_utc(ts)
 
 
+def timestamp_to_utc_isoformat(ts):
+    """Format seconds since the epoch as UTC isotime."""
+    if ts is None:
+        return None
+    return dt_util.utc_from_timestamp(ts).isoformat()
+
+
 def process_timestamp_to_utc_isoformat(ts):
     """Process a timestamp into UTC isotime."""
     if ts is None:
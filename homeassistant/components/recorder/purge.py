@@ -1,26 +1,68 @@
 """Purge old data helper."""
-from datetime import timedelta
+from datetime import datetime, timedelta
 import logging
 import time
+from typing import Any, Dict, Tuple
 
+import attr
+from sqlalchemy import distinct
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, RecorderRuns, States
+from .models import Events, RecorderRuns, StateAttributes, States, StatisticsShortTerm
 from .util import execute, session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Maximum number of ids in a single IN clause
+MAX_IDS_PER_QUERY = 500
+
+# Maximum number of rows deleted by a single statement and transaction
+MAX_ROWS_TO_PURGE = 1000
+
+# Time after which a purge task hands the database back to the recorder
+PURGE_TIME_BUDGET = 0.5
+
+# Value of PRAGMA auto_vacuum for incremental vacuum
+SQLITE_AUTO_VACUUM_INCREMENTAL = 2
+
+
+@attr.s(slots=True)
+class PurgeProgress:
+    """Progress of a purge that runs over several purge tasks."""
+
+    started = attr.ib(type=datetime)
+    deleted_states = attr.ib(type=int, default=0)
+    deleted_events = attr.ib(type=int, default=0)
+    batches = attr.ib(type=int, default=0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dictionary representation of the progress."""
+        return {
+            "started": self.started.isoformat(),
+            "deleted_states": self.deleted_states,
+            "deleted_events": self.deleted_events,
+            "batches": self.batches,
+        }
+
 
 def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
     """Purge events and states older than purge_days ago.
 
-    Cleans up an timeframe of an hour, based on the oldest record.
+    Cleans up an timeframe of an hour, based on the oldest record. The
+    rows are deleted in transactions of at most MAX_ROWS_TO_PURGE rows and
+    the purge stops early once PURGE_TIME_BUDGET is used up, so the
+    recorder can commit its events before the purge task is run again.
     """
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
     _LOGGER.debug("Purging states and events before target %s", purge_before)
 
+    progress = instance.purge_progress
+    if progress is None:
+        progress = instance.purge_progress = PurgeProgress(started=dt_util.utcnow())
+    deadline = time.monotonic() + PURGE_TIME_BUDGET
+
     try:
         with session_scope(session=instance.get_session()) as session:
             # Purge a max of 1 hour, based on the oldest states or events record
@@ -44,25 +86,39 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
 
             _LOGGER.debug("Purging states and events before %s", batch_purge_before)
 
-            deleted_rows = (
-                session.query(States)
-                .filter(States.last_updated < batch_purge_before)
-                .delete(synchronize_session=False)
+            deleted_rows, completed = _purge_states(
+                instance, session, batch_purge_before, deadline
             )
+            progress.deleted_states += deleted_rows
             _LOGGER.debug("Deleted %s states", deleted_rows)
+            if not completed:
+                return _purge_paused(progress)
 
-            deleted_rows = (
-                session.query(Events)
-                .filter(Events.time_fired < batch_purge_before)
-                .delete(synchronize_session=False)
+            deleted_rows, completed = _purge_rows(
+                session,
+                Events.event_id,
+                Events.time_fired < batch_purge_before,
+                deadline,
             )
+            progress.deleted_events += deleted_rows
             _LOGGER.debug("Deleted %s events", deleted_rows)
+            if not completed:
+                return _purge_paused(progress)
 
             # If states or events purging isn't processing the purge_before yet,
             # return false, as we are not done yet.
             if batch_purge_before != purge_before:
                 _LOGGER.debug("Purging hasn't fully completed yet")
-                return False
+                return _purge_paused(progress)
+
+            # Hourly statistics are kept, they replace the purged history
+            deleted_rows = (
+                session.query(StatisticsShortTerm)
+                .filter(StatisticsShortTerm.start < purge_before)
+                .delete(synchronize_session=False)
+            )
+            if deleted_rows:
+                _LOGGER.debug("Deleted %s short term statistics", deleted_rows)
 
             # Recorder runs is small, no need to batch run it
             deleted_rows = (
@@ -73,15 +129,18 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             )
             _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
 
+        instance.purge_progress = None
+        progress.batches += 1
+        if progress.deleted_states or progress.deleted_events:
+            _LOGGER.info(
+                "Purged %s states and %s events in %s batches",
+                progress.deleted_states,
+                progress.deleted_events,
+                progress.batches,
+            )
+
         if repack:
-            # Execute sqlite or postgresql vacuum command to free up space on disk
-            if instance.engine.driver in ("pysqlite", "postgresql"):
-                _LOGGER.debug("Vacuuming SQL DB to free space")
-                instance.engine.execute("VACUUM")
-            # Optimize mysql / mariadb tables to free up space on disk
-            elif instance.engine.driver in ("mysqldb", "pymysql"):
-                _LOGGER.debug("Optimizing SQL DB to free space")
-                instance.engine.execute("OPTIMIZE TABLE states, events, recorder_runs")
+            _repack(instance)
 
     except OperationalError as err:
         # Retry when one of the following MySQL errors occurred:
@@ -97,7 +156,128 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             time.sleep(instance.db_retry_wait)
             return False
 
+        instance.purge_progress = None
         _LOGGER.warning("Error purging history: %s", err)
     except SQLAlchemyError as err:
+        instance.purge_progress = None
         _LOGGER.warning("Error purging history: %s", err)
     return True
+
+
+def _purge_paused(progress: PurgeProgress) -> bool:
+    """Record a purge task that has to be run again to finish the purge."""
+    progress.batches += 1
+    return False
+
+
+def _purge_states(instance, session, purge_before, deadline) -> Tuple[int, bool]:
+    """Delete the old states and the attributes no state uses anymore."""
+    attributes_ids = {
+        attributes_id
+        for (attributes_id,) in session.query(distinct(States.attributes_id))
+        .filter(States.last_updated < purge_before)
+        .filter(States.attributes_id.isnot(None))
+    }
+
+    deleted_rows, completed = _purge_rows(
+        session, States.state_id, States.last_updated < purge_before, deadline
+    )
+
+    _purge_unused_attributes(instance, session, list(attributes_ids))
+    session.commit()
+
+    return deleted_rows, completed
+
+
+def _purge_rows(session, id_column, condition, deadline) -> Tuple[int, bool]:
+    """Delete the rows matching condition in small committed batches.
+
+    Returns the number of deleted rows and whether all rows were deleted
+    before the deadline.
+    """
+    deleted_rows = 0
+    while True:
+        ids = [
+            row_id
+            for (row_id,) in session.query(id_column)
+            .filter(condition)
+            .order_by(id_column)
+            .limit(MAX_ROWS_TO_PURGE)
+        ]
+        if not ids:
+            return deleted_rows, True
+
+        for idx in range(0, len(ids), MAX_IDS_PER_QUERY):
+            deleted_rows += (
+                session.query(id_column.class_)
+                .filter(id_column.in_(ids[idx : idx + MAX_IDS_PER_QUERY]))
+                .delete(synchronize_session=False)
+            )
+        session.commit()
+
+        if len(ids) < MAX_ROWS_TO_PURGE:
+            return deleted_rows, True
+        if time.monotonic() > deadline:
+            return deleted_rows, False
+
+
+def _repack(instance) -> None:
+    """Free up the space of the purged rows on disk."""
+    # Execute sqlite or postgresql vacuum command to free up space on disk
+    if instance.engine.driver == "pysqlite":
+        _LOGGER.debug("Vacuuming SQL DB to free space")
+        # The pragmas only apply to the connection they are executed on
+        with instance.engine.connect() as conn:
+            auto_vacuum = conn.execute("PRAGMA auto_vacuum").scalar()
+            if auto_vacuum == SQLITE_AUTO_VACUUM_INCREMENTAL:
+                # Only truncates the free pages, the database stays available.
+                # A page is freed for each step of the statement, the result
+                # has no columns so it is read with the DBAPI cursor.
+                cursor = conn.connection.cursor()
+                try:
+                    cursor.execute("PRAGMA incremental_vacuum")
+                    cursor.fetchall()
+                finally:
+                    cursor.close()
+            else:
+                # A full vacuum is needed once to switch to incremental vacuum
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+    elif instance.engine.driver == "postgresql":
+        _LOGGER.debug("Vacuuming SQL DB to free space")
+        instance.engine.execute("VACUUM")
+    # Optimize mysql / mariadb tables to free up space on disk
+    elif instance.engine.driver in ("mysqldb", "pymysql"):
+        _LOGGER.debug("Optimizing SQL DB to free space")
+        instance.engine.execute(
+            "OPTIMIZE TABLE states, state_attributes, events, "
+            "statistics_short_term, recorder_runs"
+        )
+
+
+def _purge_unused_attributes(instance, session, attributes_ids):
+    """Delete the shared attributes that are no longer used by any state."""
+    deleted_rows = 0
+    for idx in range(0, len(attributes_ids), MAX_IDS_PER_QUERY):
+        batch = attributes_ids[idx : idx + MAX_IDS_PER_QUERY]
+        still_used = {
+            attributes_id
+            for (attributes_id,) in session.query(
+                distinct(States.attributes_id)
+            ).filter(States.attributes_id.in_(batch))
+        }
+        unused = [
+            attributes_id for attributes_id in batch if attributes_id not in still_used
+        ]
+        if not unused:
+            continue
+        deleted_rows += (
+            session.query(StateAttributes)
+            .filter(StateAttributes.attributes_id.in_(unused))
+            .delete(synchronize_session=False)
+        )
+
+    if deleted_rows:
+        _LOGGER.debug("Deleted %s state attributes", deleted_rows)
+        # The recorder must not reference the deleted rows
+        instance.state_attributes.clear()
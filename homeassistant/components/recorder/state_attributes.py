@@ -0,0 +1,102 @@
+"""Deduplicated storage of state attributes for the recorder."""
+import json
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from homeassistant.core import State
+from homeassistant.helpers.json import JSONEncoder
+from homeassistant.util.lru import LRU
+
+from .models import StateAttributes
+
+STATE_ATTRIBUTES_CACHE_SIZE = 2048
+
+
+class StateAttributesManager:
+    """Find the shared attributes row for states written by the recorder.
+
+    The serialized attributes of the last recorded state of each entity
+    are kept so that attributes which did not change are not serialized
+    again, and an LRU maps recently written serialized attributes to the
+    id of their row so they are not looked up or written again.
+
+    Only used from the recorder thread.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the manager."""
+        self._ids: LRU[str, int] = LRU(STATE_ATTRIBUTES_CACHE_SIZE)
+        self._pending: Dict[str, Any] = {}
+        self._entity_attributes: Dict[str, Tuple[Mapping, str]] = {}
+
+    def shared_attrs(self, entity_id: str, state: State) -> str:
+        """Return the serialized attributes of a state.
+
+        Raises TypeError or ValueError if the attributes are not
+        JSON serializable.
+        """
+        attributes = state.attributes
+        last = self._entity_attributes.get(entity_id)
+        if last is not None and (last[0] is attributes or last[0] == attributes):
+            return last[1]
+
+        shared_attrs = json.dumps(dict(attributes), cls=JSONEncoder)
+        self._entity_attributes[entity_id] = (attributes, shared_attrs)
+        return shared_attrs
+
+    def forget_entity(self, entity_id: str) -> None:
+        """Forget the attributes of a removed entity."""
+        self._entity_attributes.pop(entity_id, None)
+
+    def lookup(self, session, shared_attrs: str) -> Optional[Any]:
+        """Return the id or pending row of serialized attributes.
+
+        Returns None if the attributes have not been written yet.
+        """
+        pending = self._pending.get(shared_attrs)
+        if pending is not None:
+            return pending
+
+        attributes_id = self._ids.get(shared_attrs)
+        if attributes_id is not None:
+            return attributes_id
+
+        with session.no_autoflush:
+            row = (
+                session.query(StateAttributes.attributes_id)
+                .filter(
+                    StateAttributes.hash
+                    == StateAttributes.hash_shared_attrs(shared_attrs)
+                )
+                .filter(StateAttributes.shared_attrs == shared_attrs)
+                .first()
+            )
+
+        if row is None:
+            return None
+
+        self._ids[shared_attrs] = row[0]
+        return row[0]
+
+    def add_pending(self, shared_attrs: str, row: Any) -> None:
+        """Remember a row that will be written by the next commit.
+
+        The row is either a StateAttributes object or an allocated id.
+        """
+        self._pending[shared_attrs] = row
+
+    def commit(self) -> None:
+        """Move the rows written by a successful commit into the LRU."""
+        for shared_attrs, row in self._pending.items():
+            if isinstance(row, StateAttributes):
+                row = row.attributes_id
+            self._ids[shared_attrs] = row
+        self._pending = {}
+
+    def reset(self) -> None:
+        """Forget the rows of a commit that was rolled back."""
+        self._pending = {}
+
+    def clear(self) -> None:
+        """Forget all ids, rows might have been purged."""
+        self._pending = {}
+        self._ids.clear()
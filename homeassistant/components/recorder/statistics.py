@@ -0,0 +1,158 @@
+"""Incrementally compiled statistics of numeric sensors."""
+from datetime import datetime, timedelta
+import math
+from typing import Any, Dict, List, Optional
+
+from homeassistant.core import State
+import homeassistant.util.dt as dt_util
+
+STATISTICS_DOMAINS = {"sensor"}
+
+
+def numeric_state(state: Optional[State]) -> Optional[float]:
+    """Return the numeric value of a state that has statistics."""
+    if state is None or state.domain not in STATISTICS_DOMAINS:
+        return None
+    try:
+        value = float(state.state)
+    except ValueError:
+        return None
+    if not math.isfinite(value):
+        return None
+    return value
+
+
+class _Period:
+    """Accumulate the values of an entity during one period."""
+
+    __slots__ = (
+        "start",
+        "last_time",
+        "last_value",
+        "last_numeric",
+        "integral",
+        "covered",
+        "min",
+        "max",
+    )
+
+    def __init__(self, start: datetime, value: Optional[float] = None) -> None:
+        """Start a period, optionally with the value carried over."""
+        self.start = start
+        self.last_time = start
+        self.last_value = value
+        self.last_numeric = value
+        self.integral = 0.0
+        self.covered = 0.0
+        self.min = value
+        self.max = value
+
+    def add(self, time: datetime, value: Optional[float]) -> None:
+        """Add the value the entity has from time onwards."""
+        self._close_segment(time)
+        if value is not None:
+            self.last_numeric = value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+        self.last_value = value
+
+    def finish(self, end: datetime) -> Optional[Dict[str, Any]]:
+        """Return the statistics of the period or None if there was no value."""
+        self._close_segment(end)
+        if not self.covered:
+            return None
+        return {
+            "start": self.start,
+            "mean": self.integral / self.covered,
+            "min": self.min,
+            "max": self.max,
+            "last": self.last_numeric,
+        }
+
+    def _close_segment(self, time: datetime) -> None:
+        """Account for the time the last value was held."""
+        duration = (time - self.last_time).total_seconds()
+        if self.last_value is not None and duration > 0:
+            self.integral += self.last_value * duration
+            self.covered += duration
+        self.last_time = max(time, self.last_time)
+
+
+class StatisticsCompiler:
+    """Compile time weighted statistics of numeric sensors for a table.
+
+    State changes are folded into the current period of the entity as they
+    are recorded. Once a period has ended its row is returned by compile
+    and the value at the end of the period is carried into the next one,
+    so entities that did not change still get a row for every period.
+
+    Only used from the recorder thread.
+    """
+
+    def __init__(self, table: Any) -> None:
+        """Initialize the compiler."""
+        self.table = table
+        self.period: timedelta = table.period
+        self._period_seconds = self.period.total_seconds()
+        self._periods: Dict[str, _Period] = {}
+        self._rows: List[Dict[str, Any]] = []
+        self._next_end: Optional[datetime] = None
+
+    def _period_start(self, time: datetime) -> datetime:
+        """Return the start of the period that contains time."""
+        timestamp = time.timestamp()
+        return dt_util.utc_from_timestamp(timestamp - timestamp % self._period_seconds)
+
+    def state_changed(
+        self, entity_id: str, state: Optional[State], time: datetime
+    ) -> None:
+        """Fold a state change into the current period of the entity."""
+        value = numeric_state(state)
+        period = self._periods.get(entity_id)
+        if period is not None:
+            period = self._roll(entity_id, period, time)
+
+        if period is None:
+            if value is None:
+                return
+            period = self._periods[entity_id] = _Period(self._period_start(time))
+
+        period.add(time, value)
+
+    def compile(self, now: datetime) -> List[Dict[str, Any]]:
+        """Return the rows of all periods that ended before now."""
+        if self._next_end is not None and now < self._next_end:
+            return []
+
+        for entity_id, period in list(self._periods.items()):
+            self._roll(entity_id, period, now)
+        self._next_end = self._period_start(now) + self.period
+
+        rows = self._rows
+        self._rows = []
+        return rows
+
+    def _roll(
+        self, entity_id: str, period: _Period, time: datetime
+    ) -> Optional[_Period]:
+        """Finish the periods of an entity that ended before time.
+
+        Returns the current period or None if the entity has no value
+        anymore and was removed.
+        """
+        while time >= period.start + self.period:
+            end = period.start + self.period
+            row = period.finish(end)
+            if row is not None:
+                row["entity_id"] = entity_id
+                self._rows.append(row)
+
+            if period.last_value is None:
+                del self._periods[entity_id]
+                return None
+
+            period = self._periods[entity_id] = _Period(end, period.last_value)
+
+        return period
@@ -25,10 +25,18 @@ MAX_RESTART_TIME = timedelta(minutes=10)
 
 
 @contextmanager
-def session_scope(*, hass=None, session=None):
-    """Provide a transactional scope around a series of operations."""
+def session_scope(*, hass=None, session=None, read_only=False):
+    """Provide a transactional scope around a series of operations.
+
+    Pass read_only to use the read connections of the recorder when the
+    session only runs queries.
+    """
     if session is None and hass is not None:
-        session = hass.data[DATA_INSTANCE].get_session()
+        instance = hass.data[DATA_INSTANCE]
+        if read_only:
+            session = instance.get_read_session()
+        else:
+            session = instance.get_session()
 
     if session is None:
         raise RuntimeError("Session required")
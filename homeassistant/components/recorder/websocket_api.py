@@ -0,0 +1,38 @@
+"""Websocket API for the recorder."""
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_INSTANCE
+
+
+@callback
+def async_setup(hass: HomeAssistant):
+    """Set up the websocket API."""
+    websocket_api.async_register_command(hass, ws_info)
+
+
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "recorder/info"})
+@callback
+def ws_info(hass, connection, msg):
+    """Return queue and commit statistics of the recorder."""
+    instance = hass.data[DATA_INSTANCE]
+    queue = instance.queue
+    purge_progress = instance.purge_progress
+
+    connection.send_result(
+        msg["id"],
+        {
+            "backlog": queue.qsize(),
+            "max_backlog": queue.max_depth,
+            "max_queue_size": queue.maxsize,
+            "overflow_policy": queue.overflow_policy,
+            "dropped_events": queue.dropped,
+            "coalesced_events": queue.coalesced,
+            "commit_latency": instance.commit_latency,
+            "max_commit_latency": instance.max_commit_latency,
+            "purge_progress": purge_progress and purge_progress.as_dict(),
+        },
+    )
@@ -28,6 +28,7 @@ from . import const, decorators, messages
 def async_register_commands(hass, async_reg):
     """Register commands."""
     async_reg(hass, handle_subscribe_events)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_unsubscribe_events)
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_get_states)
@@ -40,6 +41,7 @@ def async_register_commands(hass, async_reg):
     async_reg(hass, handle_entity_source)
     async_reg(hass, handle_subscribe_trigger)
     async_reg(hass, handle_test_condition)
+    async_reg(hass, handle_supported_features)
 
 
 def pong_message(iden):
@@ -65,34 +67,86 @@ def handle_subscribe_events(hass, connection, msg):
     if event_type not in SUBSCRIBE_WHITELIST and not connection.user.is_admin:
         raise Unauthorized
 
+    @callback
+    def forward_events(event):
+        """Forward events to websocket."""
+        connection.send_message(messages.cached_event_message(msg["id"], event))
+
     if event_type == EVENT_STATE_CHANGED:
 
         @callback
-        def forward_events(event):
-            """Forward state changed events to websocket."""
-            if not connection.user.permissions.check_entity(
+        def event_filter(event):
+            """Filter state changed events the user may not read."""
+            return connection.user.permissions.check_entity(
                 event.data["entity_id"], POLICY_READ
-            ):
-                return
+            )
 
-            connection.send_message(messages.cached_event_message(msg["id"], event))
+        connection.subscriptions[msg["id"]] = hass.states.async_listen(
+            forward_events, event_filter=event_filter
+        )
 
     else:
 
         @callback
-        def forward_events(event):
-            """Forward events to websocket."""
-            if event.event_type == EVENT_TIME_CHANGED:
-                return
+        def event_filter(event):
+            """Filter time changed events."""
+            return event.event_type != EVENT_TIME_CHANGED
 
-            connection.send_message(messages.cached_event_message(msg["id"], event))
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+            event_type, forward_events, event_filter
+        )
 
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
-        event_type, forward_events
-    )
+    connection.send_message(messages.result_message(msg["id"]))
+
+
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+    }
+)
+def handle_subscribe_entities(hass, connection, msg):
+    """Handle subscribe entities command.
+
+    Sends the states of the entities once and then only what changed.
+    """
+    entity_ids = msg.get("entity_ids")
+    entity_perm = connection.user.permissions.check_entity
+    read_all = connection.user.permissions.access_all_entities(POLICY_READ)
+
+    @callback
+    def event_filter(event):
+        """Filter state changed events the user may not read."""
+        return entity_perm(event.data["entity_id"], POLICY_READ)
 
+    @callback
+    def forward_entity_changes(event):
+        """Forward the changes of an entity to websocket."""
+        connection.send_message(messages.cached_state_diff_message(msg["id"], event))
+
+    connection.subscriptions[msg["id"]] = hass.states.async_listen(
+        forward_entity_changes,
+        entity_ids=entity_ids,
+        event_filter=None if read_all else event_filter,
+    )
     connection.send_message(messages.result_message(msg["id"]))
 
+    if entity_ids is None:
+        states = hass.states.async_all()
+    else:
+        states = [
+            state
+            for state in (hass.states.get(entity_id) for entity_id in entity_ids)
+            if state is not None
+        ]
+    if not read_all:
+        states = [
+            state for state in states if entity_perm(state.entity_id, POLICY_READ)
+        ]
+
+    connection.send_message(messages.entities_message(msg["id"], states))
+
 
 @callback
 @decorators.websocket_command(
@@ -181,7 +235,7 @@ def handle_get_states(hass, connection, msg):
             if entity_perm(state.entity_id, "read")
         ]
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    connection.send_message(messages.states_result_json(msg["id"], states))
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -409,3 +463,16 @@ async def handle_test_condition(hass, connection, msg):
     connection.send_result(
         msg["id"], {"result": check_condition(hass, msg.get("variables"))}
     )
+
+
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "supported_features",
+        vol.Required("features"): {str: int},
+    }
+)
+def handle_supported_features(hass, connection, msg):
+    """Handle setting the features the client supports."""
+    connection.supported_features = msg["features"]
+    connection.send_result(msg["id"])
@@ -1,12 +1,10 @@
 """Websocket constants."""
 import asyncio
 from concurrent import futures
-from functools import partial
-import json
 from typing import TYPE_CHECKING, Callable
 
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.util.json import json_dumps
 
 if TYPE_CHECKING:
     from .connection import ActiveConnection  # noqa
@@ -33,6 +31,21 @@ ERR_TEMPLATE_ERROR = "template_error"
 
 TYPE_RESULT = "result"
 
+# Keys of the messages of the subscribe_entities command
+ENTITY_EVENT_ADD = "a"
+ENTITY_EVENT_CHANGE = "c"
+ENTITY_EVENT_REMOVE = "r"
+ENTITY_DIFF_ADDITIONS = "+"
+ENTITY_DIFF_REMOVALS = "-"
+COMPRESSED_STATE_STATE = "s"
+COMPRESSED_STATE_ATTRIBUTES = "a"
+COMPRESSED_STATE_CONTEXT = "c"
+COMPRESSED_STATE_LAST_CHANGED = "lc"
+COMPRESSED_STATE_LAST_UPDATED = "lu"
+
+# Features a client can enable with the supported_features command
+FEATURE_COALESCE_MESSAGES = "coalesce_messages"
+
 # Define the possible errors that occur when connections are cancelled.
 # Originally, this was just asyncio.CancelledError, but issue #9546 showed
 # that futures.CancelledErrors can also occur in some situations.
@@ -45,4 +58,4 @@ SIGNAL_WEBSOCKET_DISCONNECTED = "websocket_disconnected"
 # Data used to store the current connection list
 DATA_CONNECTIONS = f"{DOMAIN}.connections"
 
-JSON_DUMP = partial(json.dumps, cls=JSONEncoder, allow_nan=False)
+JSON_DUMP = json_dumps
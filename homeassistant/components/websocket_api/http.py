@@ -13,9 +13,11 @@ from homeassistant.core import callback
 from homeassistant.helpers.event import async_call_later
 
 from .auth import AuthPhase, auth_required_message
+from .connection import ActiveConnection
 from .const import (
     CANCELLATION_ERRORS,
     DATA_CONNECTIONS,
+    FEATURE_COALESCE_MESSAGES,
     MAX_PENDING_MSG,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
@@ -61,6 +63,7 @@ class WebSocketHandler:
         self._to_write: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_MSG)
         self._handle_task = None
         self._writer_task = None
+        self._connection: Optional[ActiveConnection] = None
         self._logger = WebSocketAdapter(_WS_LOGGER, {"connid": id(self)})
         self._peak_checker_unsub = None
 
@@ -73,18 +76,48 @@ class WebSocketHandler:
                 if message is None:
                     break
 
+                if not self._coalesce_messages or self._to_write.empty():
+                    if not isinstance(message, str):
+                        message = message_to_json(message)
+                    self._logger.debug("Sending %s", message)
+                    await self.wsock.send_str(message)
+                    continue
+
+                # Send everything that is queued as one JSON array frame
+                messages = [message]
+                closing = False
+                while not self._to_write.empty():
+                    message = self._to_write.get_nowait()
+                    if message is None:
+                        closing = True
+                        break
+                    messages.append(message)
+
+                message = "[{}]".format(
+                    ",".join(
+                        msg if isinstance(msg, str) else message_to_json(msg)
+                        for msg in messages
+                    )
+                )
                 self._logger.debug("Sending %s", message)
-
-                if not isinstance(message, str):
-                    message = message_to_json(message)
-
                 await self.wsock.send_str(message)
 
+                if closing:
+                    break
+
         # Clean up the peaker checker when we shut down the writer
         if self._peak_checker_unsub:
             self._peak_checker_unsub()
             self._peak_checker_unsub = None
 
+    @property
+    def _coalesce_messages(self) -> bool:
+        """Return if the client wants queued messages sent as one frame."""
+        return (
+            self._connection is not None
+            and self._connection.supported_features.get(FEATURE_COALESCE_MESSAGES) == 1
+        )
+
     @callback
     def _send_message(self, message):
         """Send a message to the client.
@@ -137,7 +170,9 @@ class WebSocketHandler:
     async def async_handle(self) -> web.WebSocketResponse:
         """Handle a websocket response."""
         request = self.request
-        wsock = self.wsock = web.WebSocketResponse(heartbeat=55)
+        # Messages are compressed with permessage-deflate if the client
+        # offers it during the handshake
+        wsock = self.wsock = web.WebSocketResponse(heartbeat=55, compress=True)
         await wsock.prepare(request)
         self._logger.debug("Connected from %s", request.remote)
         self._handle_task = asyncio.current_task()
@@ -184,7 +219,7 @@ class WebSocketHandler:
                 raise Disconnect from err
 
             self._logger.debug("Received %s", msg_data)
-            connection = await auth.async_handle(msg_data)
+            connection = self._connection = await auth.async_handle(msg_data)
             self.hass.data[DATA_CONNECTIONS] = (
                 self.hass.data.get(DATA_CONNECTIONS, 0) + 1
             )
@@ -2,11 +2,11 @@
 
 from functools import lru_cache
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List
 
 import voluptuous as vol
 
-from homeassistant.core import Event
+from homeassistant.core import Event, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.util.json import (
     find_paths_unserializable_data,
@@ -71,7 +71,133 @@ def _cached_event_message(event: Event) -> str:
     The IDEN_TEMPLATE is used which will be replaced
     with the actual iden in cached_event_message
     """
-    return message_to_json(event_message(IDEN_TEMPLATE, event))
+    try:
+        return (
+            f'{{"id": {IDEN_JSON_TEMPLATE}, "type": "event", '
+            f'"event": {_event_json(event)}}}'
+        )
+    except (ValueError, TypeError):
+        # Serialize again to log where the bad data is
+        return message_to_json(event_message(IDEN_TEMPLATE, event))
+
+
+def _event_json(event: Event) -> str:
+    """Serialize an event to json.
+
+    States in the event data use their own cached json, so a state is
+    serialized once for all the messages that contain it.
+    """
+    data = ", ".join(
+        f"{const.JSON_DUMP(key)}: "
+        + (value.as_json() if isinstance(value, State) else const.JSON_DUMP(value))
+        for key, value in event.data.items()
+    )
+    event_dict = event.as_dict()
+    del event_dict["data"]
+    return f'{const.JSON_DUMP(event_dict)[:-1]}, "data": {{{data}}}}}'
+
+
+def states_result_json(iden: int, states: List[State]) -> str:
+    """Return a result message with a list of states serialized to json.
+
+    Uses the cached json of the states.
+    """
+    try:
+        result = ", ".join(state.as_json() for state in states)
+    except (ValueError, TypeError):
+        # Serialize again to log where the bad data is
+        return message_to_json(result_message(iden, states))
+    return (
+        f'{{"id": {iden}, "type": "{const.TYPE_RESULT}", '
+        f'"success": true, "result": [{result}]}}'
+    )
+
+
+def compressed_state_dict(state: State) -> Dict[str, Any]:
+    """Return a compact representation of a state.
+
+    The last updated time is left out if it equals the last changed time.
+    """
+    data = {
+        const.COMPRESSED_STATE_STATE: state.state,
+        const.COMPRESSED_STATE_ATTRIBUTES: dict(state.attributes),
+        const.COMPRESSED_STATE_CONTEXT: state.context.id,
+        const.COMPRESSED_STATE_LAST_CHANGED: state.last_changed.timestamp(),
+    }
+    if state.last_updated != state.last_changed:
+        data[const.COMPRESSED_STATE_LAST_UPDATED] = state.last_updated.timestamp()
+    return data
+
+
+def entities_message(iden: JSON_TYPE, states: Iterable[State]) -> Dict:
+    """Return a message that adds the states of entities."""
+    return event_message(
+        iden,
+        {
+            const.ENTITY_EVENT_ADD: {
+                state.entity_id: compressed_state_dict(state) for state in states
+            }
+        },
+    )
+
+
+def cached_state_diff_message(iden: int, event: Event) -> str:
+    """Return a message with the changes of a state changed event.
+
+    Serialize to json once per event, like cached_event_message.
+    """
+    return _cached_state_diff_message(event).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
+
+
+@lru_cache(maxsize=128)
+def _cached_state_diff_message(event: Event) -> str:
+    """Cache and serialize the changes of a state changed event to json."""
+    return message_to_json(event_message(IDEN_TEMPLATE, _state_diff_event(event)))
+
+
+def _state_diff_event(event: Event) -> Dict:
+    """Return the changes of a state changed event."""
+    entity_id = event.data["entity_id"]
+    new_state = event.data["new_state"]
+    if new_state is None:
+        return {const.ENTITY_EVENT_REMOVE: [entity_id]}
+
+    old_state = event.data["old_state"]
+    if old_state is None:
+        return {const.ENTITY_EVENT_ADD: {entity_id: compressed_state_dict(new_state)}}
+
+    additions: Dict[str, Any] = {}
+    if old_state.state != new_state.state:
+        additions[const.COMPRESSED_STATE_STATE] = new_state.state
+    if old_state.last_changed != new_state.last_changed:
+        additions[
+            const.COMPRESSED_STATE_LAST_CHANGED
+        ] = new_state.last_changed.timestamp()
+    if new_state.last_updated != new_state.last_changed:
+        additions[
+            const.COMPRESSED_STATE_LAST_UPDATED
+        ] = new_state.last_updated.timestamp()
+    if old_state.context.id != new_state.context.id:
+        additions[const.COMPRESSED_STATE_CONTEXT] = new_state.context.id
+
+    diff: Dict[str, Any] = {const.ENTITY_DIFF_ADDITIONS: additions}
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    if old_attributes is not new_attributes:
+        changed = {
+            key: value
+            for key, value in new_attributes.items()
+            if key not in old_attributes or old_attributes[key] != value
+        }
+        if changed:
+            additions[const.COMPRESSED_STATE_ATTRIBUTES] = changed
+        removed = [key for key in old_attributes if key not in new_attributes]
+        if removed:
+            diff[const.ENTITY_DIFF_REMOVALS] = {
+                const.COMPRESSED_STATE_ATTRIBUTES: removed
+            }
+
+    return {const.ENTITY_EVENT_CHANGE: {entity_id: diff}}
 
 
 def message_to_json(message: Any) -> str:
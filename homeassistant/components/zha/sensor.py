@@ -112,6 +112,11 @@ class Sensor(ZhaEntity):
             self._channel, SIGNAL_ATTR_UPDATED, self.async_set_state
         )
 
+    @property
+    def has_static_attributes(self) -> bool:
+        """Return True as only the state attributes change on reports."""
+        return True
+
     @property
     def device_class(self) -> str:
         """Return device class from component DEVICE_CLASSES."""
@@ -253,6 +258,11 @@ class SmartEnergyMetering(Sensor):
         """Pass through channel formatter."""
         return self._channel.formatter_function(value)
 
+    @property
+    def has_static_attributes(self) -> bool:
+        """Return False as the unit is read from the metering cluster."""
+        return False
+
     @property
     def unit_of_measurement(self) -> str:
         """Return Unit of measurement."""
@@ -37,6 +37,7 @@ from homeassistant.const import (
     CONF_MEDIA_DIRS,
     CONF_NAME,
     CONF_PACKAGES,
+    CONF_STATE_WRITE_INTERVAL,
     CONF_TEMPERATURE_UNIT,
     CONF_TIME_ZONE,
     CONF_TYPE,
@@ -69,6 +70,7 @@ YAML_CONFIG_FILE = "configuration.yaml"
 VERSION_FILE = ".HA_VERSION"
 CONFIG_DIR_NAME = ".homeassistant"
 DATA_CUSTOMIZE = "hass_customize"
+DATA_STATE_WRITE_INTERVAL = "hass_state_write_interval"
 
 GROUP_CONFIG_PATH = "groups.yaml"
 AUTOMATION_CONFIG_PATH = "automations.yaml"
@@ -226,6 +228,10 @@ CORE_CONFIG_SCHEMA = CUSTOMIZE_CONFIG_SCHEMA.extend(
         # pylint: disable=no-value-for-parameter
         vol.Optional(CONF_MEDIA_DIRS): cv.schema_with_slug_keys(vol.IsDir()),
         vol.Optional(CONF_LEGACY_TEMPLATES): cv.boolean,
+        # Keys are entity ids, domains or entity id globs
+        vol.Optional(CONF_STATE_WRITE_INTERVAL, default={}): vol.Schema(
+            {cv.string: cv.positive_time_period}
+        ),
     }
 )
 
@@ -562,6 +568,24 @@ async def async_process_ha_core_config(hass: HomeAssistant, config: Dict) -> Non
 
     hass.data[DATA_CUSTOMIZE] = EntityValues(cust_exact, cust_domain, cust_glob)
 
+    # State writes to coalesce
+    write_exact: Dict[str, Dict] = {}
+    write_domain: Dict[str, Dict] = {}
+    write_glob: Dict[str, Dict] = OrderedDict()
+
+    for key, interval in config[CONF_STATE_WRITE_INTERVAL].items():
+        value = {CONF_STATE_WRITE_INTERVAL: interval}
+        if "*" in key or "?" in key:
+            write_glob[key] = value
+        elif "." in key:
+            write_exact[key] = value
+        else:
+            write_domain[key] = value
+
+    hass.data[DATA_STATE_WRITE_INTERVAL] = EntityValues(
+        write_exact, write_domain, write_glob
+    )
+
     if CONF_UNIT_SYSTEM in config:
         if config[CONF_UNIT_SYSTEM] == CONF_UNIT_SYSTEM_IMPERIAL:
             hac.units = IMPERIAL_SYSTEM
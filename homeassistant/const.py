@@ -168,6 +168,7 @@ CONF_SOURCE = "source"
 CONF_SSL = "ssl"
 CONF_STATE = "state"
 CONF_STATE_TEMPLATE = "state_template"
+CONF_STATE_WRITE_INTERVAL = "state_write_interval"
 CONF_STRUCTURE = "structure"
 CONF_SWITCHES = "switches"
 CONF_TARGET = "target"
@@ -29,6 +29,7 @@ from typing import (
     Mapping,
     Optional,
     Set,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -73,6 +74,8 @@ from homeassistant.exceptions import (
 from homeassistant.util import location, network
 from homeassistant.util.async_ import fire_coroutine_threadsafe, run_callback_threadsafe
 import homeassistant.util.dt as dt_util
+from homeassistant.util.executor import ExecutorPools, target_domain
+from homeassistant.util.json import json_dumps
 from homeassistant.util.thread import fix_threading_exception_logging
 from homeassistant.util.timeout import TimeoutManager
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM, UnitSystem
@@ -83,6 +86,7 @@ if TYPE_CHECKING:
     from homeassistant.auth import AuthManager
     from homeassistant.components.http import HomeAssistantHTTP
     from homeassistant.config_entries import ConfigEntries
+    from homeassistant.helpers.job_profiler import JobProfiler
 
 
 block_async_io.enable()
@@ -93,6 +97,7 @@ _UNDEF: dict = {}  # Internal; not helpers.typing.UNDEFINED due to circular depe
 # pylint: disable=invalid-name
 CALLABLE_T = TypeVar("CALLABLE_T", bound=Callable)
 CALLBACK_TYPE = Callable[[], None]
+EventFilter = Callable[["Event"], bool]
 # pylint: enable=invalid-name
 
 CORE_STORAGE_KEY = "core.config"
@@ -236,6 +241,10 @@ class HomeAssistant:
         self._stopped: Optional[asyncio.Event] = None
         # Timeout handler for Core/Helper namespace
         self.timeout: TimeoutManager = TimeoutManager()
+        # Accounts the time of the jobs that are run while set
+        self.job_profiler: Optional["JobProfiler"] = None
+        # Named executors that cap the jobs of each integration
+        self.executors = ExecutorPools(self.loop)
 
     @property
     def is_running(self) -> bool:
@@ -364,15 +373,23 @@ class HomeAssistant:
         hassjob: HassJob to call.
         args: parameters for method to call.
         """
+        profiler = self.job_profiler
         if hassjob.job_type == HassJobType.Coroutinefunction:
-            task = self.loop.create_task(hassjob.target(*args))
+            coro = hassjob.target(*args)
+            if profiler is not None:
+                coro = profiler.timed_coroutine(hassjob.target, coro)
+            task = self.loop.create_task(coro)
         elif hassjob.job_type == HassJobType.Callback:
-            self.loop.call_soon(hassjob.target, *args)
+            if profiler is not None:
+                self.loop.call_soon(profiler.run_callback, hassjob.target, *args)
+            else:
+                self.loop.call_soon(hassjob.target, *args)
             return None
         else:
-            task = self.loop.run_in_executor(  # type: ignore
-                None, hassjob.target, *args
-            )
+            target = hassjob.target
+            if profiler is not None:
+                target = profiler.executor_target(target)
+            task = self.loop.run_in_executor(None, target, *args)  # type: ignore
 
         # If a task is scheduled
         if self._track_task:
@@ -397,10 +414,22 @@ class HomeAssistant:
 
     @callback
     def async_add_executor_job(
-        self, target: Callable[..., T], *args: Any
+        self, target: Callable[..., T], *args: Any, executor: Optional[str] = None
     ) -> Awaitable[T]:
-        """Add an executor job from within the event loop."""
-        task = self.loop.run_in_executor(None, target, *args)
+        """Add an executor job from within the event loop.
+
+        executor: name of the executor to run the job in, see
+        homeassistant.util.executor. The default executor is used if None.
+        """
+        if executor is None:
+            if self.job_profiler is not None:
+                target = self.job_profiler.executor_target(target)
+            task = self.loop.run_in_executor(None, target, *args)
+        else:
+            domain = target_domain(target)
+            if self.job_profiler is not None:
+                target = self.job_profiler.executor_target(target)
+            task = self.executors.async_submit(executor, domain, target, *args)
 
         # If a task is scheduled
         if self._track_task:
@@ -430,7 +459,10 @@ class HomeAssistant:
         args: parameters for method to call.
         """
         if hassjob.job_type == HassJobType.Callback:
-            hassjob.target(*args)
+            if self.job_profiler is not None:
+                self.job_profiler.run_callback(hassjob.target, *args)
+            else:
+                hassjob.target(*args)
             return None
 
         return self.async_add_hass_job(hassjob, *args)
@@ -558,6 +590,15 @@ class HomeAssistant:
                 "Timed out waiting for shutdown stage 3 to complete, the shutdown will continue"
             )
 
+        # Wait for the jobs that are still running in the named executors
+        try:
+            async with self.timeout.async_timeout(30):
+                await self.loop.run_in_executor(None, self.executors.shutdown)
+        except asyncio.TimeoutError:
+            _LOGGER.warning(
+                "Timed out waiting for the executors to shut down, the shutdown will continue"
+            )
+
         self.exit_code = exit_code
         self.state = CoreState.stopped
 
@@ -652,7 +693,13 @@ class EventBus:
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
-        self._listeners: Dict[str, List[HassJob]] = {}
+        # Listener jobs and their event filters, dicts keep the
+        # subscription order and remove listeners in O(1)
+        self._listeners: Dict[str, Dict[HassJob, Optional[EventFilter]]] = {}
+        # Merged MATCH_ALL and event type listeners, built on first fire
+        self._dispatch: Dict[
+            str, Tuple[Tuple[HassJob, Optional[EventFilter]], ...]
+        ] = {}
         self._hass = hass
 
     @callback
@@ -663,6 +710,16 @@ class EventBus:
         """
         return {key: len(self._listeners[key]) for key in self._listeners}
 
+    @callback
+    def async_has_listeners(self, event_type: str) -> bool:
+        """Return if something listens to event_type itself.
+
+        Listeners for MATCH_ALL are not taken into account.
+
+        This method must be run in the event loop.
+        """
+        return event_type in self._listeners
+
     @property
     def listeners(self) -> Dict[str, int]:
         """Return dictionary with events and the number of listeners."""
@@ -693,32 +750,81 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        listeners = self._listeners.get(event_type, [])
+        listeners = self._dispatch.get(event_type)
+        if listeners is None:
+            listeners = self._async_build_dispatch(event_type)
 
-        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
+        if not listeners:
+            if event_type != EVENT_TIME_CHANGED and _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "Bus:Handling %s",
+                    Event(event_type, event_data, origin, time_fired, context),
+                )
+            return
 
         event = Event(event_type, event_data, origin, time_fired, context)
 
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.debug("Bus:Handling %s", event)
 
-        if not listeners:
-            return
-
-        for job in listeners:
+        for job, event_filter in listeners:
+            if event_filter is not None:
+                try:
+                    if not event_filter(event):
+                        continue
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error in event filter of %s", job)
+                    continue
             self._hass.async_add_hass_job(job, event)
 
-    def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
+    @callback
+    def _async_build_dispatch(
+        self, event_type: str
+    ) -> Tuple[Tuple[HassJob, Optional[EventFilter]], ...]:
+        """Merge and cache the listeners of an event type.
+
+        Event types without listeners are not cached so firing
+        arbitrary event types does not grow the cache.
+
+        This method must be run in the event loop.
+        """
+        listeners = self._listeners.get(event_type)
+
+        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
+        match_all_listeners = self._listeners.get(MATCH_ALL)
+        if match_all_listeners is None or event_type == EVENT_HOMEASSISTANT_CLOSE:
+            if listeners is None:
+                return ()
+            merged = tuple(listeners.items())
+        elif listeners is None:
+            merged = tuple(match_all_listeners.items())
+        else:
+            merged = tuple(match_all_listeners.items()) + tuple(listeners.items())
+
+        self._dispatch[event_type] = merged
+        return merged
+
+    @callback
+    def _async_invalidate_dispatch(self, event_type: str) -> None:
+        """Drop the cached listeners affected by a change of event_type."""
+        if event_type == MATCH_ALL:
+            self._dispatch.clear()
+        else:
+            self._dispatch.pop(event_type, None)
+
+    def listen(
+        self,
+        event_type: str,
+        listener: Callable,
+        event_filter: Optional[EventFilter] = None,
+    ) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
         To listen to all events specify the constant ``MATCH_ALL``
         as event_type.
         """
         async_remove_listener = run_callback_threadsafe(
-            self._hass.loop, self.async_listen, event_type, listener
+            self._hass.loop, self.async_listen, event_type, listener, event_filter
         ).result()
 
         def remove_listener() -> None:
@@ -728,19 +834,33 @@ class EventBus:
         return remove_listener
 
     @callback
-    def async_listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
+    def async_listen(
+        self,
+        event_type: str,
+        listener: Callable,
+        event_filter: Optional[EventFilter] = None,
+    ) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
         To listen to all events specify the constant ``MATCH_ALL``
         as event_type.
 
+        An event_filter is a callback that is called with the event when
+        it is fired. The listener is only scheduled if it returns True.
+
         This method must be run in the event loop.
         """
-        return self._async_listen_job(event_type, HassJob(listener))
+        return self._async_listen_job(event_type, HassJob(listener), event_filter)
 
     @callback
-    def _async_listen_job(self, event_type: str, hassjob: HassJob) -> CALLBACK_TYPE:
-        self._listeners.setdefault(event_type, []).append(hassjob)
+    def _async_listen_job(
+        self,
+        event_type: str,
+        hassjob: HassJob,
+        event_filter: Optional[EventFilter] = None,
+    ) -> CALLBACK_TYPE:
+        self._listeners.setdefault(event_type, {})[hassjob] = event_filter
+        self._async_invalidate_dispatch(event_type)
 
         def remove_listener() -> None:
             """Remove the listener."""
@@ -806,15 +926,18 @@ class EventBus:
         This method must be run in the event loop.
         """
         try:
-            self._listeners[event_type].remove(hassjob)
-
-            # delete event_type list if empty
-            if not self._listeners[event_type]:
-                self._listeners.pop(event_type)
-        except (KeyError, ValueError):
-            # KeyError is key event_type listener did not exist
-            # ValueError if listener did not exist within event_type
+            listeners = self._listeners[event_type]
+            del listeners[hassjob]
+        except KeyError:
+            # event_type or the listener within event_type did not exist
             _LOGGER.exception("Unable to remove unknown job listener %s", hassjob)
+            return
+
+        # delete event_type listeners if empty
+        if not listeners:
+            self._listeners.pop(event_type)
+
+        self._async_invalidate_dispatch(event_type)
 
 
 class State:
@@ -840,6 +963,7 @@ class State:
         "domain",
         "object_id",
         "_as_dict",
+        "_as_json",
     ]
 
     def __init__(
@@ -875,6 +999,39 @@ class State:
         self.context = context or Context()
         self.domain, self.object_id = split_entity_id(self.entity_id)
         self._as_dict: Optional[Dict[str, Collection[Any]]] = None
+        self._as_json: Optional[str] = None
+
+    @classmethod
+    def _from_previous(
+        cls,
+        old_state: "State",
+        state: str,
+        attributes: Mapping,
+        last_changed: Optional[datetime.datetime],
+        last_updated: datetime.datetime,
+        context: Context,
+    ) -> "State":
+        """Create the next state of an entity without validating it again.
+
+        The entity id and its domain and object id are taken from the previous
+        state. Attributes equal to the previous ones are shared with it.
+        """
+        new: State = cls.__new__(cls)
+        new.entity_id = old_state.entity_id
+        new.state = state
+        new.attributes = (
+            attributes
+            if isinstance(attributes, MappingProxyType)
+            else MappingProxyType(attributes)
+        )
+        new.last_updated = last_updated
+        new.last_changed = last_changed or last_updated
+        new.context = context
+        new.domain = old_state.domain
+        new.object_id = old_state.object_id
+        new._as_dict = None  # pylint: disable=protected-access
+        new._as_json = None  # pylint: disable=protected-access
+        return new
 
     @property
     def name(self) -> str:
@@ -907,6 +1064,18 @@ class State:
             }
         return self._as_dict
 
+    def as_json(self) -> str:
+        """Return the JSON representation of the State.
+
+        Async friendly.
+
+        The result is cached since a state is replaced instead of changed.
+        Raises ValueError or TypeError if the attributes cannot be serialized.
+        """
+        if self._as_json is None:
+            self._as_json = json_dumps(self.as_dict())
+        return self._as_json
+
     @classmethod
     def from_dict(cls, json_dict: Dict) -> Any:
         """Initialize a state from a dict.
@@ -961,6 +1130,38 @@ class State:
         )
 
 
+def _compile_state_changed_filter(
+    entity_ids: Optional[Iterable[str]],
+    domains: Optional[Iterable[str]],
+    event_filter: Optional[EventFilter],
+) -> Optional[EventFilter]:
+    """Combine entity ids, domains and an event filter into one filter."""
+    if entity_ids is None and domains is None:
+        return event_filter
+
+    match_entity_ids = frozenset(entity_id.lower() for entity_id in entity_ids or ())
+    match_domains = frozenset(domain.lower() for domain in domains or ())
+
+    @callback
+    def state_changed_filter(event: Event) -> bool:
+        """Return if the state change is of a matching entity."""
+        entity_id = event.data["entity_id"]
+        if (
+            entity_id not in match_entity_ids
+            and entity_id.partition(".")[0] not in match_domains
+        ):
+            return False
+        if event_filter is None:
+            return True
+        try:
+            return event_filter(event)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error in state changed filter %s", event_filter)
+            return False
+
+    return state_changed_filter
+
+
 class StateMachine:
     """Helper class that tracks the state of different entities."""
 
@@ -971,6 +1172,31 @@ class StateMachine:
         self._bus = bus
         self._loop = loop
 
+    @callback
+    def async_listen(
+        self,
+        listener: Callable,
+        entity_ids: Optional[Iterable[str]] = None,
+        domains: Optional[Iterable[str]] = None,
+        event_filter: Optional[EventFilter] = None,
+    ) -> CALLBACK_TYPE:
+        """Listen for state changed events of some entities.
+
+        The listener is called for state changes of the entity_ids and of
+        the entities in the domains. If neither is given it is called for
+        all entities. An event_filter further restricts the events.
+
+        The filter is compiled once and evaluated while the event is fired
+        so listeners are not scheduled for state changes they ignore.
+
+        This method must be run in the event loop.
+        """
+        return self._bus.async_listen(
+            EVENT_STATE_CHANGED,
+            listener,
+            _compile_state_changed_filter(entity_ids, domains, event_filter),
+        )
+
     def entity_ids(self, domain_filter: Optional[str] = None) -> List[str]:
         """List of entity ids that are being tracked."""
         future = run_callback_threadsafe(
@@ -1155,17 +1381,38 @@ class StateMachine:
 
         This method must be run in the event loop.
         """
-        entity_id = entity_id.lower()
-        new_state = str(new_state)
-        attributes = attributes or {}
+        self.async_set_internal(
+            entity_id.lower(), str(new_state), attributes, force_update, context
+        )
+
+    @callback
+    def async_set_internal(
+        self,
+        entity_id: str,
+        new_state: str,
+        attributes: Optional[Mapping] = None,
+        force_update: bool = False,
+        context: Optional[Context] = None,
+    ) -> None:
+        """Set the state of an entity from a writer that prepared it already.
+
+        Unlike async_set, entity_id must be lower case and new_state a string.
+        Once the entity has a state, the next one reuses its parsed entity id
+        and shares its attributes when they are unchanged.
+
+        This method must be run in the event loop.
+        """
         old_state = self._states.get(entity_id)
         if old_state is None:
             same_state = False
             same_attr = False
             last_changed = None
         else:
+            old_attributes = old_state.attributes
             same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == MappingProxyType(attributes)
+            same_attr = attributes is old_attributes or old_attributes == (
+                attributes or {}
+            )
             last_changed = old_state.last_changed if same_state else None
 
         if same_state and same_attr:
@@ -1176,15 +1423,23 @@ class StateMachine:
 
         now = dt_util.utcnow()
 
-        state = State(
-            entity_id,
-            new_state,
-            attributes,
-            last_changed,
-            now,
-            context,
-            old_state is None,
-        )
+        if old_state is None:
+            state = State(entity_id, new_state, attributes, None, now, context)
+            entity_id = state.entity_id
+        else:
+            if not valid_state(new_state):
+                raise InvalidStateError(
+                    f"Invalid state encountered for entity id: {entity_id}. "
+                    "State max length is 255 characters."
+                )
+            state = State._from_previous(
+                old_state,
+                new_state,
+                old_attributes if same_attr else attributes or {},
+                last_changed,
+                now,
+                context,
+            )
         self._states[entity_id] = state
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
@@ -1739,7 +1994,13 @@ class Config:
 
 
 def _async_create_timer(hass: HomeAssistant) -> None:
-    """Create a timer that will start on HOMEASSISTANT_START."""
+    """Create a timer that will start on HOMEASSISTANT_START.
+
+    The time changed event is only fired while something listens to it
+    explicitly, listeners for all events do not receive it otherwise.
+    Use the helpers in homeassistant.helpers.event to run at a point in
+    time or at an interval instead.
+    """
     handle = None
     timer_context = Context()
 
@@ -1756,9 +2017,13 @@ def _async_create_timer(hass: HomeAssistant) -> None:
         """Fire next time event."""
         now = dt_util.utcnow()
 
-        hass.bus.async_fire(
-            EVENT_TIME_CHANGED, {ATTR_NOW: now}, time_fired=now, context=timer_context
-        )
+        if hass.bus.async_has_listeners(EVENT_TIME_CHANGED):
+            hass.bus.async_fire(
+                EVENT_TIME_CHANGED,
+                {ATTR_NOW: now},
+                time_fired=now,
+                context=timer_context,
+            )
 
         # If we are more than a second late, a tick was missed
         late = monotonic() - target
@@ -5,9 +5,9 @@ from datetime import datetime, timedelta
 import functools as ft
 import logging
 from timeit import default_timer as timer
-from typing import Any, Awaitable, Dict, Iterable, List, Optional
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Tuple
 
-from homeassistant.config import DATA_CUSTOMIZE
+from homeassistant.config import DATA_CUSTOMIZE, DATA_STATE_WRITE_INTERVAL
 from homeassistant.const import (
     ATTR_ASSUMED_STATE,
     ATTR_DEVICE_CLASS,
@@ -16,6 +16,7 @@ from homeassistant.const import (
     ATTR_ICON,
     ATTR_SUPPORTED_FEATURES,
     ATTR_UNIT_OF_MEASUREMENT,
+    CONF_STATE_WRITE_INTERVAL,
     DEVICE_DEFAULT_NAME,
     STATE_OFF,
     STATE_ON,
@@ -32,6 +33,7 @@ from homeassistant.helpers.event import Event, async_track_entity_registry_updat
 from homeassistant.helpers.typing import StateType
 from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util, ensure_unique_string, slugify
+from homeassistant.util.executor import EXECUTOR_POLLING
 
 _LOGGER = logging.getLogger(__name__)
 SLOW_UPDATE_WARNING = 10
@@ -123,6 +125,13 @@ class Entity(ABC):
     # If entity is added to an entity platform
     _added = False
 
+    # Loop time of the last state write and the pending coalesced write
+    _last_state_write: Optional[float] = None
+    _state_write_timer: Optional[asyncio.TimerHandle] = None
+
+    # Customizations and attributes cached for entities with static attributes
+    _static_attributes: Optional[Tuple[Any, Dict[str, Any], Dict[str, Any]]] = None
+
     @property
     def should_poll(self) -> bool:
         """Return True if entity has to be polled for state.
@@ -227,6 +236,34 @@ class Entity(ABC):
         """Flag supported features."""
         return None
 
+    @property
+    def has_static_attributes(self) -> bool:
+        """Return True if only the state attributes change between writes.
+
+        The capability attributes, unit of measurement, name, icon, entity
+        picture, assumed state, supported features and device class are then
+        read once and cached until async_invalidate_static_attributes is called.
+        """
+        return False
+
+    @property
+    def state_write_interval(self) -> Optional[timedelta]:
+        """Return the minimum time between two state writes, if any.
+
+        Writes within the interval are merged into one write of the latest
+        state at the end of the interval. Defaults to the state_write_interval
+        of the core config.
+        """
+        if self.hass is None:
+            return None
+        intervals = self.hass.data.get(DATA_STATE_WRITE_INTERVAL)
+        if intervals is None:
+            return None
+        interval: Optional[timedelta] = intervals.get(self.entity_id).get(
+            CONF_STATE_WRITE_INTERVAL
+        )
+        return interval
+
     @property
     def context_recent_time(self) -> timedelta:
         """Time that a context is considered recent."""
@@ -295,8 +332,42 @@ class Entity(ABC):
 
         self._async_write_ha_state()
 
+    @callback
+    def async_invalidate_static_attributes(self) -> None:
+        """Read the static attributes again on the next state write."""
+        self._static_attributes = None
+
     @callback
     def _async_write_ha_state(self) -> None:
+        """Write the state to the state machine, coalescing frequent writes."""
+        interval = self.state_write_interval
+        if interval is not None:
+            if self._state_write_timer is not None:
+                # The pending write will read the latest state
+                return
+            assert self.hass is not None
+            now = self.hass.loop.time()
+            last_write = self._last_state_write
+            if last_write is not None and now < last_write + interval.total_seconds():
+                self._state_write_timer = self.hass.loop.call_at(
+                    last_write + interval.total_seconds(),
+                    self._async_write_coalesced_ha_state,
+                )
+                return
+            self._last_state_write = now
+
+        self._async_write_ha_state_now()
+
+    @callback
+    def _async_write_coalesced_ha_state(self) -> None:
+        """Write the state that was held back by the state write interval."""
+        assert self.hass is not None
+        self._state_write_timer = None
+        self._last_state_write = self.hass.loop.time()
+        self._async_write_ha_state_now()
+
+    @callback
+    def _async_write_ha_state_now(self) -> None:
         """Write the state to the state machine."""
         if self.registry_entry and self.registry_entry.disabled_by:
             if not self._disabled_reported:
@@ -309,10 +380,22 @@ class Entity(ABC):
                 )
             return
 
+        assert self.hass is not None
         start = timer()
 
-        attr = self.capability_attributes
-        attr = dict(attr) if attr else {}
+        if self.has_static_attributes:
+            # Reloading the core config replaces the customizations
+            customize = self.hass.data.get(DATA_CUSTOMIZE)
+            static = self._static_attributes
+            if static is None or static[0] is not customize:
+                static = self._static_attributes = (
+                    customize,
+                    *self._async_calculate_static_attributes(),
+                )
+            attr = dict(static[1])
+            tail = static[2]
+        else:
+            attr, tail = self._async_calculate_static_attributes()
 
         if not self.available:
             state = STATE_UNAVAILABLE
@@ -322,35 +405,7 @@ class Entity(ABC):
             attr.update(self.state_attributes or {})
             attr.update(self.device_state_attributes or {})
 
-        unit_of_measurement = self.unit_of_measurement
-        if unit_of_measurement is not None:
-            attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
-
-        entry = self.registry_entry
-        # pylint: disable=consider-using-ternary
-        name = (entry and entry.name) or self.name
-        if name is not None:
-            attr[ATTR_FRIENDLY_NAME] = name
-
-        icon = (entry and entry.icon) or self.icon
-        if icon is not None:
-            attr[ATTR_ICON] = icon
-
-        entity_picture = self.entity_picture
-        if entity_picture is not None:
-            attr[ATTR_ENTITY_PICTURE] = entity_picture
-
-        assumed_state = self.assumed_state
-        if assumed_state:
-            attr[ATTR_ASSUMED_STATE] = assumed_state
-
-        supported_features = self.supported_features
-        if supported_features is not None:
-            attr[ATTR_SUPPORTED_FEATURES] = supported_features
-
-        device_class = self.device_class
-        if device_class is not None:
-            attr[ATTR_DEVICE_CLASS] = str(device_class)
+        attr.update(tail)
 
         end = timer()
 
@@ -377,11 +432,6 @@ class Entity(ABC):
                 extra,
             )
 
-        # Overwrite properties that have been set in the config file.
-        assert self.hass is not None
-        if DATA_CUSTOMIZE in self.hass.data:
-            attr.update(self.hass.data[DATA_CUSTOMIZE].get(self.entity_id))
-
         # Convert temperature if we detect one
         try:
             unit_of_measure = attr.get(ATTR_UNIT_OF_MEASUREMENT)
@@ -405,10 +455,56 @@ class Entity(ABC):
             self._context = None
             self._context_set = None
 
-        self.hass.states.async_set(
+        self.hass.states.async_set_internal(
             self.entity_id, state, attr, self.force_update, self._context
         )
 
+    @callback
+    def _async_calculate_static_attributes(
+        self,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Return the attributes written before and after the state attributes."""
+        assert self.hass is not None
+        attr = self.capability_attributes
+        head = dict(attr) if attr else {}
+        tail: Dict[str, Any] = {}
+
+        unit_of_measurement = self.unit_of_measurement
+        if unit_of_measurement is not None:
+            tail[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
+
+        entry = self.registry_entry
+        # pylint: disable=consider-using-ternary
+        name = (entry and entry.name) or self.name
+        if name is not None:
+            tail[ATTR_FRIENDLY_NAME] = name
+
+        icon = (entry and entry.icon) or self.icon
+        if icon is not None:
+            tail[ATTR_ICON] = icon
+
+        entity_picture = self.entity_picture
+        if entity_picture is not None:
+            tail[ATTR_ENTITY_PICTURE] = entity_picture
+
+        assumed_state = self.assumed_state
+        if assumed_state:
+            tail[ATTR_ASSUMED_STATE] = assumed_state
+
+        supported_features = self.supported_features
+        if supported_features is not None:
+            tail[ATTR_SUPPORTED_FEATURES] = supported_features
+
+        device_class = self.device_class
+        if device_class is not None:
+            tail[ATTR_DEVICE_CLASS] = str(device_class)
+
+        # Overwrite properties that have been set in the config file.
+        if DATA_CUSTOMIZE in self.hass.data:
+            tail.update(self.hass.data[DATA_CUSTOMIZE].get(self.entity_id))
+
+        return head, tail
+
     def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
         """Schedule an update ha state change task.
 
@@ -458,7 +554,9 @@ class Entity(ABC):
             if hasattr(self, "async_update"):
                 task = self.hass.async_create_task(self.async_update())  # type: ignore
             elif hasattr(self, "update"):
-                task = self.hass.async_add_executor_job(self.update)  # type: ignore
+                task = self.hass.async_add_executor_job(  # type: ignore
+                    self.update, executor=EXECUTOR_POLLING  # type: ignore
+                )
             else:
                 return
 
@@ -541,6 +639,10 @@ class Entity(ABC):
 
         self._added = False
 
+        if self._state_write_timer is not None:
+            self._state_write_timer.cancel()
+            self._state_write_timer = None
+
         if self._on_remove is not None:
             while self._on_remove:
                 self._on_remove.pop()()
@@ -616,6 +718,7 @@ class Entity(ABC):
         old = self.registry_entry
         self.registry_entry = ent_reg.async_get(data["entity_id"])
         assert self.registry_entry is not None
+        self.async_invalidate_static_attributes()
 
         if self.registry_entry.disabled_by is not None:
             await self.async_remove()
@@ -4,7 +4,17 @@ from contextvars import ContextVar
 from datetime import datetime, timedelta
 from logging import Logger
 from types import ModuleType
-from typing import TYPE_CHECKING, Callable, Coroutine, Dict, Iterable, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+)
+import zlib
 
 from homeassistant import config_entries
 from homeassistant.const import ATTR_RESTORED, DEVICE_DEFAULT_NAME
@@ -18,10 +28,11 @@ from homeassistant.core import (
 from homeassistant.exceptions import HomeAssistantError, PlatformNotReady
 from homeassistant.helpers import config_validation as cv, service
 from homeassistant.helpers.typing import HomeAssistantType
+from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
 
 from .entity_registry import DISABLED_INTEGRATION
-from .event import async_call_later, async_track_time_interval
+from .event import async_call_later, async_track_timer_interval
 
 if TYPE_CHECKING:
     from .entity import Entity
@@ -35,6 +46,7 @@ SLOW_ADD_MIN_TIMEOUT = 500
 
 PLATFORM_NOT_READY_RETRIES = 10
 DATA_ENTITY_PLATFORM = "entity_platform"
+DATA_POLLING_SCHEDULER = "entity_platform_polling"
 PLATFORM_NOT_READY_BASE_WAIT_TIME = 30  # seconds
 
 
@@ -70,6 +82,7 @@ class EntityPlatform:
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup: Optional[CALLBACK_TYPE] = None
         self._process_updates: Optional[asyncio.Lock] = None
+        self.poll_stats = PollStats()
 
         self.parallel_updates: Optional[asyncio.Semaphore] = None
 
@@ -334,10 +347,8 @@ class EntityPlatform:
         ):
             return
 
-        self._async_unsub_polling = async_track_time_interval(
-            self.hass,
-            self._update_entity_states,
-            self.scan_interval,
+        self._async_unsub_polling = _async_get_polling_scheduler(self.hass).async_add(
+            self
         )
 
     async def _async_add_entity(
@@ -600,6 +611,7 @@ class EntityPlatform:
         if self._process_updates is None:
             self._process_updates = asyncio.Lock()
         if self._process_updates.locked():
+            self.poll_stats.overruns += 1
             self.logger.warning(
                 "Updating %s %s took longer than the scheduled update interval %s",
                 self.platform_name,
@@ -609,6 +621,7 @@ class EntityPlatform:
             return
 
         async with self._process_updates:
+            start = self.hass.loop.time()
             tasks = []
             for entity in self.entities.values():
                 if not entity.should_poll:
@@ -617,6 +630,127 @@ class EntityPlatform:
 
             if tasks:
                 await asyncio.gather(*tasks)
+            self.poll_stats.add(self.hass.loop.time() - start)
+
+
+class PollStats:
+    """Duration and overruns of the polls of a platform."""
+
+    __slots__ = ("polls", "overruns", "last_duration", "total_duration", "max_duration")
+
+    def __init__(self) -> None:
+        """Initialize the poll stats."""
+        self.polls = 0
+        self.overruns = 0
+        self.last_duration = 0.0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+
+    def add(self, duration: float) -> None:
+        """Add the duration of a poll."""
+        self.polls += 1
+        self.last_duration = duration
+        self.total_duration += duration
+        if duration > self.max_duration:
+            self.max_duration = duration
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dictionary representation of the stats."""
+        return {
+            "polls": self.polls,
+            "overruns": self.overruns,
+            "last_duration": round(self.last_duration, 6),
+            "total_duration": round(self.total_duration, 6),
+            "max_duration": round(self.max_duration, 6),
+        }
+
+
+class _PollingScheduler:
+    """Spread the polls of the entity platforms over their scan interval.
+
+    Each platform polls at a fixed offset within its scan interval that is
+    derived from its domain, platform name and config entry. Platforms with
+    the same scan interval do not all wake up at the same instant and a
+    platform keeps its slot across restarts. Platforms that are due at the
+    same time are polled in one wakeup of the timer scheduler.
+    """
+
+    def __init__(self, hass: HomeAssistantType) -> None:
+        """Initialize the polling scheduler."""
+        self.hass = hass
+        self._offsets: Dict[EntityPlatform, float] = {}
+
+    def _poll_offset(self, platform: EntityPlatform, interval: float) -> float:
+        """Return the offset of the polls of a platform within the interval."""
+        if platform.config_entry is not None:
+            instance = platform.config_entry.entry_id
+        else:
+            instance = str(
+                self.hass.data[DATA_ENTITY_PLATFORM][platform.platform_name].index(
+                    platform
+                )
+            )
+        key = f"{platform.domain}.{platform.platform_name}.{instance}"
+        return zlib.crc32(key.encode()) / 2 ** 32 * interval
+
+    @callback
+    def async_add(self, platform: EntityPlatform) -> CALLBACK_TYPE:
+        """Poll a platform every scan interval at its offset."""
+        interval = platform.scan_interval.total_seconds()
+        offset = self._offsets[platform] = self._poll_offset(platform, interval)
+
+        utc_now = dt_util.utcnow()
+        delay = 0.0
+        if interval > 0:
+            delay = (offset - utc_now.timestamp()) % interval or interval
+
+        unsub = async_track_timer_interval(
+            self.hass,
+            platform._update_entity_states,  # pylint: disable=protected-access
+            platform.scan_interval,
+            utc_now + timedelta(seconds=delay),
+        )
+
+        @callback
+        def remove() -> None:
+            """Stop polling the platform."""
+            self._offsets.pop(platform, None)
+            unsub()
+
+        return remove
+
+    @callback
+    def async_stats(self) -> List[Dict[str, Any]]:
+        """Return the poll stats of the platforms, the slowest first."""
+        return [
+            {
+                "domain": platform.domain,
+                "platform": platform.platform_name,
+                "scan_interval": platform.scan_interval.total_seconds(),
+                "offset": round(offset, 3),
+                **platform.poll_stats.as_dict(),
+            }
+            for platform, offset in sorted(
+                self._offsets.items(),
+                key=lambda item: item[0].poll_stats.total_duration,
+                reverse=True,
+            )
+        ]
+
+
+@callback
+def _async_get_polling_scheduler(hass: HomeAssistantType) -> _PollingScheduler:
+    """Return the polling scheduler of hass."""
+    scheduler: Optional[_PollingScheduler] = hass.data.get(DATA_POLLING_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_POLLING_SCHEDULER] = _PollingScheduler(hass)
+    return scheduler
+
+
+@callback
+def async_get_polling_stats(hass: HomeAssistantType) -> List[Dict[str, Any]]:
+    """Return the poll duration and overruns of the polling platforms."""
+    return _async_get_polling_scheduler(hass).async_stats()
 
 
 current_platform: ContextVar[Optional[EntityPlatform]] = ContextVar(
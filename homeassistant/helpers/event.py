@@ -4,6 +4,8 @@ import copy
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import functools as ft
+import heapq
+import itertools
 import logging
 import time
 from typing import (
@@ -62,6 +64,8 @@ TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
 TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
 TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
 
+TIMER_SCHEDULER = "timer_scheduler"
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -1095,6 +1099,175 @@ def async_track_same_state(
 track_same_state = threaded_listener_factory(async_track_same_state)
 
 
+class _ScheduledJob:
+    """A job waiting in the timer scheduler."""
+
+    __slots__ = ("job", "utc_point_in_time", "interval", "queued")
+
+    def __init__(
+        self,
+        job: HassJob,
+        utc_point_in_time: datetime,
+        interval: Optional[timedelta],
+    ) -> None:
+        """Initialize the scheduled job."""
+        self.job: Optional[HassJob] = job
+        self.utc_point_in_time = utc_point_in_time
+        self.interval = interval
+        # If the job is in the heap of the scheduler
+        self.queued = False
+
+
+class _TimerScheduler:
+    """Run the point in time listeners of hass from a single loop timer.
+
+    Jobs are kept in a heap ordered by their point in time and only the
+    earliest one is armed on the event loop. Every job that is due when
+    the timer fires runs in the same wakeup, so thousands of time based
+    triggers do not each keep their own loop timer.
+
+    Cancelled jobs stay in the heap until they are popped, the heap is
+    compacted when more than half of it was cancelled.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._heap: List[Tuple[float, int, _ScheduledJob]] = []
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._handle_when: Optional[float] = None
+
+    @property
+    def scheduled(self) -> int:
+        """Return the number of jobs waiting to run."""
+        return len(self._heap) - self._cancelled
+
+    @callback
+    def async_schedule(
+        self,
+        utc_point_in_time: datetime,
+        job: HassJob,
+        interval: Optional[timedelta] = None,
+    ) -> CALLBACK_TYPE:
+        """Run a job at a point in time and then every interval if given.
+
+        The job is called with the point in time it was scheduled for.
+        """
+        scheduled = _ScheduledJob(job, utc_point_in_time, interval)
+        self._push(utc_point_in_time.timestamp(), scheduled)
+        self._async_arm()
+
+        @callback
+        def cancel() -> None:
+            """Cancel the job if it did not run yet."""
+            if scheduled.job is None:
+                return
+            scheduled.job = None
+            if not scheduled.queued:
+                # Popped from the heap and waiting to run in this wakeup
+                return
+            self._cancelled += 1
+            if self._cancelled > len(self._heap) // 2:
+                self._compact()
+
+        return cancel
+
+    def _push(self, when: float, scheduled: _ScheduledJob) -> None:
+        """Add a job to the heap."""
+        scheduled.queued = True
+        heapq.heappush(self._heap, (when, next(self._counter), scheduled))
+
+    def _compact(self) -> None:
+        """Drop the cancelled jobs from the heap."""
+        self._heap = [item for item in self._heap if item[2].job is not None]
+        heapq.heapify(self._heap)
+        self._cancelled = 0
+
+    @callback
+    def _async_arm(self, now: Optional[float] = None) -> None:
+        """Arm the loop timer for the earliest job."""
+        heap = self._heap
+        while heap and heap[0][2].job is None:
+            heapq.heappop(heap)[2].queued = False
+            self._cancelled -= 1
+
+        if not heap:
+            return
+
+        when = heap[0][0]
+        if self._handle is not None:
+            # A timer that fires too early finds nothing due and rearms
+            if self._handle_when <= when:  # type: ignore
+                return
+            self._handle.cancel()
+
+        if now is None:
+            now = time.time()
+        self._handle_when = when
+        self._handle = self.hass.loop.call_later(when - now, self._async_run_due)
+
+    @callback
+    def _async_run_due(self) -> None:
+        """Run all jobs that are due."""
+        self._handle = None
+
+        # Depending on the available clock support (including timer hardware
+        # and the OS kernel) it can happen that we fire a little bit too early
+        # as measured by utcnow(). That is bad when callbacks have assumptions
+        # about the current time. Thus, jobs that are not due yet wait for
+        # the timer to be rearmed.
+        utc_now = time_tracker_utcnow()
+        now = utc_now.timestamp()
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= now:
+            scheduled = heapq.heappop(heap)[2]
+            scheduled.queued = False
+            if scheduled.job is None:
+                self._cancelled -= 1
+                continue
+            due.append((scheduled, scheduled.utc_point_in_time))
+            if scheduled.interval is None:
+                continue
+            # Runs that were missed are skipped instead of repeated, the
+            # next run stays on the grid of the interval
+            point = scheduled.utc_point_in_time
+            next_point = point + scheduled.interval
+            if next_point.timestamp() <= now:
+                missed = int(
+                    (now - point.timestamp()) // scheduled.interval.total_seconds()
+                )
+                next_point = point + scheduled.interval * (missed + 1)
+            scheduled.utc_point_in_time = next_point
+            self._push(next_point.timestamp(), scheduled)
+
+        # Jobs scheduled by the due jobs wait for the next wakeup
+        self._async_arm(now)
+
+        for scheduled, utc_point_in_time in due:
+            job = scheduled.job
+            if job is None:
+                # Cancelled by a job that ran before it
+                continue
+            if scheduled.interval is None:
+                scheduled.job = None
+            try:
+                self.hass.async_run_hass_job(job, utc_point_in_time)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running timer job %s", job)
+
+
+@callback
+def _async_get_timer_scheduler(hass: HomeAssistant) -> _TimerScheduler:
+    """Return the timer scheduler of hass."""
+    scheduler: Optional[_TimerScheduler] = hass.data.get(TIMER_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[TIMER_SCHEDULER] = _TimerScheduler(hass)
+    return scheduler
+
+
 @callback
 @bind_hass
 def async_track_point_in_time(
@@ -1132,39 +1305,7 @@ def async_track_point_in_utc_time(
     # having to figure out how to call the action every time its called.
     job = action if isinstance(action, HassJob) else HassJob(action)
 
-    cancel_callback: Optional[asyncio.TimerHandle] = None
-
-    @callback
-    def run_action() -> None:
-        """Call the action."""
-        nonlocal cancel_callback
-
-        now = time_tracker_utcnow()
-
-        # Depending on the available clock support (including timer hardware
-        # and the OS kernel) it can happen that we fire a little bit too early
-        # as measured by utcnow(). That is bad when callbacks have assumptions
-        # about the current time. Thus, we rearm the timer for the remaining
-        # time.
-        delta = (utc_point_in_time - now).total_seconds()
-        if delta > 0:
-            _LOGGER.debug("Called %f seconds too early, rearming", delta)
-
-            cancel_callback = hass.loop.call_later(delta, run_action)
-            return
-
-        hass.async_run_hass_job(job, utc_point_in_time)
-
-    delta = utc_point_in_time.timestamp() - time.time()
-    cancel_callback = hass.loop.call_later(delta, run_action)
-
-    @callback
-    def unsub_point_in_time_listener() -> None:
-        """Cancel the call_later."""
-        assert cancel_callback is not None
-        cancel_callback.cancel()
-
-    return unsub_point_in_time_listener
+    return _async_get_timer_scheduler(hass).async_schedule(utc_point_in_time, job)
 
 
 track_point_in_utc_time = threaded_listener_factory(async_track_point_in_utc_time)
@@ -1225,6 +1366,32 @@ def async_track_time_interval(
 track_time_interval = threaded_listener_factory(async_track_time_interval)
 
 
+@callback
+@bind_hass
+def async_track_timer_interval(
+    hass: HomeAssistant,
+    action: Callable[..., Union[None, Awaitable]],
+    interval: timedelta,
+    utc_point_in_time: Optional[datetime] = None,
+) -> CALLBACK_TYPE:
+    """Add a listener that the timer scheduler fires at every interval.
+
+    Unlike async_track_time_interval the interval is kept by the scheduler
+    itself: the next run does not depend on utcnow when the listener runs
+    and runs that were missed are skipped instead of repeated.
+
+    The first run is at utc_point_in_time, or one interval from now if None.
+    """
+    if utc_point_in_time is None:
+        utc_point_in_time = dt_util.utcnow() + interval
+    return _async_get_timer_scheduler(hass).async_schedule(
+        utc_point_in_time, HassJob(action), interval
+    )
+
+
+track_timer_interval = threaded_listener_factory(async_track_timer_interval)
+
+
 @attr.s
 class SunListener:
     """Helper class to help listen to sun events."""
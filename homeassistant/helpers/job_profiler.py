@@ -0,0 +1,195 @@
+"""Account the time spent running jobs by their target and integration."""
+from collections import abc
+import functools
+import threading
+import time
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
+
+from homeassistant.util.executor import integration_domain
+
+_TargetKey = Tuple[str, str]
+
+
+class JobStats:
+    """Time spent running the jobs of one target."""
+
+    __slots__ = (
+        "calls",
+        "loop_time",
+        "executor_calls",
+        "executor_time",
+        "executor_wait",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the job stats."""
+        self.calls = 0
+        self.loop_time = 0.0
+        self.executor_calls = 0
+        self.executor_time = 0.0
+        self.executor_wait = 0.0
+
+    @property
+    def total_time(self) -> float:
+        """Return the time spent in the event loop and the executor."""
+        return self.loop_time + self.executor_time
+
+    def add(self, other: "JobStats") -> None:
+        """Add the stats of another target."""
+        self.calls += other.calls
+        self.loop_time += other.loop_time
+        self.executor_calls += other.executor_calls
+        self.executor_time += other.executor_time
+        self.executor_wait += other.executor_wait
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dictionary representation of the stats."""
+        return {
+            "calls": self.calls,
+            "loop_time": round(self.loop_time, 6),
+            "executor_calls": self.executor_calls,
+            "executor_time": round(self.executor_time, 6),
+            "executor_wait": round(self.executor_wait, 6),
+        }
+
+
+def job_target_key(target: Callable) -> _TargetKey:
+    """Return the module and qualified name of a job target."""
+    while isinstance(target, functools.partial):
+        target = target.func
+
+    module = getattr(target, "__module__", None) or type(target).__module__
+    name = getattr(target, "__qualname__", None) or type(target).__qualname__
+    return module, name
+
+
+class JobProfiler:
+    """Collect the time spent running job targets.
+
+    Callbacks and the steps of coroutines are timed in the event loop.
+    Executor jobs record the time they waited for a worker and the time
+    they ran in it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the job profiler."""
+        self.started = time.monotonic()
+        self._stats: Dict[_TargetKey, JobStats] = {}
+        self._executor_lock = threading.Lock()
+
+    def _target_stats(self, target: Callable) -> JobStats:
+        """Return the stats of a job target."""
+        key = job_target_key(target)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats.setdefault(key, JobStats())
+        return stats
+
+    def run_callback(self, target: Callable, *args: Any) -> Any:
+        """Run a callback and time it."""
+        stats = self._target_stats(target)
+        stats.calls += 1
+        start = time.perf_counter()
+        try:
+            return target(*args)
+        finally:
+            stats.loop_time += time.perf_counter() - start
+
+    def timed_coroutine(self, target: Callable, coro: Coroutine) -> Coroutine:
+        """Return the coroutine of a target with each of its steps timed."""
+        stats = self._target_stats(target)
+        stats.calls += 1
+        return _TimedCoroutine(coro, stats)
+
+    def executor_target(self, target: Callable) -> Callable:
+        """Return a target that is timed when the executor runs it."""
+        return functools.partial(
+            self._run_executor_job,
+            self._target_stats(target),
+            target,
+            time.perf_counter(),
+        )
+
+    def _run_executor_job(
+        self, stats: JobStats, target: Callable, submitted: float, *args: Any
+    ) -> Any:
+        """Run a target in the executor and time it."""
+        start = time.perf_counter()
+        try:
+            return target(*args)
+        finally:
+            end = time.perf_counter()
+            with self._executor_lock:
+                stats.executor_calls += 1
+                stats.executor_wait += start - submitted
+                stats.executor_time += end - start
+
+    def report(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """Return the targets and integrations that took the most time."""
+        by_domain: Dict[str, JobStats] = {}
+        jobs: List[Dict[str, Any]] = []
+
+        for (module, name), stats in sorted(
+            self._stats.items(), key=lambda item: item[1].total_time, reverse=True
+        ):
+            domain = integration_domain(module)
+            by_domain.setdefault(domain, JobStats()).add(stats)
+            jobs.append(
+                {"target": f"{module}.{name}", "domain": domain, **stats.as_dict()}
+            )
+
+        domains = [
+            {"domain": domain, **stats.as_dict()}
+            for domain, stats in sorted(
+                by_domain.items(), key=lambda item: item[1].total_time, reverse=True
+            )
+        ]
+
+        return {
+            "duration": round(time.monotonic() - self.started, 3),
+            "jobs": jobs[:top],
+            "domains": domains[:top],
+        }
+
+
+class _TimedCoroutine(abc.Coroutine):
+    """Coroutine that adds the time of each of its steps to the job stats."""
+
+    __slots__ = ("_coro", "_stats")
+
+    def __init__(self, coro: Coroutine, stats: JobStats) -> None:
+        """Initialize the timed coroutine."""
+        self._coro = coro
+        self._stats = stats
+
+    def send(self, value: Any) -> Any:
+        """Run the coroutine until it suspends."""
+        start = time.perf_counter()
+        try:
+            return self._coro.send(value)
+        finally:
+            self._stats.loop_time += time.perf_counter() - start
+
+    def throw(self, *args: Any) -> Any:
+        """Raise an exception in the coroutine."""
+        start = time.perf_counter()
+        try:
+            return self._coro.throw(*args)
+        finally:
+            self._stats.loop_time += time.perf_counter() - start
+
+    def close(self) -> None:
+        """Close the coroutine."""
+        self._coro.close()
+
+    def __await__(self) -> "_TimedCoroutine":  # type: ignore
+        """Return the coroutine as its own iterator."""
+        return self
+
+    def __iter__(self) -> "_TimedCoroutine":
+        """Return the coroutine as its own iterator."""
+        return self
+
+    def __next__(self) -> Any:
+        """Run the coroutine until it suspends."""
+        return self.send(None)
@@ -1,8 +1,9 @@
 """Helpers to help with encoding Home Assistant objects in JSON."""
-from datetime import datetime
 import json
 from typing import Any
 
+from homeassistant.util.json import json_encoder_default
+
 
 class JSONEncoder(json.JSONEncoder):
     """JSONEncoder that supports Home Assistant objects."""
@@ -12,11 +13,7 @@ class JSONEncoder(json.JSONEncoder):
 
         Hand other objects to the original method.
         """
-        if isinstance(o, datetime):
-            return o.isoformat()
-        if isinstance(o, set):
-            return list(o)
-        if hasattr(o, "as_dict"):
-            return o.as_dict()
-
-        return json.JSONEncoder.default(self, o)
+        try:
+            return json_encoder_default(o)
+        except TypeError:
+            return json.JSONEncoder.default(self, o)
@@ -10,6 +10,7 @@ from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
 from homeassistant.helpers.event import async_call_later
 from homeassistant.loader import bind_hass
 from homeassistant.util import json as json_util
+from homeassistant.util.executor import EXECUTOR_IO
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-warn-return-any
 # mypy: no-check-untyped-defs
@@ -220,7 +221,7 @@ class Store:
 
             try:
                 await self.hass.async_add_executor_job(
-                    self._write_data, self.path, data
+                    self._write_data, self.path, data, executor=EXECUTOR_IO
                 )
             except (json_util.SerializationError, json_util.WriteError) as err:
                 _LOGGER.error("Error writing config for %s: %s", self.key, err)
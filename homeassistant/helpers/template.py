@@ -11,7 +11,9 @@ import math
 from operator import attrgetter
 import random
 import re
-from typing import Any, Dict, Generator, Iterable, Optional, Type, Union
+import threading
+from types import CodeType
+from typing import Any, Dict, Generator, Iterable, Optional, Tuple, Type, Union
 from urllib.parse import urlencode as urllib_urlencode
 import weakref
 
@@ -36,6 +38,7 @@ from homeassistant.helpers.typing import HomeAssistantType, TemplateVarsType
 from homeassistant.loader import bind_hass
 from homeassistant.util import convert, dt as dt_util, location as loc_util
 from homeassistant.util.async_ import run_callback_threadsafe
+from homeassistant.util.lru import LRU
 from homeassistant.util.thread import ThreadWithException
 
 # mypy: allow-untyped-calls, allow-untyped-defs
@@ -48,6 +51,12 @@ DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 _RENDER_INFO = "template.render_info"
 _ENVIRONMENT = "template.environment"
 
+# Compiled template code shared by all environments, by template source and
+# whether the environment lacks hass and the filters that need it
+COMPILED_CODE_CACHE_SIZE = 1024
+_COMPILED_CODE: LRU[Tuple[bool, str], CodeType] = LRU(COMPILED_CODE_CACHE_SIZE)
+_COMPILED_CODE_LOCK = threading.Lock()
+
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{|\{#")
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
 _IS_NUMERIC = re.compile(r"^[+-]?(?!0\d)\d*(?:\.\d*)?$")
@@ -118,6 +127,17 @@ def is_template_string(maybe_template: str) -> bool:
     return _RE_JINJA_DELIMITERS.search(maybe_template) is not None
 
 
+def compiled_code_cache_stats() -> Dict[str, int]:
+    """Return the size and hit/miss counters of the compiled template cache."""
+    with _COMPILED_CODE_LOCK:
+        return {
+            "size": len(_COMPILED_CODE),
+            "maxsize": _COMPILED_CODE.maxsize,
+            "hits": _COMPILED_CODE.hits,
+            "misses": _COMPILED_CODE.misses,
+        }
+
+
 class ResultWrapper:
     """Result wrapper class to store render result."""
 
@@ -1403,11 +1423,19 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             # any instance of this.
             return super().compile(source, name, filename, raw, defer_init)
 
-        cached = self.template_cache.get(source)
+        key = (self.hass is None, source)
+        with _COMPILED_CODE_LOCK:
+            cached = _COMPILED_CODE.get(key)
 
         if cached is None:
-            cached = self.template_cache[source] = super().compile(source)
-
+            # Code that was evicted can still be in use by templates
+            cached = self.template_cache.get(source)
+            if cached is None:
+                cached = super().compile(source)
+            with _COMPILED_CODE_LOCK:
+                _COMPILED_CODE[key] = cached
+
+        self.template_cache[source] = cached
         return cached
 
 
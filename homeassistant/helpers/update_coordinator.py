@@ -17,6 +17,7 @@ from .debounce import Debouncer
 
 REQUEST_REFRESH_DEFAULT_COOLDOWN = 10
 REQUEST_REFRESH_DEFAULT_IMMEDIATE = True
+ADAPTIVE_BACKOFF_FACTOR = 2
 
 T = TypeVar("T")
 
@@ -26,7 +27,15 @@ class UpdateFailed(Exception):
 
 
 class DataUpdateCoordinator(Generic[T]):
-    """Class to manage fetching data from single endpoint."""
+    """Class to manage fetching data from single endpoint.
+
+    If max_update_interval is set, the update interval is adaptive: every
+    fetch that returns data equal to the previous data multiplies the
+    interval by ADAPTIVE_BACKOFF_FACTOR up to max_update_interval. The
+    interval goes back to update_interval once the data changes or a
+    refresh is requested. Data is compared with ==, so the update method
+    has to return new data instead of changing the previous data in place.
+    """
 
     def __init__(
         self,
@@ -37,6 +46,7 @@ class DataUpdateCoordinator(Generic[T]):
         update_interval: Optional[timedelta] = None,
         update_method: Optional[Callable[[], Awaitable[T]]] = None,
         request_refresh_debouncer: Optional[Debouncer] = None,
+        max_update_interval: Optional[timedelta] = None,
     ):
         """Initialize global data updater."""
         self.hass = hass
@@ -44,6 +54,7 @@ class DataUpdateCoordinator(Generic[T]):
         self.name = name
         self.update_method = update_method
         self.update_interval = update_interval
+        self.max_update_interval = max_update_interval
 
         self.data: Optional[T] = None
 
@@ -51,6 +62,7 @@ class DataUpdateCoordinator(Generic[T]):
         self._job = HassJob(self._handle_refresh_interval)
         self._unsub_refresh: Optional[CALLBACK_TYPE] = None
         self._request_refresh_task: Optional[asyncio.TimerHandle] = None
+        self._backoff = 0
         self.last_update_success = True
 
         if request_refresh_debouncer is None:
@@ -75,6 +87,7 @@ class DataUpdateCoordinator(Generic[T]):
 
         # This is the first listener, set up interval.
         if schedule_refresh:
+            self._backoff = 0
             self._schedule_refresh()
 
         @callback
@@ -89,14 +102,28 @@ class DataUpdateCoordinator(Generic[T]):
         """Remove data update."""
         self._listeners.remove(update_callback)
 
-        if not self._listeners and self._unsub_refresh:
+        if self._listeners:
+            return
+
+        # Nobody listens anymore, pause until a listener is added
+        self._debounced_refresh.async_cancel()
+        if self._unsub_refresh:
             self._unsub_refresh()
             self._unsub_refresh = None
 
+    @property
+    def current_update_interval(self) -> Optional[timedelta]:
+        """Return the interval until the next scheduled refresh."""
+        if self.update_interval is None or self.max_update_interval is None:
+            return self.update_interval
+        factor: int = ADAPTIVE_BACKOFF_FACTOR ** self._backoff
+        return min(self.update_interval * factor, self.max_update_interval)
+
     @callback
     def _schedule_refresh(self) -> None:
         """Schedule a refresh."""
-        if self.update_interval is None:
+        interval = self.current_update_interval
+        if interval is None:
             return
 
         if self._unsub_refresh:
@@ -110,7 +137,7 @@ class DataUpdateCoordinator(Generic[T]):
         self._unsub_refresh = event.async_track_point_in_utc_time(
             self.hass,
             self._job,
-            utcnow().replace(microsecond=0) + self.update_interval,
+            utcnow().replace(microsecond=0) + interval,
         )
 
     async def _handle_refresh_interval(self, _now: datetime) -> None:
@@ -123,6 +150,7 @@ class DataUpdateCoordinator(Generic[T]):
 
         Refresh will wait a bit to see if it can batch them.
         """
+        self._backoff = 0
         await self._debounced_refresh.async_call()
 
     async def _async_update_data(self) -> Optional[T]:
@@ -139,6 +167,7 @@ class DataUpdateCoordinator(Generic[T]):
 
         self._debounced_refresh.async_cancel()
         start = monotonic()
+        previous_data = self.data
 
         try:
             self.data = await self._async_update_data()
@@ -180,6 +209,9 @@ class DataUpdateCoordinator(Generic[T]):
                 self.last_update_success = True
                 self.logger.info("Fetching %s data recovered", self.name)
 
+            if self.max_update_interval is not None:
+                self._async_adapt_interval(previous_data)
+
         finally:
             self.logger.debug(
                 "Finished fetching %s data in %.3f seconds",
@@ -192,6 +224,19 @@ class DataUpdateCoordinator(Generic[T]):
         for update_callback in self._listeners:
             update_callback()
 
+    @callback
+    def _async_adapt_interval(self, previous_data: Optional[T]) -> None:
+        """Back off while the data does not change."""
+        if self.data != previous_data:
+            self._backoff = 0
+        elif self.current_update_interval != self.max_update_interval:
+            self._backoff += 1
+            self.logger.debug(
+                "Data of %s did not change, next refresh in %s",
+                self.name,
+                self.current_update_interval,
+            )
+
     @callback
     def async_set_updated_data(self, data: T) -> None:
         """Manually update data, notify listeners and reset refresh interval."""
@@ -203,6 +248,7 @@ class DataUpdateCoordinator(Generic[T]):
 
         self.data = data
         self.last_update_success = True
+        self._backoff = 0
         self.logger.debug(
             "Manually updated %s data",
             self.name,
@@ -3,7 +3,7 @@ import argparse
 import asyncio
 import collections
 from contextlib import suppress
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 import logging
 from timeit import default_timer as timer
@@ -85,6 +85,40 @@ async def fire_events(hass):
     return timer() - start
 
 
+@benchmark
+async def fire_events_10k_listeners(hass):
+    """Fire 100 events to 10k listeners and 100k events to none."""
+    count = 0
+    event_name = "benchmark_event"
+    event = asyncio.Event()
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == 10 ** 6:
+            event.set()
+
+    for _ in range(10 ** 4):
+        hass.bus.async_listen(event_name, listener)
+
+    start = timer()
+
+    for _ in range(10 ** 5):
+        hass.bus.async_fire("benchmark_event_without_listeners")
+
+    print(f"Fired 100k events without listeners in {timer() - start:.3f}s")
+
+    for _ in range(100):
+        hass.bus.async_fire(event_name)
+
+    await event.wait()
+
+    return timer() - start
+
+
 @benchmark
 async def time_changed_helper(hass):
     """Run a million events through time changed helper."""
@@ -310,6 +344,23 @@ async def valid_entity_id(hass):
     return timer() - start
 
 
+@benchmark
+async def state_machine_set(hass):
+    """Write 100k states of which half only change the state."""
+    attributes = {"friendly_name": "Kitchen Lights", "brightness": 100}
+    hass.states.async_set_internal("light.kitchen", "on", attributes)
+
+    start = timer()
+    for i in range(10 ** 5):
+        hass.states.async_set_internal(
+            "light.kitchen", "on" if i % 2 else "off", dict(attributes)
+        )
+        hass.states.async_set_internal(
+            "light.kitchen", "on" if i % 2 else "off", dict(attributes)
+        )
+    return timer() - start
+
+
 @benchmark
 async def json_serialize_states(hass):
     """Serialize million states with websocket default encoder."""
@@ -323,6 +374,340 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def entity_permissions(hass):
+    """Check read access of a user with a large policy to 100k state changes.
+
+    Prints the time taken by applying the policy to each check as well.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.auth.permissions import PermissionLookup, PolicyPermissions
+    from homeassistant.helpers import device_registry, entity_registry
+
+    dev_reg = device_registry.DeviceRegistry(hass)
+    dev_reg.devices = collections.OrderedDict()
+    dev_reg.deleted_devices = collections.OrderedDict()
+    ent_reg = entity_registry.EntityRegistry(hass)
+    ent_reg.entities = collections.OrderedDict()
+    entity_ids = []
+    for idx in range(2000):
+        device = device_registry.DeviceEntry(
+            id=f"device-{idx // 10}", area_id=f"area-{idx // 100}"
+        )
+        dev_reg.devices[device.id] = device
+        entry = entity_registry.RegistryEntry(
+            entity_id=f"sensor.power_{idx}",
+            unique_id=str(idx),
+            platform="benchmark",
+            device_id=device.id,
+        )
+        ent_reg.entities[entry.entity_id] = entry
+        entity_ids.append(entry.entity_id)
+    dev_reg._rebuild_index()  # pylint: disable=protected-access
+    ent_reg._rebuild_index()  # pylint: disable=protected-access
+
+    policy = {
+        "entities": {
+            "entity_ids": {f"sensor.power_{idx}": True for idx in range(0, 2000, 7)},
+            "device_ids": {f"device-{idx}": True for idx in range(0, 200, 3)},
+            "area_ids": {f"area-{idx}": True for idx in range(0, 20, 4)},
+            "domains": {"light": True},
+        }
+    }
+    permissions = PolicyPermissions(policy, PermissionLookup(ent_reg, dev_reg))
+    # pylint: disable=protected-access
+    compiled = permissions._entity_func()
+    size = len(entity_ids)
+
+    start = timer()
+    for i in range(10 ** 5):
+        compiled(entity_ids[i % size], "read")
+    print(f"Applying the policy took {timer() - start}s")
+
+    start = timer()
+    for i in range(10 ** 5):
+        permissions.check_entity(entity_ids[i % size], "read")
+    return timer() - start
+
+
+@benchmark
+async def template_reload(hass):
+    """Create 100 times 500 templates of which 50 are different.
+
+    Simulates reloading automations. Prints the time taken without the
+    shared compiled template cache as well.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers import template
+
+    sources = [
+        f"{{{{ states('sensor.power_{idx}') | float * 2 }}}} W"
+        "{% if is_state('sun.sun', 'above_horizon') %} day{% endif %}"
+        for idx in range(50)
+    ]
+
+    def _reload(clear):
+        start = timer()
+        for _ in range(100):
+            if clear:
+                template._COMPILED_CODE.clear()  # pylint: disable=protected-access
+            templates = [
+                template.Template(sources[idx % 50], hass) for idx in range(500)
+            ]
+            for tpl in templates:
+                tpl.ensure_valid()
+            del templates
+        return timer() - start
+
+    print(f"Without the shared cache took {_reload(True)}s")
+    runtime = _reload(False)
+    print(template.compiled_code_cache_stats())
+    return runtime
+
+
+@benchmark
+async def recorder_orm_insert(hass):
+    """Write 100k state changes with the recorder ORM path."""
+    return await hass.async_add_executor_job(_recorder_insert, False)
+
+
+@benchmark
+async def recorder_bulk_insert(hass):
+    """Write 100k state changes with the recorder bulk path."""
+    return await hass.async_add_executor_job(_recorder_insert, True)
+
+
+def _recorder_insert(bulk):
+    """Write state changed events to an in-memory database."""
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from homeassistant.components.recorder.bulk import BulkWriter
+    from homeassistant.components.recorder.models import Base, Events, States
+    from homeassistant.components.recorder.state_attributes import (
+        StateAttributesManager,
+    )
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.expire_on_commit = False
+
+    count = 10 ** 5
+    commit_every = 1000
+    events = []
+    for idx in range(count):
+        entity_id = f"sensor.power_{idx % 100}"
+        events.append(
+            core.Event(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": entity_id,
+                    "new_state": core.State(
+                        entity_id, str(idx), {"unit_of_measurement": "W"}
+                    ),
+                },
+            )
+        )
+
+    start = timer()
+
+    if bulk:
+        state_attributes = StateAttributesManager()
+        writer = BulkWriter(state_attributes)
+        writer.load_ids(session)
+        for idx, event in enumerate(events, 1):
+            writer.add(event, session)
+            if idx % commit_every == 0:
+                writer.write(session)
+                session.commit()
+                state_attributes.commit()
+                writer.clear()
+    else:
+        old_states = {}
+        pending_expunge = []
+        for idx, event in enumerate(events, 1):
+            dbevent = Events.from_event(event, event_data="{}")
+            dbevent.created = event.time_fired
+            session.add(dbevent)
+            dbstate = States.from_event(event)
+            if dbstate.entity_id in old_states:
+                old_state = old_states.pop(dbstate.entity_id)
+                if old_state.state_id:
+                    dbstate.old_state_id = old_state.state_id
+                else:
+                    dbstate.old_state = old_state
+            dbstate.event = dbevent
+            dbstate.created = event.time_fired
+            session.add(dbstate)
+            old_states[dbstate.entity_id] = dbstate
+            pending_expunge.append(dbstate)
+            if idx % commit_every == 0:
+                session.flush()
+                for dbstate in pending_expunge:
+                    session.expunge(dbstate)
+                pending_expunge = []
+                session.commit()
+
+    runtime = timer() - start
+    print(f"Wrote {2 * count / runtime:.0f} rows/s")
+    session.close()
+    engine.dispose()
+    return runtime
+
+
+@benchmark
+async def history_states_at_time(hass):
+    """Look up the states of 1 to 1000 entities at a point in time."""
+    return await hass.async_add_executor_job(_history_states_at_time, hass)
+
+
+def _history_states_at_time(hass):
+    """Look up states in an in-memory database with 1000 entities."""
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import create_engine
+    from sqlalchemy.ext import baked
+    from sqlalchemy.orm import sessionmaker
+
+    from homeassistant.components import history
+    from homeassistant.components.recorder.models import Base, RecorderRuns, States
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    hass.data[history.HISTORY_BAKERY] = baked.bakery()
+
+    start = dt_util.utcnow()
+    run = RecorderRuns(start=start)
+    rows = []
+    for minute in range(600):
+        point = start + timedelta(minutes=minute)
+        for idx in range(1000):
+            rows.append(
+                {
+                    "entity_id": f"sensor.power_{idx}",
+                    "domain": "sensor",
+                    "state": str(minute),
+                    "attributes": "{}",
+                    "last_changed": point,
+                    "last_updated": point,
+                    "last_changed_ts": point.timestamp(),
+                    "last_updated_ts": point.timestamp(),
+                    "created": point,
+                }
+            )
+    session.execute(States.__table__.insert(), rows)
+    session.commit()
+
+    point_in_time = start + timedelta(minutes=500, seconds=30)
+    runtime = 0
+    for count in (1, 10, 100, 1000):
+        entity_ids = [f"sensor.power_{idx}" for idx in range(count)]
+        lookup_start = timer()
+        for _ in range(10):
+            # pylint: disable=protected-access
+            states = history._get_states_with_session(
+                hass, session, point_in_time, entity_ids, run
+            )
+        lookup_runtime = timer() - lookup_start
+        assert len(states) == count
+        print(f"{count} entities: {lookup_runtime / 10 * 1000:.2f}ms per lookup")
+        runtime += lookup_runtime
+
+    session.close()
+    engine.dispose()
+    return runtime
+
+
+@benchmark
+async def websocket_state_changes(hass):
+    """Send 1000 state changes of 2000 entities to a websocket client.
+
+    Prints the bytes and transport writes with and without permessage-deflate
+    and coalesced frames. State changes arrive in bursts of 10 per loop
+    iteration.
+    """
+    # pylint: disable=import-outside-toplevel
+    from types import SimpleNamespace
+
+    from aiohttp.http_websocket import WebSocketWriter
+
+    from homeassistant.components.websocket_api import const, http, messages
+
+    class CountingTransport(asyncio.Transport):
+        """Transport that counts the writes."""
+
+        def __init__(self):
+            """Initialize the transport."""
+            super().__init__()
+            self.writes = 0
+            self.bytes = 0
+
+        def write(self, data):
+            """Count a write."""
+            self.writes += 1
+            self.bytes += len(data)
+
+        def is_closing(self):
+            """Return if the transport is closing."""
+            return False
+
+    class Protocol:
+        """Protocol that never has to wait for the transport."""
+
+        async def _drain_helper(self):
+            """Drain the transport."""
+
+    for idx in range(2000):
+        hass.states.async_set(f"sensor.power_{idx}", "0", {"unit_of_measurement": "W"})
+
+    runtime = 0
+    value = 0
+    for compress in (0, 15):
+        for coalesce in (False, True):
+            transport = CountingTransport()
+            writer = WebSocketWriter(Protocol(), transport, compress=compress)
+            handler = http.WebSocketHandler(hass, None)
+            handler.wsock = SimpleNamespace(
+                closed=False,
+                send_str=lambda data, writer=writer: writer.send(data),
+            )
+            # pylint: disable=protected-access
+            handler._connection = SimpleNamespace(
+                supported_features={const.FEATURE_COALESCE_MESSAGES: int(coalesce)}
+            )
+
+            @core.callback
+            def forward(event, handler=handler):
+                """Forward a state change to the client."""
+                handler._send_message(messages.cached_event_message(1, event))
+
+            unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, forward)
+            writer_task = asyncio.create_task(handler._writer())
+
+            start = timer()
+            for idx in range(1000):
+                value += 1
+                hass.states.async_set(
+                    f"sensor.power_{idx * 2}", str(value), {"unit_of_measurement": "W"}
+                )
+                if idx % 10 == 9:
+                    await asyncio.sleep(0)
+            await hass.async_block_till_done()
+            handler._to_write.put_nowait(None)
+            await writer_task
+            runtime += timer() - start
+            unsub()
+
+            print(
+                f"compress={compress} coalesce={coalesce}: "
+                f"{transport.bytes} bytes in {transport.writes} writes"
+            )
+
+    return runtime
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -338,7 +723,7 @@ def _create_state_changed_event_from_old_new(
         [
             "event_type"
             "event_data"
-            "time_fired"
+            "time_fired_ts"
             "context_id"
             "context_user_id"
             "state"
@@ -353,7 +738,7 @@ def _create_state_changed_event_from_old_new(
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
     row.attributes = attributes_json
-    row.time_fired = event_time_fired
+    row.time_fired_ts = event_time_fired.timestamp()
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
     row.domain = entity_id and core.split_entity_id(entity_id)[0]
@@ -0,0 +1,182 @@
+"""Named executor pools that cap the jobs of each domain."""
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import os
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, NamedTuple, Tuple
+
+EXECUTOR_IO = "io"
+EXECUTOR_CPU = "cpu"
+EXECUTOR_POLLING = "polling"
+
+
+class PoolConfig(NamedTuple):
+    """Size of a pool and the number of jobs one domain may run in it at once."""
+
+    max_workers: int
+    domain_limit: int
+
+
+_CPU_COUNT = os.cpu_count() or 1
+
+POOLS: Dict[str, PoolConfig] = {
+    EXECUTOR_IO: PoolConfig(8, 8),
+    EXECUTOR_CPU: PoolConfig(_CPU_COUNT, _CPU_COUNT),
+    EXECUTOR_POLLING: PoolConfig(32, 4),
+}
+
+_Job = Tuple[asyncio.Future, Callable, Tuple[Any, ...], float]
+
+
+def integration_domain(module: str) -> str:
+    """Return the integration a module belongs to."""
+    parts = module.split(".")
+    if parts[0] == "homeassistant":
+        if len(parts) > 2 and parts[1] == "components":
+            return parts[2]
+        return "homeassistant"
+    if parts[0] == "custom_components" and len(parts) > 1:
+        return parts[1]
+    return parts[0]
+
+
+def target_domain(target: Callable) -> str:
+    """Return the integration a job target belongs to."""
+    while isinstance(target, functools.partial):
+        target = target.func
+    return integration_domain(
+        getattr(target, "__module__", None) or type(target).__module__
+    )
+
+
+class ExecutorPool:
+    """Thread pool that caps the number of jobs each domain runs at once.
+
+    Jobs over the cap wait in the event loop instead of holding a worker,
+    so one domain with slow jobs cannot occupy the whole pool.
+    """
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, name: str, config: PoolConfig
+    ) -> None:
+        """Initialize the pool."""
+        self.name = name
+        self.domain_limit = config.domain_limit
+        self._loop = loop
+        self._executor = ThreadPoolExecutor(
+            thread_name_prefix=f"SyncWorker-{name}", max_workers=config.max_workers
+        )
+        self._running: Dict[str, int] = {}
+        self._waiting: Dict[str, Deque[_Job]] = {}
+        self._lock = threading.Lock()
+        self.jobs = 0
+        self.queue_wait = 0.0
+        self.max_queue_wait = 0.0
+
+    def async_submit(self, domain: str, target: Callable, *args: Any) -> asyncio.Future:
+        """Run a target in the pool once the domain is below its cap."""
+        future = self._loop.create_future()
+        job = (future, target, args, time.monotonic())
+        if self._running.get(domain, 0) < self.domain_limit:
+            self._async_start(domain, job)
+        else:
+            self._waiting.setdefault(domain, deque()).append(job)
+        return future
+
+    def _async_start(self, domain: str, job: _Job) -> None:
+        """Start a job in a worker."""
+        future, target, args, queued = job
+        self._running[domain] = self._running.get(domain, 0) + 1
+        inner: asyncio.Future = self._loop.run_in_executor(  # type: ignore
+            self._executor, self._run, queued, target, args
+        )
+        inner.add_done_callback(lambda inner: self._async_done(domain, future, inner))
+
+    def _async_done(
+        self, domain: str, future: asyncio.Future, inner: asyncio.Future
+    ) -> None:
+        """Pass on the result of a job and start the next one of its domain."""
+        if not future.done():
+            if inner.cancelled():
+                future.cancel()
+            elif inner.exception() is not None:
+                future.set_exception(inner.exception())  # type: ignore
+            else:
+                future.set_result(inner.result())
+        elif not inner.cancelled():
+            # Retrieve the exception so it is not reported as never retrieved
+            inner.exception()
+
+        waiting = self._waiting.get(domain)
+        while waiting:
+            job = waiting.popleft()
+            if not job[0].cancelled():
+                self._running[domain] -= 1
+                self._async_start(domain, job)
+                return
+
+        self._waiting.pop(domain, None)
+        self._running[domain] -= 1
+        if not self._running[domain]:
+            del self._running[domain]
+
+    def _run(self, queued: float, target: Callable, args: Tuple[Any, ...]) -> Any:
+        """Run a job in a worker."""
+        wait = time.monotonic() - queued
+        with self._lock:
+            self.jobs += 1
+            self.queue_wait += wait
+            if wait > self.max_queue_wait:
+                self.max_queue_wait = wait
+        return target(*args)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return how long jobs waited and how many are running or waiting."""
+        return {
+            "jobs": self.jobs,
+            "queue_wait": round(self.queue_wait, 6),
+            "max_queue_wait": round(self.max_queue_wait, 6),
+            "running": dict(self._running),
+            "waiting": {domain: len(jobs) for domain, jobs in self._waiting.items()},
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the workers of the pool."""
+        self._executor.shutdown(wait=wait)
+
+
+class ExecutorPools:
+    """Named executor pools that are created when first used."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Initialize the pools."""
+        self._loop = loop
+        self._pools: Dict[str, ExecutorPool] = {}
+
+    def async_get(self, name: str) -> ExecutorPool:
+        """Return the pool with a name."""
+        pool = self._pools.get(name)
+        if pool is None:
+            config = POOLS.get(name)
+            if config is None:
+                raise ValueError(f"Unknown executor {name}")
+            pool = self._pools[name] = ExecutorPool(self._loop, name, config)
+        return pool
+
+    def async_submit(
+        self, name: str, domain: str, target: Callable, *args: Any
+    ) -> asyncio.Future:
+        """Run a target in a named pool."""
+        return self.async_get(name).async_submit(domain, target, *args)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the stats of the pools that are in use."""
+        return {name: pool.stats() for name, pool in self._pools.items()}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the pools."""
+        for pool in self._pools.values():
+            pool.shutdown(wait)
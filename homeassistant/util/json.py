@@ -1,16 +1,18 @@
 """JSON utility functions."""
 from collections import deque
+from datetime import datetime
 import json
 import logging
 import os
 import tempfile
 from typing import Any, Callable, Dict, List, Optional, Type, Union
 
-from homeassistant.core import Event, State
 from homeassistant.exceptions import HomeAssistantError
 
 _LOGGER = logging.getLogger(__name__)
 
+JSONDumps = Callable[[Any], str]
+
 
 class SerializationError(HomeAssistantError):
     """Error serializing the data to JSON."""
@@ -20,6 +22,45 @@ class WriteError(HomeAssistantError):
     """Error writing the data."""
 
 
+def json_encoder_default(obj: Any) -> Any:
+    """Convert Home Assistant objects.
+
+    Raises TypeError for objects that cannot be converted.
+    """
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, set):
+        return list(obj)
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize an object with the standard library."""
+    return json.dumps(obj, default=json_encoder_default, allow_nan=False)
+
+
+DEFAULT_JSON_BACKEND: JSONDumps = _json_dumps
+_json_backend: JSONDumps = DEFAULT_JSON_BACKEND
+
+
+def json_dumps(obj: Any) -> str:
+    """Serialize an object to JSON with the active backend."""
+    return _json_backend(obj)
+
+
+def set_json_backend(dumps: Optional[JSONDumps]) -> None:
+    """Set the function that serializes to JSON, None restores the default.
+
+    The function has to convert the objects json_encoder_default converts,
+    reject NaN and raise ValueError or TypeError for data it cannot
+    serialize. A faster library like orjson can be plugged in this way.
+    """
+    global _json_backend  # pylint: disable=global-statement
+    _json_backend = DEFAULT_JSON_BACKEND if dumps is None else dumps
+
+
 def load_json(
     filename: str, default: Union[List, Dict, None] = None
 ) -> Union[List, Dict]:
@@ -100,6 +141,9 @@ def find_paths_unserializable_data(
 
     This method is slow! Only use for error handling.
     """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.core import Event, State
+
     to_process = deque([(bad_data, "$")])
     invalid = {}
 
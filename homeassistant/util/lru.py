@@ -0,0 +1,54 @@
+"""A size bounded mapping that evicts the least recently used key."""
+from collections import OrderedDict
+from typing import Generic, Optional, TypeVar
+
+KT = TypeVar("KT")
+VT = TypeVar("VT")
+
+
+class LRU(Generic[KT, VT]):
+    """A mapping with a maximum size and hit/miss counters.
+
+    This class is not thread safe.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize the mapping."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[KT, VT]" = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of keys."""
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        """Return if a key is present without touching it."""
+        return key in self._data
+
+    def get(self, key: KT, default: Optional[VT] = None) -> Optional[VT]:
+        """Return the value for key and mark it as recently used."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key: KT, value: VT) -> None:
+        """Set a value and evict the least recently used key if needed."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: KT, default: Optional[VT] = None) -> Optional[VT]:
+        """Remove a key and return its value."""
+        return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        """Remove all keys."""
+        self._data.clear()
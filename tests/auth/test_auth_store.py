@@ -1,9 +1,11 @@
 """Tests for the auth store."""
 import asyncio
 
-from homeassistant.auth import auth_store
+from homeassistant.auth import auth_store, models
+from homeassistant.helpers.entity_registry import RegistryEntry
 
 from tests.async_mock import patch
+from tests.common import mock_device_registry, mock_registry
 
 
 async def test_loading_no_group_data_format(hass, hass_storage):
@@ -242,3 +244,35 @@ async def test_loading_race_condition(hass):
         mock_dev_registry.assert_called_once_with(hass)
         mock_load.assert_called_once_with()
         assert results[0] == results[1]
+
+
+async def test_registry_update_invalidates_entity_permissions(hass):
+    """Test entity permissions are checked again when a registry changes."""
+    entity_registry = mock_registry(
+        hass,
+        {
+            "light.kitchen": RegistryEntry(
+                entity_id="light.kitchen",
+                unique_id="1234",
+                platform="test_platform",
+                device_id="mock-dev-id",
+            )
+        },
+    )
+    mock_device_registry(hass)
+    store = auth_store.AuthStore(hass)
+    user = await store.async_create_user("Test User")
+    user.groups = [
+        models.Group(
+            name="Test Group",
+            policy={"entities": {"device_ids": {"mock-dev-id": True}}},
+        )
+    ]
+    user.invalidate_permission_cache()
+
+    assert user.permissions.check_entity("light.kitchen", "read") is True
+
+    entity_registry.async_remove("light.kitchen")
+    await hass.async_block_till_done()
+
+    assert user.permissions.check_entity("light.kitchen", "read") is False
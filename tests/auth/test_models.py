@@ -1,6 +1,8 @@
 """Tests for the auth models."""
 from homeassistant.auth import models, permissions
 
+from tests.async_mock import Mock, patch
+
 
 def test_owner_fetching_owner_permissions():
     """Test we fetch the owner permissions for an owner user."""
@@ -26,3 +28,26 @@ def test_permissions_merged():
     assert user.permissions.check_entity("switch.bla", "read") is True
     assert user.permissions.check_entity("light.kitchen", "read") is True
     assert user.permissions.check_entity("light.not_kitchen", "read") is False
+
+
+def test_permissions_entity_index():
+    """Test entity checks are cached until the entity index is invalidated."""
+    group = models.Group(
+        name="Test Group", policy={"entities": {"domains": {"switch": True}}}
+    )
+    user = models.User(name="Test User", perm_lookup=None, groups=[group])
+    perms = user.permissions
+
+    with patch.object(
+        perms, "_entity_func", return_value=Mock(return_value=True)
+    ) as mock_entity_func:
+        assert perms.check_entity("light.kitchen", "read") is True
+        assert perms.check_entity("light.kitchen", "read") is True
+        assert perms.check_entity("light.kitchen", "control") is True
+        assert mock_entity_func.return_value.call_count == 2
+
+        user.invalidate_entity_permission_cache()
+        assert perms.check_entity("light.kitchen", "read") is True
+        assert mock_entity_func.return_value.call_count == 3
+
+    assert user.permissions is perms
@@ -169,7 +169,7 @@ async def async_test_home_assistant(loop):
 
         return orig_async_add_job(target, *args)
 
-    def async_add_executor_job(target, *args):
+    def async_add_executor_job(target, *args, executor=None):
         """Add executor job."""
         check_target = target
         while isinstance(check_target, ft.partial):
@@ -180,7 +180,7 @@ async def async_test_home_assistant(loop):
             fut.set_result(target(*args))
             return fut
 
-        return orig_async_add_executor_job(target, *args)
+        return orig_async_add_executor_job(target, *args, executor=executor)
 
     def async_create_task(coroutine):
         """Create task."""
@@ -6,7 +6,8 @@ import json
 import unittest
 
 from homeassistant.components import history, recorder
-from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.models import Statistics, process_timestamp
+from homeassistant.components.recorder.util import session_scope
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.setup import async_setup_component, setup_component
@@ -113,6 +114,60 @@ class TestComponentHistory(unittest.TestCase):
 
         assert history.get_state(self.hass, time_before_recorder_ran, "demo.id") is None
 
+    def test_get_states_multiple_entities(self):
+        """Test getting the states of some entities at a point in time."""
+        self.test_setup()
+        start = dt_util.utcnow()
+        point = start + timedelta(seconds=10)
+
+        for i in range(20):
+            updated = start + timedelta(seconds=i)
+            for entity_id in ("test.first", "test.second", "test.other"):
+                mock_state_change_event(
+                    self.hass,
+                    ha.State(
+                        entity_id,
+                        f"State {i}",
+                        last_changed=updated,
+                        last_updated=updated,
+                    ),
+                )
+        wait_recording_done(self.hass)
+
+        states = history.get_states(
+            self.hass, point, ["test.first", "test.second", "test.missing"]
+        )
+        assert sorted((state.entity_id, state.state) for state in states) == [
+            ("test.first", "State 9"),
+            ("test.second", "State 9"),
+        ]
+
+    def test_get_states_multiple_entities_since_run_start(self):
+        """Test getting the states of some entities ignores older runs."""
+        self.test_setup()
+        start = dt_util.utcnow()
+        run = recorder.models.RecorderRuns(start=start + timedelta(seconds=5))
+
+        for i in range(10):
+            updated = start + timedelta(seconds=i)
+            mock_state_change_event(
+                self.hass,
+                ha.State(
+                    "test.first" if i < 5 else "test.second",
+                    f"State {i}",
+                    last_changed=updated,
+                    last_updated=updated,
+                ),
+            )
+        wait_recording_done(self.hass)
+
+        states = history.get_states(
+            self.hass, start + timedelta(seconds=10), ["test.first", "test.second"], run
+        )
+        assert [(state.entity_id, state.state) for state in states] == [
+            ("test.second", "State 9")
+        ]
+
     def test_state_changes_during_period(self):
         """Test state change during period."""
         self.test_setup()
@@ -1008,3 +1063,143 @@ async def test_entity_ids_limit_via_api_with_skip_initial_state(hass, hass_clien
     assert len(response_json) == 2
     assert response_json[0][0]["entity_id"] == "light.kitchen"
     assert response_json[1][0]["entity_id"] == "light.cow"
+
+
+async def test_fetch_period_api_with_statistics(hass, hass_client):
+    """Test numeric sensors are served from statistics when requested."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    hass.states.async_set("sensor.power", "12", {"unit_of_measurement": "W"})
+    hass.states.async_set("light.kitchen", "on")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    start = dt_util.utcnow() - timedelta(hours=3)
+    hour = start.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
+    def _add_statistics():
+        with session_scope(hass=hass) as session:
+            for idx, mean in enumerate((10.0, 11.0)):
+                session.add(
+                    Statistics(
+                        entity_id="sensor.power",
+                        start=hour + timedelta(hours=idx),
+                        mean=mean,
+                        min=mean - 1,
+                        max=mean + 1,
+                        last=mean,
+                    )
+                )
+
+    await hass.async_add_executor_job(_add_statistics)
+
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={"statistics_period": "hour"},
+    )
+    assert response.status == 200
+    response_json = await response.json()
+    by_entity = {states[0]["entity_id"]: states for states in response_json}
+    assert len(by_entity["light.kitchen"]) == 1
+    power = by_entity["sensor.power"]
+    assert [state["state"] for state in power] == ["10.0", "11.0"]
+    assert power[0]["attributes"] == {
+        "unit_of_measurement": "W",
+        "min": 9.0,
+        "max": 11.0,
+        "last": 10.0,
+    }
+    assert power[1]["last_changed"] == (hour + timedelta(hours=1)).isoformat()
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={"statistics_period": "day"},
+    )
+    assert response.status == 400
+
+
+async def test_fetch_period_api_stream(hass, hass_client):
+    """Test streaming the history returns the same states."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    for state in ("on", "off", "on"):
+        hass.states.async_set("light.kitchen", state)
+        hass.states.async_set("light.cow", state, {"brightness": 5})
+        await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    response = await client.get(f"/api/history/period/{start.isoformat()}")
+    assert response.status == 200
+    expected = await response.json()
+
+    with patch.object(history, "STREAM_BATCH_SIZE", 2):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}", params={"stream": ""}
+        )
+    assert response.status == 200
+    assert response.headers["Transfer-Encoding"] == "chunked"
+    streamed = await response.json()
+
+    assert len(streamed) == 2
+    assert sorted(streamed, key=lambda states: states[0]["entity_id"]) == sorted(
+        expected, key=lambda states: states[0]["entity_id"]
+    )
+
+    response = await client.get(
+        f"/api/history/period/{dt_util.utcnow().isoformat()}",
+        params={"stream": "", "filter_entity_id": "light.missing"},
+    )
+    assert response.status == 200
+    assert await response.json() == []
+
+
+async def test_fetch_period_api_compact_response(hass, hass_client):
+    """Test the compact history format."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    hass.states.async_set("light.kitchen", "on", {"brightness": 1})
+    hass.states.async_set("climate.living", "heat", {"current_temperature": 20})
+    await hass.async_block_till_done()
+    start = dt_util.utcnow()
+    for brightness in (2, 3):
+        hass.states.async_set("light.kitchen", "on", {"brightness": brightness})
+    hass.states.async_set("light.kitchen", "off", {"brightness": 0})
+    hass.states.async_set("climate.living", "heat", {"current_temperature": 21})
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    for params in ({}, {"stream": ""}):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}",
+            params={"minimal_response": "compact", **params},
+        )
+        assert response.status == 200
+        by_entity = {entity["entity_id"]: entity for entity in await response.json()}
+
+        kitchen = by_entity["light.kitchen"]
+        assert kitchen["state"] == ["on", "off"]
+        assert kitchen["last_changed"][0] == start.timestamp()
+        assert kitchen["attributes"] == {"brightness": 1}
+        assert kitchen["last_attributes"] == {"brightness": 0}
+        assert "point_attributes" not in kitchen
+
+        living = by_entity["climate.living"]
+        assert living["state"] == ["heat", "heat"]
+        assert "last_attributes" in living
+        assert living["point_attributes"] == [
+            {"current_temperature": 20},
+            {"current_temperature": 21},
+        ]
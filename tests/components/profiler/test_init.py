@@ -6,8 +6,10 @@ from homeassistant import setup
 from homeassistant.components.profiler import (
     CONF_SCAN_INTERVAL,
     CONF_SECONDS,
+    CONF_TOP,
     CONF_TYPE,
     SERVICE_DUMP_LOG_OBJECTS,
+    SERVICE_JOBS,
     SERVICE_MEMORY,
     SERVICE_START,
     SERVICE_START_LOG_OBJECTS,
@@ -147,3 +149,38 @@ async def test_dump_log_object(hass, caplog):
 
     assert await hass.config_entries.async_unload(entry.entry_id)
     await hass.async_block_till_done()
+
+
+async def test_job_profile(hass, hass_ws_client, hass_admin_user, caplog):
+    """Test the jobs that took the most time are dumped and returned."""
+
+    await setup.async_setup_component(hass, "persistent_notification", {})
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.services.has_service(DOMAIN, SERVICE_JOBS)
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_JOBS, {CONF_SECONDS: 0.000001, CONF_TOP: 5}
+    )
+    await hass.async_block_till_done()
+
+    assert "Jobs that took the most time" in caplog.text
+    assert hass.job_profiler is None
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 5, "type": "profiler/jobs", CONF_SECONDS: 0.000001})
+    response = await client.receive_json()
+    assert response["success"]
+    assert set(response["result"]) == {"duration", "jobs", "domains"}
+
+    hass_admin_user.groups = []
+    await client.send_json({"id": 6, "type": "profiler/jobs", CONF_SECONDS: 0.000001})
+    response = await client.receive_json()
+    assert not response["success"]
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
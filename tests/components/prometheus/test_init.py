@@ -273,7 +273,14 @@ async def _setup(hass, filter_config):
     config = {prometheus.DOMAIN: {"filter": filter_config}}
     assert await async_setup_component(hass, prometheus.DOMAIN, config)
     await hass.async_block_till_done()
-    return hass.bus.listen.call_args_list[0][0][1]
+    _, handler_method, event_filter = hass.bus.listen.call_args_list[0][0]
+
+    def handle_event(event):
+        """Handle the event if it passes the event filter."""
+        if event_filter(event):
+            handler_method(event)
+
+    return handle_event
 
 
 @pytest.mark.usefixtures("mock_bus")
@@ -1,12 +1,9 @@
 """Common test utils for working with recorder."""
 
-from datetime import timedelta
-
 from homeassistant.components import recorder
+from homeassistant.core import callback
 from homeassistant.util import dt as dt_util
 
-from tests.common import fire_time_changed
-
 
 def wait_recording_done(hass):
     """Block till recording is done."""
@@ -18,6 +15,21 @@ def wait_recording_done(hass):
 
 def trigger_db_commit(hass):
     """Force the recorder to commit."""
-    for _ in range(recorder.DEFAULT_COMMIT_INTERVAL):
-        # We only commit on time change
-        fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    hass.add_job(async_trigger_db_commit, hass)
+
+
+async def async_wait_recording_done(hass):
+    """Block till recording is done."""
+    async_trigger_db_commit(hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    await hass.async_block_till_done()
+
+
+@callback
+def async_trigger_db_commit(hass):
+    """Force the recorder to commit."""
+    # Queue the tick behind the events that are still on their way to the recorder
+    hass.loop.call_soon(
+        hass.data[recorder.DATA_INSTANCE].queue.put, recorder.TickTask(dt_util.utcnow())
+    )
@@ -0,0 +1,117 @@
+"""The tests for the recorder queue."""
+from homeassistant.components.recorder.event_queue import (
+    OVERFLOW_COALESCE,
+    OVERFLOW_DROP,
+    RecorderQueue,
+)
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, State
+
+
+def _state_event(entity_id, state):
+    """Create a state changed event."""
+    return Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": entity_id, "new_state": State(entity_id, state)},
+    )
+
+
+def _drain(queue):
+    """Return all queued items."""
+    items = []
+    while queue.qsize():
+        items.append(queue.get())
+    return items
+
+
+def test_unbounded_queue():
+    """Test the queue keeps every event without a maximum size."""
+    queue = RecorderQueue()
+    events = [Event("test_event") for _ in range(100)]
+    for event in events:
+        queue.put(event)
+
+    assert queue.qsize() == 100
+    assert queue.max_depth == 100
+    assert _drain(queue) == events
+    assert queue.dropped == 0
+
+
+def test_drop_oldest_non_state_event(caplog):
+    """Test the drop policy drops the oldest events that are not state changes."""
+    queue = RecorderQueue(3, OVERFLOW_DROP)
+    state_1 = _state_event("light.kitchen", "on")
+    event_1 = Event("test_event_1")
+    event_2 = Event("test_event_2")
+    event_3 = Event("test_event_3")
+
+    queue.put(state_1)
+    queue.put(event_1)
+    queue.put(event_2)
+    queue.put(event_3)
+
+    assert "reached the maximum size of 3" in caplog.text
+    assert queue.qsize() == 3
+    assert queue.dropped == 1
+    assert _drain(queue) == [state_1, event_2, event_3]
+
+
+def test_drop_incoming_when_only_state_changes():
+    """Test the incoming event is dropped when nothing else can be dropped."""
+    queue = RecorderQueue(2, OVERFLOW_DROP)
+    state_1 = _state_event("light.kitchen", "on")
+    state_2 = _state_event("light.kitchen", "off")
+
+    queue.put(state_1)
+    queue.put(state_2)
+    queue.put(_state_event("light.kitchen", "on"))
+
+    assert queue.dropped == 1
+    assert _drain(queue) == [state_1, state_2]
+
+
+def test_coalesce_state_changes():
+    """Test the coalesce policy keeps the latest state for queued entities."""
+    queue = RecorderQueue(2, OVERFLOW_COALESCE)
+    kitchen_1 = _state_event("light.kitchen", "on")
+    hallway = _state_event("light.hallway", "on")
+    kitchen_2 = _state_event("light.kitchen", "off")
+    kitchen_3 = _state_event("light.kitchen", "on")
+
+    queue.put(kitchen_1)
+    queue.put(hallway)
+    queue.put(kitchen_2)
+    queue.put(kitchen_3)
+
+    assert queue.coalesced == 2
+    assert queue.dropped == 0
+    assert _drain(queue) == [kitchen_3, hallway]
+
+
+def test_control_items_are_never_dropped():
+    """Test control items do not count against the maximum size."""
+    queue = RecorderQueue(1, OVERFLOW_DROP)
+    event_1 = Event("test_event_1")
+    event_2 = Event("test_event_2")
+    marker = object()
+
+    queue.put(event_1)
+    queue.put(marker)
+    queue.put(event_2)
+
+    assert queue.qsize() == 1
+    assert queue.get() is marker
+    assert queue.get() is event_2
+    assert queue.qsize() == 0
+
+
+def test_dropped_slots_are_compacted():
+    """Test dropped events do not keep growing the queue."""
+    queue = RecorderQueue(10, OVERFLOW_DROP)
+    for _ in range(5000):
+        queue.put(Event("test_event"))
+
+    assert queue.qsize() == 10
+    assert queue.dropped == 4990
+    assert len(queue._slots) < 1010  # pylint: disable=protected-access
+    assert len(_drain(queue)) == 10
@@ -1,7 +1,9 @@
 """The tests for the Recorder component."""
 # pylint: disable=protected-access
 from datetime import datetime, timedelta
+import json
 
+import pytest
 from sqlalchemy.exc import OperationalError
 
 from homeassistant.components.recorder import (
@@ -12,15 +14,21 @@ from homeassistant.components.recorder import (
     run_information_from_instance,
     run_information_with_session,
 )
+from homeassistant.components.recorder.bulk import BulkWriter
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import MATCH_ALL, STATE_LOCKED, STATE_UNLOCKED
 from homeassistant.core import Context, callback
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt as dt_util
 
-from .common import wait_recording_done
+from .common import async_wait_recording_done, wait_recording_done
 
 from tests.async_mock import patch
 from tests.common import async_fire_time_changed, get_test_home_assistant
@@ -319,6 +327,11 @@ def test_recorder_setup_failure():
             auto_purge=True,
             keep_days=7,
             commit_interval=1,
+            bulk_insert=False,
+            max_queue_size=0,
+            overflow_policy="drop",
+            statistics_tables=[],
+            read_pool_size=0,
             uri="sqlite://",
             db_max_retries=10,
             db_retry_wait=3,
@@ -403,6 +416,137 @@ def test_saving_sets_old_state(hass_recorder):
         assert states[3].old_state_id == states[1].state_id
 
 
+def test_saving_sets_old_state_bulk_insert(hass_recorder):
+    """Test saving sets old state with the bulk write path."""
+    hass = hass_recorder({"bulk_insert": True})
+
+    hass.states.set("test.one", "on", {})
+    hass.states.set("test.two", "on", {})
+    wait_recording_done(hass)
+    hass.states.set("test.one", "off", {})
+    hass.states.set("test.two", "off", {})
+    hass.states.remove("test.one")
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 5
+
+        assert [state.entity_id for state in states] == [
+            "test.one",
+            "test.two",
+            "test.one",
+            "test.two",
+            "test.one",
+        ]
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id is None
+        assert states[2].old_state_id == states[0].state_id
+        assert states[3].old_state_id == states[1].state_id
+        assert states[4].old_state_id == states[2].state_id
+        assert states[4].state is None
+
+        for state in states:
+            assert session.query(Events).get(state.event_id) is not None
+
+        native = states[2].to_native()
+        assert native.state == "off"
+        assert native.attributes == {}
+
+
+def test_saving_event_bulk_insert(hass_recorder, caplog):
+    """Test saving events with the bulk write path."""
+    hass = hass_recorder({"bulk_insert": True})
+
+    hass.bus.fire("EVENT_TEST", {"test_attr": 5}, context=Context(id="abc"))
+    hass.bus.fire("EVENT_TEST", {"fail": CannotSerializeMe()})
+    hass.states.set("test.one", "on", {"fail": CannotSerializeMe()})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        db_events = list(session.query(Events).filter_by(event_type="EVENT_TEST"))
+        assert len(db_events) == 1
+        event = db_events[0].to_native()
+        assert event.data == {"test_attr": 5}
+        assert event.context.id == "abc"
+        assert session.query(States).count() == 0
+
+    assert "Event is not JSON serializable" in caplog.text
+    assert "State is not JSON serializable" in caplog.text
+
+
+def test_bulk_insert_recovers_from_rejected_rows(hass_recorder):
+    """Test rows the database rejects are dropped so later rows are saved."""
+    hass = hass_recorder({"bulk_insert": True})
+    write = BulkWriter.write
+
+    def _write(writer, session):
+        if any(row["event_type"] == "EVENT_BAD" for row in writer._event_rows):
+            raise ValueError("rejected")
+        write(writer, session)
+
+    with patch.object(BulkWriter, "write", _write):
+        hass.bus.fire("EVENT_BAD")
+        wait_recording_done(hass)
+        hass.bus.fire("EVENT_GOOD")
+        wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(Events).filter_by(event_type="EVENT_BAD").count() == 0
+        assert session.query(Events).filter_by(event_type="EVENT_GOOD").count() == 1
+
+
+@pytest.mark.parametrize("bulk_insert", [False, True])
+def test_saving_state_shares_attributes(hass_recorder, bulk_insert):
+    """Test states with the same attributes share one attributes row."""
+    hass = hass_recorder({"bulk_insert": bulk_insert})
+
+    hass.states.set("test.one", "on", {"color": "red"})
+    hass.states.set("test.two", "on", {"color": "red"})
+    wait_recording_done(hass)
+    hass.states.set("test.one", "off", {"color": "red"})
+    hass.states.set("test.two", "off", {"color": "blue"})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        attributes = list(session.query(StateAttributes))
+        assert [row.shared_attrs for row in attributes] == [
+            '{"color": "red"}',
+            '{"color": "blue"}',
+        ]
+
+        states = list(session.query(States))
+        assert len(states) == 4
+        assert all(state.attributes is None for state in states)
+        assert [state.attributes_id for state in states] == [
+            attributes[0].attributes_id,
+            attributes[0].attributes_id,
+            attributes[0].attributes_id,
+            attributes[1].attributes_id,
+        ]
+        assert states[3].to_native().attributes == {"color": "blue"}
+
+
+def test_unchanged_attributes_are_not_serialized_again(hass_recorder):
+    """Test attributes are only serialized when they change."""
+    hass = hass_recorder()
+
+    hass.states.set("test.one", "on", {"color": "red"})
+    wait_recording_done(hass)
+
+    with patch(
+        "homeassistant.components.recorder.state_attributes.json", wraps=json
+    ) as mock_json:
+        hass.states.set("test.one", "off", {"color": "red"})
+        wait_recording_done(hass)
+
+    assert not mock_json.dumps.mock_calls
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 1
+        assert session.query(States).count() == 2
+
+
 def test_saving_state_with_serializable_data(hass_recorder, caplog):
     """Test saving data that cannot be serialized does not crash."""
     hass = hass_recorder()
@@ -459,3 +603,29 @@ def test_run_information(hass_recorder):
 
 class CannotSerializeMe:
     """A class that the JSONEncoder cannot serialize."""
+
+
+async def test_sqlite_read_pool(hass, tmpdir):
+    """Test history readers use the read only connections on sqlite."""
+    db_url = f"sqlite:///{tmpdir}/home-assistant_v2.db"
+    assert await async_setup_component(hass, DOMAIN, {DOMAIN: {"db_url": db_url}})
+    await hass.async_block_till_done()
+    instance = hass.data[DATA_INSTANCE]
+
+    hass.states.async_set("test.one", "on")
+    await async_wait_recording_done(hass)
+
+    def _read():
+        with session_scope(hass=hass, read_only=True) as session:
+            assert session.bind is instance.read_engine
+            assert session.execute("PRAGMA query_only").scalar() == 1
+            assert session.execute("PRAGMA cache_size").scalar() == -32768
+            assert session.query(States).count() == 1
+            with pytest.raises(OperationalError):
+                session.execute("DELETE FROM states")
+
+        with session_scope(hass=hass) as session:
+            assert session.bind is instance.engine
+            assert session.execute("PRAGMA synchronous").scalar() == 1
+
+    await hass.async_add_executor_job(_read)
@@ -78,3 +78,23 @@ def test_forgiving_add_index():
     engine = create_engine("sqlite://", poolclass=StaticPool)
     models.Base.metadata.create_all(engine)
     migration._create_index(engine, "states", "ix_states_context_id")
+
+
+def test_backfill_timestamps():
+    """Test the timestamp columns of existing rows are filled."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    engine.execute(
+        "CREATE TABLE states (last_changed DATETIME, last_updated DATETIME, "
+        "last_changed_ts FLOAT, last_updated_ts FLOAT)"
+    )
+    engine.execute(
+        "INSERT INTO states (last_changed, last_updated) VALUES "
+        "('2020-11-01 10:00:00.000000', '2020-11-01 10:30:00.250000'), "
+        "('2020-11-01 11:00:00', '2020-11-01 11:00:00')"
+    )
+
+    migration._backfill_timestamps(engine, "states", ["last_changed", "last_updated"])
+
+    assert list(
+        engine.execute("SELECT last_changed_ts, last_updated_ts FROM states")
+    ) == [(1604224800.0, 1604226600.25), (1604228400.0, 1604228400.0)]
@@ -13,6 +13,7 @@ from homeassistant.components.recorder.models import (
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
+    timestamp_to_utc_isoformat,
 )
 from homeassistant.const import EVENT_STATE_CHANGED
 import homeassistant.core as ha
@@ -58,6 +59,8 @@ def test_from_event_to_delete_state():
     assert db_state.state == ""
     assert db_state.last_changed == event.time_fired
     assert db_state.last_updated == event.time_fired
+    assert db_state.last_changed_ts == event.time_fired.timestamp()
+    assert db_state.last_updated_ts == event.time_fired.timestamp()
 
 
 def test_entity_ids():
@@ -205,6 +208,14 @@ async def test_process_timestamp_to_utc_isoformat():
     assert process_timestamp_to_utc_isoformat(None) is None
 
 
+def test_timestamp_to_utc_isoformat():
+    """Test formatting seconds since the epoch as UTC isoformat."""
+    when = datetime(2016, 7, 9, 11, 0, 0, 123456, tzinfo=dt.UTC)
+
+    assert timestamp_to_utc_isoformat(when.timestamp()) == when.isoformat()
+    assert timestamp_to_utc_isoformat(None) is None
+
+
 async def test_event_to_db_model():
     """Test we can round trip Event conversion."""
     event = ha.Event(
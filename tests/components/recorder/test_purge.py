@@ -1,17 +1,27 @@
 """Test data purging."""
 from datetime import datetime, timedelta
 import json
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, event
 
 from homeassistant.components import recorder
+from homeassistant.components.recorder import purge
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.purge import purge_old_data
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.util import dt as dt_util
 
 from .common import wait_recording_done
 
-from tests.async_mock import patch
+from tests.async_mock import Mock, patch
 
 
 def test_purge_old_states(hass, hass_recorder):
@@ -62,6 +72,40 @@ def test_purge_old_events(hass, hass_recorder):
         assert events.count() == 2
 
 
+def test_purge_unused_state_attributes(hass, hass_recorder):
+    """Test purging states deletes the attributes no state uses anymore."""
+    hass = hass_recorder()
+    hass.states.set("test.one", "on", {"old": True})
+    hass.states.set("test.two", "on", {"old": True})
+    hass.states.set("test.three", "on", {"kept": True})
+    wait_recording_done(hass)
+
+    eleven_days_ago = dt_util.utcnow() - timedelta(days=11)
+    with session_scope(hass=hass) as session:
+        session.query(States).update(
+            {States.last_updated: eleven_days_ago}, synchronize_session=False
+        )
+        session.query(States).filter(States.entity_id == "test.three").update(
+            {States.last_updated: dt_util.utcnow()}, synchronize_session=False
+        )
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 2
+        while not purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False):
+            pass
+        assert [
+            attributes.shared_attrs for attributes in session.query(StateAttributes)
+        ] == ['{"kept": true}']
+
+    # The purged attributes are written again when used again
+    hass.states.set("test.one", "off", {"old": True})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        state = session.query(States).filter(States.entity_id == "test.one").one()
+        assert state.to_native().attributes == {"old": True}
+
+
 def test_purge_old_recorder_runs(hass, hass_recorder):
     """Test deleting old recorder runs keeps current run."""
     hass = hass_recorder()
@@ -144,6 +188,37 @@ def test_purge_method(hass, hass_recorder):
             )
 
 
+@pytest.mark.parametrize("bulk_insert", [False, True])
+def test_purge_keeps_attributes_of_pending_states(hass_recorder, bulk_insert):
+    """Test purging keeps shared attributes used by states not committed yet."""
+    hass = hass_recorder({"commit_interval": 30, "bulk_insert": bulk_insert})
+    instance = hass.data[DATA_INSTANCE]
+    attributes = {"test_attr": 5}
+
+    hass.states.set("test.old", "on", attributes)
+    wait_recording_done(hass)
+    eleven_days_ago = dt_util.utcnow() - timedelta(days=11)
+    with session_scope(hass=hass) as session:
+        session.query(States).update(
+            {
+                States.last_updated: eleven_days_ago,
+                States.last_updated_ts: eleven_days_ago.timestamp(),
+            }
+        )
+
+    # The new state reuses the cached attributes id of the old state
+    hass.states.set("test.new", "on", attributes)
+    hass.block_till_done()
+    instance.queue.put(recorder.PurgeTask(4, False))
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert [state.entity_id for state in states] == ["test.new"]
+        assert session.query(StateAttributes).get(states[0].attributes_id)
+        assert states[0].to_native().attributes == attributes
+
+
 def _add_test_states(hass):
     """Add multiple states to the db for testing."""
     now = datetime.now()
@@ -241,3 +316,62 @@ def _add_test_recorder_runs(hass):
                     end=timestamp + timedelta(days=1),
                 )
             )
+
+
+def test_purge_pauses_when_time_budget_is_used(hass, hass_recorder):
+    """Test purge deletes in small batches and resumes where it stopped."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    _add_test_states(hass)
+
+    with patch("homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 1), patch(
+        "homeassistant.components.recorder.purge.PURGE_TIME_BUDGET", 0
+    ):
+        assert not purge_old_data(instance, 4, repack=False)
+        assert instance.purge_progress.deleted_states == 1
+        assert instance.purge_progress.batches == 1
+
+        with session_scope(hass=hass) as session:
+            assert session.query(States).count() == 5
+
+        batches = 1
+        while not purge_old_data(instance, 4, repack=False):
+            batches += 1
+
+    assert batches >= 4
+    assert instance.purge_progress is None
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+
+
+def test_purge_repack_uses_incremental_vacuum(tmpdir):
+    """Test repacking a sqlite database switches it to incremental vacuum."""
+    db_path = tmpdir.join("repack.db")
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.execute("CREATE TABLE data (value TEXT)")
+        conn.executemany("INSERT INTO data VALUES (?)", [("x" * 1000,)] * 500)
+    conn.close()
+    engine = create_engine(f"sqlite:///{db_path}")
+    instance = Mock(engine=engine)
+
+    def _delete_and_count_free_pages():
+        engine.execute("DELETE FROM data")
+        assert engine.execute("PRAGMA freelist_count").scalar() > 0
+        purge._repack(instance)  # pylint: disable=protected-access
+        return engine.execute("PRAGMA freelist_count").scalar()
+
+    assert engine.execute("PRAGMA auto_vacuum").scalar() == 0
+    assert _delete_and_count_free_pages() == 0
+    assert engine.execute("PRAGMA auto_vacuum").scalar() == 2
+
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    engine.execute("INSERT INTO data VALUES (?)", [("x" * 1000,)] * 500)
+    assert _delete_and_count_free_pages() == 0
+    assert "VACUUM" not in statements
+    engine.dispose()
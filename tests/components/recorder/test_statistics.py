@@ -0,0 +1,108 @@
+"""The tests for the recorder statistics."""
+from datetime import datetime, timedelta
+
+from homeassistant.components.recorder.models import Statistics, StatisticsShortTerm
+from homeassistant.components.recorder.statistics import (
+    StatisticsCompiler,
+    numeric_state,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import State
+from homeassistant.util import dt as dt_util
+
+from .common import wait_recording_done
+
+from tests.async_mock import patch
+from tests.common import fire_time_changed
+
+START = datetime(2020, 11, 1, 10, 0, 0, tzinfo=dt_util.UTC)
+
+
+def test_numeric_state():
+    """Test only finite numeric sensor states have statistics."""
+    assert numeric_state(State("sensor.power", "12.5")) == 12.5
+    assert numeric_state(State("sensor.power", "unavailable")) is None
+    assert numeric_state(State("sensor.power", "nan")) is None
+    assert numeric_state(State("light.kitchen", "5")) is None
+    assert numeric_state(None) is None
+
+
+def test_compile_time_weighted_period():
+    """Test the mean is weighted by how long each value was held."""
+    compiler = StatisticsCompiler(Statistics)
+    compiler.state_changed("sensor.power", State("sensor.power", "10"), START)
+    compiler.state_changed(
+        "sensor.power",
+        State("sensor.power", "40"),
+        START + timedelta(minutes=45),
+    )
+
+    assert compiler.compile(START + timedelta(minutes=59)) == []
+
+    rows = compiler.compile(START + timedelta(hours=1))
+    assert rows == [
+        {
+            "entity_id": "sensor.power",
+            "start": START,
+            "mean": 17.5,
+            "min": 10,
+            "max": 40,
+            "last": 40,
+        }
+    ]
+
+
+def test_compile_carries_value_into_next_period():
+    """Test entities that did not change get a row for every period."""
+    compiler = StatisticsCompiler(StatisticsShortTerm)
+    compiler.state_changed(
+        "sensor.power", State("sensor.power", "5"), START + timedelta(minutes=2)
+    )
+
+    rows = compiler.compile(START + timedelta(minutes=15))
+    assert [(row["start"], row["mean"]) for row in rows] == [
+        (START, 5),
+        (START + timedelta(minutes=5), 5),
+        (START + timedelta(minutes=10), 5),
+    ]
+
+
+def test_compile_ignores_unavailable_time():
+    """Test time without a numeric value does not count toward the mean."""
+    compiler = StatisticsCompiler(Statistics)
+    compiler.state_changed("sensor.power", State("sensor.power", "10"), START)
+    compiler.state_changed(
+        "sensor.power",
+        State("sensor.power", "unavailable"),
+        START + timedelta(minutes=30),
+    )
+
+    rows = compiler.compile(START + timedelta(hours=3))
+    assert len(rows) == 1
+    assert rows[0]["mean"] == 10
+    assert rows[0]["last"] == 10
+
+    # The entity is forgotten once it has no value for a whole period
+    assert compiler.compile(START + timedelta(hours=4)) == []
+
+
+def test_recorder_writes_statistics(hass_recorder):
+    """Test the recorder writes hourly statistics of numeric sensors."""
+    hass = hass_recorder()
+
+    hass.states.set("sensor.power", "10", {"unit_of_measurement": "W"})
+    hass.states.set("light.kitchen", "on")
+    wait_recording_done(hass)
+
+    later = dt_util.utcnow() + timedelta(hours=1)
+    with patch("homeassistant.core.dt_util.utcnow", return_value=later):
+        fire_time_changed(hass, later)
+        wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        rows = list(session.query(Statistics))
+        assert len(rows) == 1
+        assert rows[0].entity_id == "sensor.power"
+        assert rows[0].mean == 10
+        assert rows[0].last == 10
+        assert session.query(StatisticsShortTerm).count() == 0
@@ -0,0 +1,43 @@
+"""The tests for the recorder websocket API."""
+from homeassistant.components.recorder.const import DATA_INSTANCE
+
+from .common import async_wait_recording_done
+
+from tests.common import async_init_recorder_component
+
+
+async def test_recorder_info(hass, hass_ws_client):
+    """Test getting recorder queue and commit statistics."""
+    await async_init_recorder_component(hass, {"max_queue_size": 1000})
+    hass.states.async_set("test.one", "on")
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 5, "type": "recorder/info"})
+    response = await client.receive_json()
+
+    assert response["success"]
+    result = response["result"]
+    assert result["backlog"] == 0
+    assert result["max_backlog"] >= 1
+    assert result["max_queue_size"] == 1000
+    assert result["overflow_policy"] == "drop"
+    assert result["dropped_events"] == 0
+    assert result["coalesced_events"] == 0
+    assert result["commit_latency"] is not None
+    assert result["max_commit_latency"] >= result["commit_latency"]
+    assert result["purge_progress"] is None
+    assert hass.data[DATA_INSTANCE].backlog == 0
+
+
+async def test_recorder_info_requires_admin(hass, hass_ws_client, hass_admin_user):
+    """Test the recorder info command is admin only."""
+    await async_init_recorder_component(hass)
+    hass_admin_user.groups = []
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 5, "type": "recorder/info"})
+    response = await client.receive_json()
+
+    assert not response["success"]
+    assert response["error"]["code"] == "unauthorized"
@@ -394,6 +394,97 @@ async def test_subscribe_unsubscribe_events_state_changed(
     assert msg["event"]["data"]["entity_id"] == "light.permitted"
 
 
+async def test_subscribe_entities(hass, websocket_client):
+    """Test subscribe entities sends the states and then what changed."""
+    hass.states.async_set("light.permitted", "off", {"color": "red"})
+    state = hass.states.get("light.permitted")
+
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "a": {
+            "light.permitted": {
+                "s": "off",
+                "a": {"color": "red"},
+                "c": state.context.id,
+                "lc": state.last_changed.timestamp(),
+            }
+        }
+    }
+
+    hass.states.async_set("light.permitted", "on", {"brightness": 100})
+    state = hass.states.get("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "s": "on",
+                    "a": {"brightness": 100},
+                    "c": state.context.id,
+                    "lc": state.last_changed.timestamp(),
+                },
+                "-": {"a": ["color"]},
+            }
+        }
+    }
+
+    hass.states.async_remove("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["event"] == {"r": ["light.permitted"]}
+
+
+async def test_subscribe_entities_filtered(hass, websocket_client, hass_admin_user):
+    """Test subscribe entities only sends entities that are asked and readable."""
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy(
+        {"entities": {"entity_ids": {"light.permitted": True, "light.other": True}}}
+    )
+    hass.states.async_set("light.permitted", "off")
+    hass.states.async_set("light.not_permitted", "off")
+    hass.states.async_set("light.other", "off")
+
+    await websocket_client.send_json(
+        {
+            "id": 7,
+            "type": "subscribe_entities",
+            "entity_ids": ["light.permitted", "light.not_permitted"],
+        }
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["a"]) == ["light.permitted"]
+
+    hass.states.async_set("light.not_permitted", "on")
+    hass.states.async_set("light.other", "on")
+    hass.states.async_set("light.permitted", "on")
+
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["c"]) == ["light.permitted"]
+
+    await websocket_client.send_json(
+        {"id": 8, "type": "unsubscribe_events", "subscription": 7}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 8
+    assert msg["success"]
+
+
 async def test_render_template_renders_template(hass, websocket_client):
     """Test simple template is rendered and updated."""
     hass.states.async_set("light.test", "on")
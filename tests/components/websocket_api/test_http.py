@@ -5,6 +5,8 @@ from aiohttp import WSMsgType
 import pytest
 
 from homeassistant.components.websocket_api import const, http
+from homeassistant.components.websocket_api.auth import TYPE_AUTH_REQUIRED
+from homeassistant.setup import async_setup_component
 from homeassistant.util.dt import utcnow
 
 from tests.async_mock import patch
@@ -80,3 +82,48 @@ async def test_non_json_message(hass, websocket_client, caplog):
         f"Unable to serialize to JSON. Bad data found at $.result[0](state: test_domain.entity).attributes.bad={bad_data}(<class 'object'>"
         in caplog.text
     )
+
+
+async def test_coalesce_messages(hass, websocket_client):
+    """Test queued messages are sent as one frame once the client asks for it."""
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "supported_features",
+            "features": {const.FEATURE_COALESCE_MESSAGES: 1},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["success"]
+
+    await websocket_client.send_json(
+        {"id": 6, "type": "subscribe_events", "event_type": "test_event"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["success"]
+
+    for idx in range(3):
+        hass.bus.async_fire("test_event", {"idx": idx})
+
+    msg = await websocket_client.receive_json()
+    assert isinstance(msg, list)
+    assert [event["event"]["data"]["idx"] for event in msg] == [0, 1, 2]
+    assert all(event["id"] == 6 for event in msg)
+
+
+async def test_permessage_deflate(hass, aiohttp_client):
+    """Test messages are compressed if the client offers permessage-deflate."""
+    assert await async_setup_component(hass, "websocket_api", {})
+    client = await aiohttp_client(hass.http.app)
+
+    websocket = await client.ws_connect(const.URL, compress=15)
+    assert websocket.compress == 15
+    msg = await websocket.receive_json()
+    assert msg["type"] == TYPE_AUTH_REQUIRED
+    await websocket.close()
+
+    websocket = await client.ws_connect(const.URL)
+    assert websocket.compress == 0
+    await websocket.close()
@@ -1,12 +1,19 @@
 """Test Websocket API messages module."""
 
+from datetime import timedelta
+import json
+
 from homeassistant.components.websocket_api.messages import (
     _cached_event_message as lru_event_cache,
+    _state_diff_event,
     cached_event_message,
+    cached_state_diff_message,
     message_to_json,
+    result_message,
+    states_result_json,
 )
 from homeassistant.const import EVENT_STATE_CHANGED
-from homeassistant.core import callback
+from homeassistant.core import Event, State, callback
 
 
 async def test_cached_event_message(hass):
@@ -78,6 +85,39 @@ async def test_cached_event_message_with_different_idens(hass):
     assert cache_info.currsize == 1
 
 
+async def test_cached_event_message_json(hass):
+    """Test the cached event message matches the serialized event."""
+    events = []
+
+    @callback
+    def _event_listener(event):
+        events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _event_listener)
+
+    hass.states.async_set("light.window", "on", {"brightness": 100})
+    hass.states.async_set("light.window", "off")
+    await hass.async_block_till_done()
+
+    for event in events:
+        assert json.loads(cached_event_message(5, event)) == json.loads(
+            message_to_json({"id": 5, "type": "event", "event": event})
+        )
+
+
+async def test_states_result_json(caplog):
+    """Test serializing a list of states to a result message."""
+    states = [State("light.window", "on", {"brightness": 100}), State("light.a", "off")]
+
+    assert json.loads(states_result_json(3, states)) == json.loads(
+        message_to_json(result_message(3, states))
+    )
+
+    bad_state = State("light.bad", "on", {"bad": _Unserializeable()})
+    assert json.loads(states_result_json(3, [bad_state]))["success"] is False
+    assert "Unable to serialize to JSON" in caplog.text
+
+
 async def test_message_to_json(caplog):
     """Test we can serialize websocket messages."""
 
@@ -96,3 +136,58 @@ async def test_message_to_json(caplog):
 
 class _Unserializeable:
     """A class that cannot be serialized."""
+
+
+def test_state_diff_event():
+    """Test the changes of a state are compressed."""
+    old_state = State("light.window", "on", {"color": "red", "brightness": 10})
+
+    # Only the attributes were updated
+    new_state = State(
+        "light.window",
+        "on",
+        {"color": "blue", "brightness": 10},
+        last_changed=old_state.last_changed,
+        last_updated=old_state.last_updated + timedelta(seconds=1),
+        context=old_state.context,
+    )
+    event = Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "light.window", "old_state": old_state, "new_state": new_state},
+    )
+    assert _state_diff_event(event) == {
+        "c": {
+            "light.window": {
+                "+": {
+                    "a": {"color": "blue"},
+                    "lu": new_state.last_updated.timestamp(),
+                }
+            }
+        }
+    }
+    assert cached_state_diff_message(3, event) == message_to_json(
+        {"id": 3, "type": "event", "event": _state_diff_event(event)}
+    )
+
+    # The entity was added
+    event = Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "light.window", "old_state": None, "new_state": old_state},
+    )
+    assert _state_diff_event(event) == {
+        "a": {
+            "light.window": {
+                "s": "on",
+                "a": old_state.attributes,
+                "c": old_state.context.id,
+                "lc": old_state.last_changed.timestamp(),
+            }
+        }
+    }
+
+    # The entity was removed
+    event = Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "light.window", "old_state": old_state, "new_state": None},
+    )
+    assert _state_diff_event(event) == {"r": ["light.window"]}
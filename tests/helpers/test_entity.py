@@ -6,15 +6,19 @@ import threading
 
 import pytest
 
+from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.const import ATTR_DEVICE_CLASS, STATE_UNAVAILABLE
 from homeassistant.core import Context
 from homeassistant.helpers import entity, entity_registry
+from homeassistant.helpers.entity_values import EntityValues
+import homeassistant.util.dt as dt_util
 
 from tests.async_mock import MagicMock, PropertyMock, patch
 from tests.common import (
     MockConfigEntry,
     MockEntity,
     MockEntityPlatform,
+    async_fire_time_changed,
     get_test_home_assistant,
     mock_registry,
 )
@@ -718,3 +722,87 @@ async def test_setup_source(hass):
     await platform.async_reset()
 
     assert entity.entity_sources(hass) == {}
+
+
+async def test_static_attributes_are_cached(hass):
+    """Test static attributes are only read again when invalidated."""
+    reads = []
+
+    class StaticEntity(entity.Entity):
+        """Entity with static attributes."""
+
+        entity_id = "hello.world"
+        has_static_attributes = True
+        value = 1
+
+        @property
+        def state(self):
+            """Return the state."""
+            return self.value
+
+        @property
+        def state_attributes(self):
+            """Return the state attributes."""
+            return {"value": self.value}
+
+        @property
+        def name(self):
+            """Return the name."""
+            reads.append("name")
+            return "Static"
+
+    ent = StaticEntity()
+    ent.hass = hass
+    ent.async_write_ha_state()
+    ent.value = 2
+    ent.async_write_ha_state()
+
+    state = hass.states.get("hello.world")
+    assert state.state == "2"
+    assert state.attributes == {"value": 2, "friendly_name": "Static"}
+    assert reads == ["name"]
+
+    # A new customization is picked up without invalidating
+    hass.data[DATA_CUSTOMIZE] = EntityValues({"hello.world": {"icon": "mdi:test"}})
+    ent.async_write_ha_state()
+    assert hass.states.get("hello.world").attributes["icon"] == "mdi:test"
+    assert reads == ["name", "name"]
+
+    ent.async_invalidate_static_attributes()
+    ent.async_write_ha_state()
+    assert reads == ["name", "name", "name"]
+
+
+async def test_state_writes_are_coalesced(hass):
+    """Test writes within the state write interval are merged."""
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "sensor.power"
+    values = iter(range(10))
+
+    with patch.object(
+        entity.Entity, "state", PropertyMock(side_effect=lambda: next(values))
+    ), patch.object(
+        entity.Entity,
+        "state_write_interval",
+        PropertyMock(return_value=timedelta(seconds=1)),
+    ):
+        # The first write is not delayed
+        ent.async_write_ha_state()
+        assert hass.states.get("sensor.power").state == "0"
+
+        # Later writes within the interval are held back and write the
+        # state at the end of the interval
+        ent.async_write_ha_state()
+        ent.async_write_ha_state()
+        assert hass.states.get("sensor.power").state == "0"
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+        assert hass.states.get("sensor.power").state == "1"
+
+        ent.async_write_ha_state()
+        await ent.async_remove()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+        await hass.async_block_till_done()
+        assert hass.states.get("sensor.power") is None
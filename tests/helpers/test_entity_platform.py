@@ -90,6 +90,74 @@ async def test_polling_updates_entities_with_exception(hass):
     assert len(update_err) == 1
 
 
+async def test_polling_is_spread_over_interval(hass):
+    """Test platforms poll at a fixed offset within their scan interval."""
+    platforms = [
+        MockEntityPlatform(
+            hass, platform_name=name, scan_interval=timedelta(seconds=20)
+        )
+        for name in ("first", "second")
+    ]
+    for platform in platforms:
+        await platform.async_add_entities([MockEntity(should_poll=True)])
+
+    stats = {
+        item["platform"]: item for item in entity_platform.async_get_polling_stats(hass)
+    }
+    assert stats.keys() == {"first", "second"}
+    assert stats["first"]["offset"] != stats["second"]["offset"]
+    for item in stats.values():
+        assert item["scan_interval"] == 20
+        assert 0 <= item["offset"] < 20
+
+    # A platform keeps its offset when it is set up again
+    await platforms[0].async_reset()
+    assert len(entity_platform.async_get_polling_stats(hass)) == 1
+    await platforms[0].async_add_entities([MockEntity(should_poll=True)])
+    offsets = {
+        item["platform"]: item["offset"]
+        for item in entity_platform.async_get_polling_stats(hass)
+    }
+    assert offsets["first"] == stats["first"]["offset"]
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=20))
+    await hass.async_block_till_done()
+
+    for item in entity_platform.async_get_polling_stats(hass):
+        assert item["polls"] == 1
+        assert item["overruns"] == 0
+        assert item["max_duration"] >= item["last_duration"] >= 0
+
+
+async def test_polling_overrun_is_counted(hass, caplog):
+    """Test a poll is skipped while the previous one is still running."""
+    platform = MockEntityPlatform(hass, scan_interval=timedelta(seconds=20))
+    release = asyncio.Event()
+    updates = []
+
+    async def async_update():
+        """Mock a slow update."""
+        updates.append(None)
+        await release.wait()
+
+    entity = MockEntity(should_poll=True)
+    entity.async_update = async_update
+    await platform.async_add_entities([entity])
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=20))
+    await asyncio.sleep(0)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=40))
+    await asyncio.sleep(0)
+    release.set()
+    await hass.async_block_till_done()
+
+    assert len(updates) == 1
+    assert "took longer than the scheduled update interval" in caplog.text
+    (stats,) = entity_platform.async_get_polling_stats(hass)
+    assert stats["polls"] == 1
+    assert stats["overruns"] == 1
+
+
 async def test_update_state_adds_entities(hass):
     """Test if updating poll entities cause an entity to be added works."""
     component = EntityComponent(_LOGGER, DOMAIN, hass)
@@ -135,7 +203,7 @@ async def test_update_state_adds_entities_with_update_before_add_false(hass):
     assert not ent.update.called
 
 
-@patch("homeassistant.helpers.entity_platform.async_track_time_interval")
+@patch("homeassistant.helpers.entity_platform.async_track_timer_interval")
 async def test_set_scan_interval_via_platform(mock_track, hass):
     """Test the setting of the scan interval via platform."""
 
@@ -14,6 +14,7 @@ from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.event import (
+    TIMER_SCHEDULER,
     TrackStates,
     TrackTemplate,
     TrackTemplateResult,
@@ -32,6 +33,7 @@ from homeassistant.helpers.event import (
     async_track_template_result,
     async_track_time_change,
     async_track_time_interval,
+    async_track_timer_interval,
     async_track_utc_time_change,
     track_point_in_utc_time,
 )
@@ -2394,6 +2396,151 @@ async def test_track_time_interval(hass):
     assert len(specific_runs) == 2
 
 
+async def test_track_timer_interval(hass):
+    """Test tracking an interval on the timer scheduler."""
+    specific_runs = []
+
+    utc_now = dt_util.utcnow()
+    unsub = async_track_timer_interval(
+        hass, callback(lambda x: specific_runs.append(x)), timedelta(seconds=10)
+    )
+
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=5))
+    await hass.async_block_till_done()
+    assert len(specific_runs) == 0
+
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=13))
+    await hass.async_block_till_done()
+    assert len(specific_runs) == 1
+
+    # Missed runs are skipped instead of fired in a burst
+    async_fire_time_changed(hass, utc_now + timedelta(minutes=20))
+    await hass.async_block_till_done()
+    assert len(specific_runs) == 2
+
+    unsub()
+
+    async_fire_time_changed(hass, utc_now + timedelta(minutes=30))
+    await hass.async_block_till_done()
+    assert len(specific_runs) == 2
+
+
+async def test_track_timer_interval_keeps_phase(hass):
+    """Test missed runs do not shift the interval of a listener."""
+    runs = []
+    utc_now = dt_util.utcnow()
+    for offset in (3, 17):
+        async_track_timer_interval(
+            hass,
+            callback(lambda x, offset=offset: runs.append((offset, x))),
+            timedelta(seconds=20),
+            utc_now + timedelta(seconds=offset),
+        )
+
+    # Both listeners run once after the loop stalled
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=601))
+    await hass.async_block_till_done()
+    assert [offset for offset, _ in runs] == [3, 17]
+
+    runs.clear()
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=605))
+    await hass.async_block_till_done()
+    assert runs == [(3, utc_now + timedelta(seconds=603))]
+
+    runs.clear()
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=620))
+    await hass.async_block_till_done()
+    assert runs == [(17, utc_now + timedelta(seconds=617))]
+
+
+async def test_timer_scheduler_shares_one_timer(hass):
+    """Test point in time listeners share a single loop timer."""
+    runs = []
+    utc_now = dt_util.utcnow()
+    unsubs = [
+        async_track_point_in_utc_time(
+            hass,
+            callback(lambda x: runs.append(x)),
+            utc_now + timedelta(seconds=seconds),
+        )
+        for seconds in (30, 10, 20)
+    ]
+    unsubs[1]()
+
+    with patch.object(hass.loop, "call_at", wraps=hass.loop.call_at) as call_at:
+        async_fire_time_changed(hass, utc_now + timedelta(seconds=40))
+        await hass.async_block_till_done()
+
+    assert runs == [utc_now + timedelta(seconds=20), utc_now + timedelta(seconds=30)]
+    # Only the scheduler timer is re-armed, never one per listener
+    assert call_at.call_count <= 1
+
+
+async def test_timer_scheduler_job_exception(hass, caplog):
+    """Test a failing job does not stop the other jobs due in the same wakeup."""
+    runs = []
+    utc_now = dt_util.utcnow()
+
+    @callback
+    def failing_job(utc_point_in_time):
+        raise ValueError("job failed")
+
+    for seconds, action in (
+        (10, callback(lambda x: runs.append(x))),
+        (20, failing_job),
+        (30, callback(lambda x: runs.append(x))),
+    ):
+        async_track_point_in_utc_time(
+            hass, action, utc_now + timedelta(seconds=seconds)
+        )
+
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=40))
+    await hass.async_block_till_done()
+
+    assert runs == [utc_now + timedelta(seconds=10), utc_now + timedelta(seconds=30)]
+    assert "Error running timer job" in caplog.text
+    assert "job failed" in caplog.text
+
+
+async def test_timer_scheduler_cancel_from_sibling_job(hass):
+    """Test a job cancelled by a job due in the same wakeup does not run."""
+    runs = []
+    utc_now = dt_util.utcnow()
+    unsubs = []
+
+    @callback
+    def cancelling_job(utc_point_in_time):
+        runs.append("cancelling")
+        for unsub in unsubs:
+            unsub()
+
+    async_track_point_in_utc_time(hass, cancelling_job, utc_now + timedelta(seconds=10))
+    unsubs.append(
+        async_track_point_in_utc_time(
+            hass,
+            callback(lambda x: runs.append("point in time")),
+            utc_now + timedelta(seconds=20),
+        )
+    )
+    unsubs.append(
+        async_track_timer_interval(
+            hass,
+            callback(lambda x: runs.append("interval")),
+            timedelta(seconds=15),
+            utc_now + timedelta(seconds=30),
+        )
+    )
+
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=40))
+    await hass.async_block_till_done()
+    assert runs == ["cancelling"]
+
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=60))
+    await hass.async_block_till_done()
+    assert runs == ["cancelling"]
+    assert hass.data[TIMER_SCHEDULER].scheduled == 0
+
+
 async def test_track_sunrise(hass, legacy_patchable_time):
     """Test track the sunrise."""
     latitude = 32.87336
@@ -0,0 +1,66 @@
+"""Test the job profiler helper."""
+import asyncio
+
+from homeassistant.core import callback
+from homeassistant.helpers import job_profiler
+
+
+async def test_profile_jobs(hass):
+    """Test callbacks, coroutines and executor jobs are accounted."""
+    profiler = hass.job_profiler = job_profiler.JobProfiler()
+
+    @callback
+    def _callback():
+        pass
+
+    async def _coroutine():
+        await asyncio.sleep(0)
+        return 5
+
+    def _executor():
+        return 6
+
+    hass.async_add_job(_callback)
+    hass.async_run_job(_callback)
+    assert await hass.async_add_job(_coroutine) == 5
+    assert await hass.async_add_job(_executor) == 6
+    assert await hass.async_add_executor_job(_executor) == 6
+    await hass.async_block_till_done()
+    hass.job_profiler = None
+
+    jobs = {job["target"].rsplit(".", 1)[-1]: job for job in profiler.report()["jobs"]}
+    assert jobs["_callback"]["calls"] == 2
+    assert jobs["_coroutine"]["calls"] == 1
+    assert jobs["_coroutine"]["loop_time"] > 0
+    assert jobs["_executor"]["executor_calls"] == 2
+    assert jobs["_executor"]["executor_wait"] >= 0
+    assert jobs["_executor"]["domain"] == "tests"
+
+    # Nothing is accounted once the profiler is removed
+    hass.async_run_job(_callback)
+    jobs = {job["target"].rsplit(".", 1)[-1]: job for job in profiler.report()["jobs"]}
+    assert jobs["_callback"]["calls"] == 2
+
+
+async def test_report_top(hass):
+    """Test the report is limited to the jobs that took the most time."""
+    profiler = job_profiler.JobProfiler()
+
+    for index in range(3):
+        target = callback(lambda: None)
+        target.__qualname__ = f"job_{index}"
+        for _ in range(index + 1):
+            profiler.run_callback(target)
+
+    report = profiler.report(2)
+    assert len(report["jobs"]) == 2
+    assert report["domains"] == [
+        {
+            "domain": "tests",
+            "calls": 6,
+            "loop_time": report["domains"][0]["loop_time"],
+            "executor_calls": 0,
+            "executor_time": 0,
+            "executor_wait": 0,
+        }
+    ]
@@ -2082,11 +2082,47 @@ async def test_cache_garbage_collection():
         template_string
     )  # pylint: disable=protected-access
     del tpl2
+    # The shared cache keeps the code after the templates are gone
+    assert template._NO_HASS_ENV.template_cache.get(
+        template_string
+    )  # pylint: disable=protected-access
+    template._COMPILED_CODE.pop(  # pylint: disable=protected-access
+        (True, template_string)
+    )
     assert not template._NO_HASS_ENV.template_cache.get(
         template_string
     )  # pylint: disable=protected-access
 
 
+async def test_compiled_code_shared_cache(hass):
+    """Test compiled code is shared by templates and survives their removal."""
+    template_string = "{{ 'shared' | upper }} {{ states('sensor.shared') }}"
+    before = template.compiled_code_cache_stats()
+
+    tpl = template.Template(template_string, hass)
+    tpl.ensure_valid()
+    code = tpl._compiled_code  # pylint: disable=protected-access
+    del tpl
+
+    tpl = template.Template(template_string, hass)
+    tpl.ensure_valid()
+    assert tpl._compiled_code is code  # pylint: disable=protected-access
+
+    stats = template.compiled_code_cache_stats()
+    assert stats["misses"] == before["misses"] + 1
+    assert stats["hits"] == before["hits"] + 1
+    assert stats["maxsize"] == template.COMPILED_CODE_CACHE_SIZE
+
+
+async def test_compiled_code_not_shared_without_hass(hass):
+    """Test code compiled with hass filters is not used without hass."""
+    template_string = "{{ ['sensor.cache'] | closest }}"
+    template.Template(template_string, hass).ensure_valid()
+
+    with pytest.raises(TemplateError):
+        template.Template(template_string).ensure_valid()
+
+
 def test_is_template_string():
     """Test is template string."""
     assert template.is_template_string("{{ x }}") is True
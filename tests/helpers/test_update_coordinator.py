@@ -284,3 +284,98 @@ async def test_async_set_updated_data(crd):
     crd.async_set_updated_data(300)
     # We have created a new refresh listener
     assert crd._unsub_refresh is not old_refresh
+
+
+async def test_adaptive_update_interval(hass):
+    """Test the update interval backs off while the data does not change."""
+    data = [1]
+
+    async def refresh():
+        return data[0]
+
+    crd = update_coordinator.DataUpdateCoordinator[int](
+        hass,
+        _LOGGER,
+        name="test",
+        update_method=refresh,
+        update_interval=timedelta(seconds=10),
+        max_update_interval=timedelta(seconds=30),
+    )
+    crd.async_add_listener(Mock())
+    assert crd.current_update_interval == timedelta(seconds=10)
+
+    await crd.async_refresh()
+    assert crd.current_update_interval == timedelta(seconds=10)
+
+    await crd.async_refresh()
+    assert crd.current_update_interval == timedelta(seconds=20)
+
+    await crd.async_refresh()
+    assert crd.current_update_interval == timedelta(seconds=30)
+
+    await crd.async_refresh()
+    assert crd.current_update_interval == timedelta(seconds=30)
+
+    # Changed data speeds up the refreshes again
+    data[0] = 2
+    await crd.async_refresh()
+    assert crd.current_update_interval == timedelta(seconds=10)
+
+    await crd.async_refresh()
+    assert crd.current_update_interval == timedelta(seconds=20)
+
+    # So does a requested refresh
+    with patch.object(crd._debounced_refresh, "async_call") as mock_call:
+        await crd.async_request_refresh()
+    assert len(mock_call.mock_calls) == 1
+    assert crd.current_update_interval == timedelta(seconds=10)
+
+    # And pushed data
+    await crd.async_refresh()
+    assert crd.current_update_interval == timedelta(seconds=20)
+    crd.async_set_updated_data(2)
+    assert crd.current_update_interval == timedelta(seconds=10)
+
+
+async def test_adaptive_update_interval_schedule(hass):
+    """Test the next refresh is scheduled with the adaptive interval."""
+    calls = 0
+
+    async def refresh():
+        nonlocal calls
+        calls += 1
+        return 1
+
+    crd = update_coordinator.DataUpdateCoordinator[int](
+        hass,
+        _LOGGER,
+        name="test",
+        update_method=refresh,
+        update_interval=timedelta(seconds=10),
+        max_update_interval=timedelta(minutes=5),
+    )
+    crd.async_add_listener(Mock())
+    await crd.async_refresh()
+    await crd.async_refresh()
+    assert calls == 2
+
+    # The data did not change, the next refresh is in 20 seconds
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert calls == 2
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=21))
+    await hass.async_block_till_done()
+    assert calls == 3
+
+
+async def test_pause_without_listeners(crd):
+    """Test pending refreshes are cancelled when the last listener is removed."""
+    unsub = crd.async_add_listener(Mock())
+    assert crd._unsub_refresh is not None
+
+    with patch.object(crd._debounced_refresh, "async_cancel") as mock_cancel:
+        unsub()
+
+    assert len(mock_cancel.mock_calls) == 1
+    assert crd._unsub_refresh is None
@@ -2,6 +2,7 @@
 # pylint: disable=protected-access
 from collections import OrderedDict
 import copy
+from datetime import timedelta
 import os
 from unittest import mock
 
@@ -825,6 +826,32 @@ async def test_merge_customize(hass):
     assert hass.data[config_util.DATA_CUSTOMIZE].get("b.b") == {"friendly_name": "BB"}
 
 
+async def test_state_write_interval(hass):
+    """Test state write intervals apply to entities, domains and globs."""
+    await config_util.async_process_ha_core_config(
+        hass,
+        {
+            "state_write_interval": {
+                "sensor": 1,
+                "sensor.power_*": "00:00:05",
+                "sensor.power_kitchen": {"seconds": 10},
+            }
+        },
+    )
+
+    intervals = hass.data[config_util.DATA_STATE_WRITE_INTERVAL]
+    assert intervals.get("sensor.temperature") == {
+        "state_write_interval": timedelta(seconds=1)
+    }
+    assert intervals.get("sensor.power_hall") == {
+        "state_write_interval": timedelta(seconds=5)
+    }
+    assert intervals.get("sensor.power_kitchen") == {
+        "state_write_interval": timedelta(seconds=10)
+    }
+    assert intervals.get("light.kitchen") == {}
+
+
 async def test_auth_provider_config(hass):
     """Test loading auth provider config onto hass object."""
     core_config = {
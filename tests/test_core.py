@@ -1,11 +1,14 @@
 """Test to verify that Home Assistant core works."""
 # pylint: disable=protected-access
 import asyncio
+from collections import defaultdict
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
+import threading
 
 import pytest
 import pytz
@@ -37,6 +40,7 @@ from homeassistant.exceptions import (
     InvalidStateError,
     ServiceNotFound,
 )
+from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
@@ -53,7 +57,7 @@ def test_split_entity_id():
 
 def test_async_add_hass_job_schedule_callback():
     """Test that we schedule coroutines and add jobs to the job pool."""
-    hass = MagicMock()
+    hass = MagicMock(job_profiler=None)
     job = MagicMock()
 
     ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(ha.callback(job)))
@@ -64,7 +68,7 @@ def test_async_add_hass_job_schedule_callback():
 
 def test_async_add_hass_job_schedule_partial_callback():
     """Test that we schedule partial coros and add jobs to the job pool."""
-    hass = MagicMock()
+    hass = MagicMock(job_profiler=None)
     job = MagicMock()
     partial = functools.partial(ha.callback(job))
 
@@ -76,7 +80,7 @@ def test_async_add_hass_job_schedule_partial_callback():
 
 def test_async_add_hass_job_schedule_coroutinefunction(loop):
     """Test that we schedule coroutines and add jobs to the job pool."""
-    hass = MagicMock(loop=MagicMock(wraps=loop))
+    hass = MagicMock(loop=MagicMock(wraps=loop), job_profiler=None)
 
     async def job():
         pass
@@ -89,7 +93,7 @@ def test_async_add_hass_job_schedule_coroutinefunction(loop):
 
 def test_async_add_hass_job_schedule_partial_coroutinefunction(loop):
     """Test that we schedule partial coros and add jobs to the job pool."""
-    hass = MagicMock(loop=MagicMock(wraps=loop))
+    hass = MagicMock(loop=MagicMock(wraps=loop), job_profiler=None)
 
     async def job():
         pass
@@ -104,7 +108,7 @@ def test_async_add_hass_job_schedule_partial_coroutinefunction(loop):
 
 def test_async_add_job_add_hass_threaded_job_to_pool():
     """Test that we schedule coroutines and add jobs to the job pool."""
-    hass = MagicMock()
+    hass = MagicMock(job_profiler=None)
 
     def job():
         pass
@@ -130,7 +134,7 @@ def test_async_create_task_schedule_coroutine(loop):
 
 def test_async_run_hass_job_calls_callback():
     """Test that the callback annotation is respected."""
-    hass = MagicMock()
+    hass = MagicMock(job_profiler=None)
     calls = []
 
     def job():
@@ -143,7 +147,7 @@ def test_async_run_hass_job_calls_callback():
 
 def test_async_run_hass_job_delegates_non_async():
     """Test that the callback annotation is respected."""
-    hass = MagicMock()
+    hass = MagicMock(job_profiler=None)
     calls = []
 
     def job():
@@ -232,6 +236,24 @@ async def test_async_add_job_pending_tasks_executor(hass):
     assert len(call_count) == 2
 
 
+async def test_async_add_executor_job_named_executor(hass):
+    """Test executor jobs can run in a named executor."""
+    threads = []
+
+    def test_executor(value):
+        """Test executor."""
+        threads.append(threading.current_thread().name)
+        return value
+
+    assert await hass.async_add_executor_job(test_executor, 1, executor="io") == 1
+    assert threads[0].startswith("SyncWorker-io")
+    assert hass.executors.stats()["io"]["jobs"] == 1
+
+    hass.async_add_executor_job(test_executor, 2, executor="io")
+    await hass.async_block_till_done()
+    assert len(threads) == 2
+
+
 async def test_async_add_job_pending_tasks_callback(hass):
     """Run a callback in pending tasks."""
     call_count = []
@@ -336,6 +358,21 @@ def test_state_as_dict():
     assert state.as_dict() is state.as_dict()
 
 
+def test_state_as_json():
+    """Test a State as JSON is cached and dropped for a new state."""
+    state = ha.State("happy.happy", "on", {"pig": "dog"})
+    assert json.loads(state.as_json()) == json.loads(
+        json.dumps(state.as_dict(), cls=JSONEncoder)
+    )
+    assert state.as_json() is state.as_json()
+
+    # A state created from the previous state does not reuse its JSON
+    new_state = ha.State._from_previous(
+        state, "off", state.attributes, None, dt_util.utcnow(), state.context
+    )
+    assert json.loads(new_state.as_json())["state"] == "off"
+
+
 async def test_eventbus_add_remove_listener(hass):
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -379,6 +416,150 @@ async def test_eventbus_unsubscribe_listener(hass):
     assert len(calls) == 1
 
 
+async def test_eventbus_dispatch_follows_listener_changes(hass):
+    """Test listeners added or removed after firing are dispatched correctly."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(("test", event.event_type))
+
+    @ha.callback
+    def match_all_listener(event):
+        """Mock MATCH_ALL listener."""
+        calls.append((MATCH_ALL, event.event_type))
+
+    # Fire without listeners before subscribing
+    hass.bus.async_fire("test")
+    unsub = hass.bus.async_listen("test", listener)
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert calls == [("test", "test")]
+
+    calls.clear()
+    unsub_match_all = hass.bus.async_listen(MATCH_ALL, match_all_listener)
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert calls == [(MATCH_ALL, "test"), ("test", "test")]
+
+    calls.clear()
+    unsub()
+    hass.bus.async_fire("test")
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert calls == [(MATCH_ALL, "test")]
+
+    calls.clear()
+    unsub_match_all()
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert calls == []
+
+
+async def test_eventbus_event_filter(hass):
+    """Test listeners are only scheduled for events passing their filter."""
+    calls = []
+    filtered = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event.data["value"])
+
+    @ha.callback
+    def event_filter(event):
+        """Mock filter."""
+        filtered.append(event.data["value"])
+        return event.data["value"] % 2 == 0
+
+    hass.bus.async_listen("test", listener, event_filter)
+    for value in range(4):
+        hass.bus.async_fire("test", {"value": value})
+
+    # Filters run when the event is fired
+    assert filtered == [0, 1, 2, 3]
+    await hass.async_block_till_done()
+    assert calls == [0, 2]
+
+
+async def test_eventbus_event_filter_exception(hass, caplog):
+    """Test a failing filter only skips its own listener."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    def failing_filter(event):
+        """Mock filter that fails."""
+        raise ValueError("filter failed")
+
+    hass.bus.async_listen("test", listener, failing_filter)
+    hass.bus.async_listen("test", listener)
+    hass.states.async_listen(listener, domains=["light"], event_filter=failing_filter)
+    hass.states.async_listen(listener, domains=["light"])
+
+    hass.bus.async_fire("test")
+    hass.states.async_set("light.kitchen", "on")
+    await hass.async_block_till_done()
+
+    assert [event.event_type for event in calls] == ["test", EVENT_STATE_CHANGED]
+    assert "Error in event filter" in caplog.text
+    assert "Error in state changed filter" in caplog.text
+    assert "filter failed" in caplog.text
+
+
+async def test_statemachine_listen(hass):
+    """Test listening for state changes of some entities."""
+    calls = defaultdict(list)
+
+    def listen(name, **kwargs):
+        @ha.callback
+        def listener(event):
+            calls[name].append(event.data["entity_id"])
+
+        return hass.states.async_listen(listener, **kwargs)
+
+    listen("all")
+    unsub = listen("entities", entity_ids=["light.Kitchen", "switch.ac"])
+    listen("domains", domains=["switch"])
+    listen("both", entity_ids=["light.kitchen"], domains=["switch"])
+    listen(
+        "predicate",
+        domains=["light"],
+        event_filter=lambda event: event.data["new_state"] is None,
+    )
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("switch.ac", "on")
+    hass.states.async_set("sensor.power", "5")
+    hass.states.async_remove("light.bowl")
+    await hass.async_block_till_done()
+
+    assert calls == {
+        "all": [
+            "light.kitchen",
+            "light.bowl",
+            "switch.ac",
+            "sensor.power",
+            "light.bowl",
+        ],
+        "entities": ["light.kitchen", "switch.ac"],
+        "domains": ["switch.ac"],
+        "both": ["light.kitchen", "switch.ac"],
+        "predicate": ["light.bowl"],
+    }
+
+    unsub()
+    hass.states.async_set("switch.ac", "off")
+    await hass.async_block_till_done()
+    assert calls["entities"] == ["light.kitchen", "switch.ac"]
+    assert calls["domains"] == ["switch.ac", "switch.ac"]
+
+
 async def test_eventbus_listen_once_event_with_callback(hass):
     """Test listen_once_event method."""
     runs = []
@@ -637,6 +818,39 @@ async def test_statemachine_force_update(hass):
     assert len(events) == 1
 
 
+async def test_statemachine_set_internal(hass):
+    """Test the trusted writer path reuses the parts of the previous state."""
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    hass.states.async_set_internal("light.bowl", "on", {"brightness": 100})
+    first = hass.states.get("light.bowl")
+    assert first.domain == "light"
+    assert first.object_id == "bowl"
+
+    # Unchanged writes do not create a new state
+    hass.states.async_set_internal("light.bowl", "on", {"brightness": 100})
+    assert hass.states.get("light.bowl") is first
+
+    hass.states.async_set_internal("light.bowl", "off", {"brightness": 100})
+    second = hass.states.get("light.bowl")
+    assert second.state == "off"
+    assert second.attributes is first.attributes
+    assert second.domain == "light"
+    assert second.last_changed == second.last_updated
+
+    hass.states.async_set_internal("light.bowl", "off", {"brightness": 50})
+    third = hass.states.get("light.bowl")
+    assert third.attributes == {"brightness": 50}
+    assert third.last_changed == second.last_changed
+
+    await hass.async_block_till_done()
+    assert len(events) == 3
+    assert events[2].data["old_state"] is second
+
+    with pytest.raises(ha.InvalidStateError):
+        hass.states.async_set_internal("light.bowl", "x" * 256)
+
+
 def test_service_call_repr():
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")
@@ -1005,6 +1219,45 @@ def test_create_timer(mock_monotonic, loop):
     assert event_data[ATTR_NOW] == datetime(2018, 12, 31, 3, 4, 6, 100000)
 
 
+@patch("homeassistant.core.monotonic")
+def test_timer_without_time_changed_listeners(mock_monotonic, loop):
+    """Test time changed is not fired if nothing listens to it."""
+    hass = MagicMock()
+    hass.bus.async_has_listeners.return_value = False
+    mock_monotonic.side_effect = 10.2, 10.8, 11.3
+
+    with patch(
+        "homeassistant.core.dt_util.utcnow",
+        return_value=datetime(2018, 12, 31, 3, 4, 5, 333333),
+    ):
+        ha._async_create_timer(hass)
+
+    _, callback, target = hass.loop.call_later.mock_calls[0][1]
+
+    with patch(
+        "homeassistant.core.dt_util.utcnow",
+        return_value=datetime(2018, 12, 31, 3, 4, 6, 100000),
+    ):
+        callback(target)
+
+    hass.bus.async_has_listeners.assert_called_with(EVENT_TIME_CHANGED)
+    assert len(hass.bus.async_fire.mock_calls) == 0
+    assert len(hass.loop.call_later.mock_calls) == 2
+
+
+async def test_eventbus_has_listeners(hass):
+    """Test only listeners of the event type itself are taken into account."""
+    unsub = hass.bus.async_listen(MATCH_ALL, lambda event: None)
+    assert not hass.bus.async_has_listeners("test")
+
+    unsub_test = hass.bus.async_listen("test", lambda event: None)
+    assert hass.bus.async_has_listeners("test")
+
+    unsub_test()
+    unsub()
+    assert not hass.bus.async_has_listeners("test")
+
+
 @patch("homeassistant.core.monotonic")
 def test_timer_out_of_sync(mock_monotonic, loop):
     """Test create timer."""
@@ -0,0 +1,105 @@
+"""Test Home Assistant executor pools."""
+import asyncio
+import functools
+import threading
+
+import pytest
+
+from homeassistant.util import executor
+
+
+def test_integration_domain():
+    """Test modules are attributed to their integration."""
+    assert executor.integration_domain("homeassistant.components.hue.light") == "hue"
+    assert executor.integration_domain("homeassistant.helpers.event") == (
+        "homeassistant"
+    )
+    assert executor.integration_domain("custom_components.foo.sensor") == "foo"
+    assert executor.integration_domain("aiohue.bridge") == "aiohue"
+
+
+def test_target_domain():
+    """Test partials are unwrapped to find the domain of a target."""
+    assert executor.target_domain(test_target_domain) == "tests"
+    assert executor.target_domain(functools.partial(threading.Lock)) == "_thread"
+
+
+async def test_domain_limit():
+    """Test jobs over the domain limit wait until a job of the domain is done."""
+    loop = asyncio.get_running_loop()
+    pool = executor.ExecutorPool(loop, "test", executor.PoolConfig(4, 2))
+    release = threading.Event()
+    started = []
+
+    def _job(value):
+        started.append(value)
+        release.wait(5)
+        return value
+
+    futures = [pool.async_submit("slow", _job, value) for value in range(3)]
+    other = pool.async_submit("fast", lambda: "fast")
+
+    assert await other == "fast"
+    assert pool.stats()["running"] == {"slow": 2}
+    assert pool.stats()["waiting"] == {"slow": 1}
+    assert 2 not in started
+
+    release.set()
+    assert await asyncio.gather(*futures) == [0, 1, 2]
+
+    stats = pool.stats()
+    assert stats["jobs"] == 4
+    assert stats["running"] == {}
+    assert stats["waiting"] == {}
+    assert stats["max_queue_wait"] >= 0
+    pool.shutdown()
+
+
+async def test_job_exception():
+    """Test the exception of a job is raised when it is awaited."""
+    loop = asyncio.get_running_loop()
+    pool = executor.ExecutorPool(loop, "test", executor.PoolConfig(1, 1))
+
+    def _fail():
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError, match="failed"):
+        await pool.async_submit("test", _fail)
+
+    assert await pool.async_submit("test", lambda: 5) == 5
+    assert pool.stats()["running"] == {}
+    pool.shutdown()
+
+
+async def test_cancelled_waiting_job():
+    """Test a waiting job that is cancelled is not run."""
+    loop = asyncio.get_running_loop()
+    pool = executor.ExecutorPool(loop, "test", executor.PoolConfig(2, 1))
+    release = threading.Event()
+    ran = []
+
+    first = pool.async_submit("test", lambda: release.wait(5))
+    second = pool.async_submit("test", ran.append, "second")
+    third = pool.async_submit("test", ran.append, "third")
+    second.cancel()
+
+    release.set()
+    await first
+    await third
+    assert ran == ["third"]
+    pool.shutdown()
+
+
+async def test_executor_pools():
+    """Test pools are created when used and unknown names are rejected."""
+    pools = executor.ExecutorPools(asyncio.get_running_loop())
+
+    assert pools.stats() == {}
+    assert await pools.async_submit(executor.EXECUTOR_IO, "test", lambda: 1) == 1
+    assert list(pools.stats()) == [executor.EXECUTOR_IO]
+    assert pools.stats()[executor.EXECUTOR_IO]["jobs"] == 1
+
+    with pytest.raises(ValueError):
+        pools.async_get("unknown")
+
+    pools.shutdown()
@@ -1,7 +1,7 @@
 """Test Home Assistant json utility functions."""
 from datetime import datetime
 from functools import partial
-from json import JSONEncoder, dumps
+from json import JSONEncoder, dumps, loads
 import math
 import os
 import sys
@@ -12,11 +12,14 @@ import pytest
 
 from homeassistant.core import Event, State
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import json as json_util
 from homeassistant.util.json import (
     SerializationError,
     find_paths_unserializable_data,
+    json_dumps,
     load_json,
     save_json,
+    set_json_backend,
 )
 
 from tests.async_mock import Mock
@@ -113,6 +116,32 @@ def test_custom_encoder():
     assert data == "9"
 
 
+def test_json_dumps():
+    """Test serializing Home Assistant objects to JSON."""
+    time = datetime(2020, 1, 1, 12, 30)
+    assert loads(json_dumps({"time": time, "items": {1}})) == {
+        "time": time.isoformat(),
+        "items": [1],
+    }
+
+    with pytest.raises(TypeError):
+        json_dumps({"object": object()})
+
+    with pytest.raises(ValueError):
+        json_dumps({"value": math.nan})
+
+
+def test_set_json_backend():
+    """Test the function that serializes to JSON can be replaced."""
+    set_json_backend(lambda obj: "dumped")
+    try:
+        assert json_dumps({"a": 1}) == "dumped"
+    finally:
+        set_json_backend(None)
+
+    assert json_util._json_backend is json_util.DEFAULT_JSON_BACKEND
+
+
 def test_find_unserializable_data():
     """Find unserializeable data."""
     assert find_paths_unserializable_data(1) == {}
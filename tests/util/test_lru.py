@@ -0,0 +1,40 @@
+"""Test Home Assistant LRU util methods."""
+from homeassistant.util.lru import LRU
+
+
+def test_lru_evicts_least_recently_used():
+    """Test the least recently used key is evicted."""
+    cache = LRU(2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache.get("a") == 1
+    cache["c"] = 3
+
+    assert len(cache) == 2
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def test_lru_counts_hits_and_misses():
+    """Test the hit and miss counters."""
+    cache = LRU(2)
+    cache["a"] = 1
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("b", 5) == 5
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+def test_lru_pop_and_clear():
+    """Test removing keys."""
+    cache = LRU(2)
+    cache["a"] = 1
+    cache["b"] = 2
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+    cache.clear()
+    assert len(cache) == 0